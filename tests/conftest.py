@@ -0,0 +1,9 @@
+"""테스트 공용 설정: 화면 없이 Qt 위젯을 만들 수 있게 한다."""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+# 위젯 테스트와 시그널만 쓰는 테스트가 같은 프로세스에서 돌므로 처음부터 QApplication 으로 만든다.
+app = QApplication.instance() or QApplication([])
@@ -0,0 +1,32 @@
+"""단축키 작업 스레드가 GUI 조회와 다른 세션으로 액션을 보내는지."""
+import threading
+
+from PyQt5.QtWidgets import QApplication
+
+from timer_overlay.endpoints import EndpointSelector
+from timer_overlay.offline import create_offline_window
+from timer_overlay.standin_server import StandinServer, StandinState
+
+
+def test_hotkey_worker_uses_own_action_client(tmp_path):
+    state = StandinState()
+    state.add_channel("raid", 2)
+    with StandinServer("127.0.0.1", 0, state=state) as server:
+        window = create_offline_window("app", tmp_path)
+        try:
+            window.config.channel_code = "raid"
+            window._start_polling(EndpointSelector([server.url]), "raid")
+            QApplication.processEvents()
+            assert window._action_api is not None
+            assert window._action_api.session is not window._api.session
+
+            timer_id = next(iter(window._timers))
+            worker = threading.Thread(target=window._on_hotkey_pressed, args=(timer_id,))
+            worker.start()
+            worker.join(5)
+
+            assert server.stats().get("POST /api/timers") == 1
+        finally:
+            window.close()
+
+    assert window._action_api is None
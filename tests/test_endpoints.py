@@ -0,0 +1,81 @@
+"""엔드포인트 선택: 점검 RTT 만으로 고르고, 연속 실패해야 전환하는지."""
+from timer_overlay import endpoints
+from timer_overlay.endpoints import EndpointSelector
+
+A = "http://a:1"
+B = "http://b:1"
+
+
+def _selector() -> EndpointSelector:
+    selector = EndpointSelector([A, B])
+    selector.report_success(A, 40.0, probe=True)
+    selector.report_success(B, 35.0, probe=True)
+    assert selector.current == A
+    return selector
+
+
+def test_request_rtt_does_not_bias_selection():
+    selector = _selector()
+
+    # 조회 응답은 점검보다 느리지만 선택에는 영향을 주지 않는다.
+    for _ in range(20):
+        selector.report_success(A, 400.0)
+
+    assert selector.current == A
+    health = {item.url: item for item in selector.snapshot()}
+    assert health[A].rtt_ms == 40.0
+    assert health[A].request_rtt_ms > 300.0
+
+
+def test_probe_rtt_still_switches_to_faster_endpoint():
+    selector = _selector()
+
+    for _ in range(20):
+        selector.report_success(A, 200.0, probe=True)
+
+    assert selector.current == B
+
+
+def test_single_failure_does_not_switch():
+    selector = _selector()
+
+    for _ in range(endpoints._FAILURE_THRESHOLD - 1):
+        assert not selector.report_failure(A)
+    selector.report_success(A, 40.0)
+    assert not selector.report_failure(A)
+
+    assert selector.current == A
+
+
+def test_consecutive_failures_switch():
+    selector = _selector()
+
+    switched = [selector.report_failure(A) for _ in range(endpoints._FAILURE_THRESHOLD)]
+
+    assert switched == [False] * (endpoints._FAILURE_THRESHOLD - 1) + [True]
+    assert selector.current == B
+
+
+def test_both_front_ends_build_same_candidates():
+    from timer_overlay.config import AppConfig
+    from timer_overlay.network import ServerSettings
+
+    config = AppConfig(
+        server_host="10.0.0.1",
+        server_port=47984,
+        server_url="https://timer.example/",
+        server_endpoints=["http://10.0.0.2:47984", "http://10.0.0.1:47984"],
+    )
+    settings = ServerSettings(
+        host=config.server_host,
+        port=config.server_port,
+        url=config.server_url,
+        endpoints=tuple(config.server_endpoints),
+    )
+
+    assert config.endpoint_urls() == settings.candidate_urls() == [
+        "https://timer.example",
+        "http://10.0.0.1:47984",
+        "http://10.0.0.2:47984",
+        endpoints.FALLBACK_URL,
+    ]
@@ -0,0 +1,28 @@
+"""핸드셰이크 작업 스레드에서 예외가 나도 실패 결과를 보내는지."""
+import time
+
+from PyQt5.QtCore import QCoreApplication
+
+from timer_overlay.endpoints import EndpointSelector
+from timer_overlay.network import ServerHandshake, ServerSettings
+
+
+def test_exception_emits_failed_result(monkeypatch):
+    def broken_race(self, *args, **kwargs):
+        raise RuntimeError("경합 실패")
+
+    monkeypatch.setattr(EndpointSelector, "race", broken_race)
+    handshake = ServerHandshake()
+    results = []
+    handshake.finished.connect(results.append)
+    handshake.start(ServerSettings(url="http://127.0.0.1:9"), "raid")
+
+    deadline = time.monotonic() + 5
+    while not results and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+
+    assert results
+    assert not results[0].healthy
+    assert not results[0].channel_valid
+    assert results[0].channel_code == "raid"
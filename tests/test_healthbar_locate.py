@@ -0,0 +1,48 @@
+"""여러 체력바 탐색(``locate_bars``)이 UI 띠 같은 미끼를 체력바로 잡지 않는지."""
+import numpy as np
+import pytest
+
+from timer_overlay import healthbar
+from timer_overlay.healthbar_cli import _iou, synthesize_frame
+
+
+def _decoy_frame(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    """``synthesize_frame`` 과 같은 배경과 화면 가로 전체의 어두운 띠만 있는 프레임."""
+
+    frame = rng.integers(110, 256, (height, width, 4), dtype=np.uint8)
+    frame[..., 3] = 255
+    strip_y = height // 15
+    frame[strip_y : strip_y + max(4, height // 36), :, :3] = (40, 40, 46)
+    return frame
+
+
+@pytest.mark.parametrize("size", [(1280, 720), (1920, 1080), (2560, 1440)])
+def test_full_width_strip_alone_is_not_a_bar(size):
+    frame = _decoy_frame(*size, np.random.default_rng(1))
+
+    assert healthbar.locate_bars(frame) == []
+    assert all(
+        candidate.confidence < healthbar.MIN_CONFIDENCE
+        for candidate in healthbar.locate_candidates(frame)
+    )
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_synthetic_frames_have_no_false_positives(seed):
+    frame, truth = synthesize_frame(1920, 1080, "default", rng=np.random.default_rng(seed))
+
+    found = healthbar.locate_bars(frame)
+
+    assert len(found) == 1
+    assert _iou(found[0].rect, truth[0].rect) >= 0.5
+    assert all(candidate.rect[2] < frame.shape[1] * 0.9 for candidate in found)
+
+
+@pytest.mark.parametrize("ratio", [0.0, 1.0])
+def test_single_color_bar_is_still_found(ratio):
+    # 가득 차거나 빈 바는 두 색이 함께 보이지 않아도 체력바로 찾아야 한다.
+    frame, truth = synthesize_frame(1920, 1080, "default", percent=ratio, rng=np.random.default_rng(7))
+
+    found = healthbar.locate_bars(frame)
+
+    assert [candidate for candidate in found if _iou(candidate.rect, truth[0].rect) >= 0.5]
@@ -0,0 +1,150 @@
+"""배열 연산 ``healthbar_percent`` 가 예전 픽셀 단위 루프와 같은 값을 내는지."""
+import numpy as np
+import pytest
+from PyQt5.QtGui import QColor, QImage
+
+from timer_overlay import healthbar
+
+FILLED = (40, 200, 60)
+EMPTY = (62, 62, 66)
+# 판정 경계 바로 안팎의 색: g 150/149, g-r 20/19, 밝기 합 419/420, 최대-최소 34/35
+EDGE_COLORS = [
+    (100, 150, 100), (100, 149, 100), (130, 150, 130), (131, 150, 130),
+    (139, 140, 140), (140, 140, 140), (120, 154, 120), (120, 155, 120),
+    (0, 0, 0), (255, 255, 255), (0, 255, 0),
+]
+
+
+# 예전 MainWindow 구현 (QImage.pixelColor 로 한 픽셀씩 판정) --------------------
+def _is_filled_color(color: QColor) -> bool:
+    r, g, b = color.red(), color.green(), color.blue()
+    return g >= 150 and g >= r + 20 and g >= b + 20
+
+
+def _is_empty_color(color: QColor) -> bool:
+    r, g, b = color.red(), color.green(), color.blue()
+    max_c = max(r, g, b)
+    min_c = min(r, g, b)
+    brightness = (r + g + b) / 3
+    return brightness < 140 and (max_c - min_c) < 35
+
+
+def legacy_percent(image: QImage, rect):
+    x, y, width, height = rect
+    if width <= 0 or height <= 0:
+        return None
+
+    start_x = max(0, x)
+    start_y = max(0, y)
+    end_x = min(image.width(), x + width)
+    end_y = min(image.height(), y + height)
+    if end_x <= start_x or end_y <= start_y:
+        return None
+
+    band_top = max(start_y, start_y + height // 4)
+    band_bottom = min(end_y, start_y + (height * 3) // 4)
+
+    filled_columns = 0
+    total_columns = 0
+    for column in range(start_x, end_x):
+        filled_pixels = 0
+        empty_pixels = 0
+        for row in range(band_top, band_bottom):
+            color = image.pixelColor(column, row)
+            if _is_filled_color(color):
+                filled_pixels += 1
+            elif _is_empty_color(color):
+                empty_pixels += 1
+        if filled_pixels == 0 and empty_pixels == 0:
+            continue
+        total_columns += 1
+        if filled_pixels >= empty_pixels:
+            filled_columns += 1
+
+    if total_columns == 0:
+        return None
+    return (filled_columns / total_columns) * 100
+
+
+# 도우미 ----------------------------------------------------------------
+def _to_image(pixels: np.ndarray) -> QImage:
+    height, width = pixels.shape[:2]
+    data = np.ascontiguousarray(pixels)
+    return QImage(data.data, width, height, width * 4, QImage.Format_RGBA8888).copy()
+
+
+def _assert_same(pixels: np.ndarray, rect) -> None:
+    image = _to_image(pixels)
+    expected = legacy_percent(image, rect)
+    actual = healthbar.healthbar_percent(healthbar.image_view(image), rect)
+    if expected is None:
+        assert actual is None
+    else:
+        assert actual == pytest.approx(expected, abs=1e-9)
+
+
+def _random_pixels(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    palette = np.array([FILLED, EMPTY, *EDGE_COLORS], dtype=np.uint8)
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    pixels[..., 3] = 255
+    picked = palette[rng.integers(0, len(palette), (height, width))]
+    noise = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    use_noise = rng.random((height, width)) < 0.3
+    pixels[..., :3] = np.where(use_noise[..., None], noise, picked)
+    return pixels
+
+
+def _solid(width: int, height: int, color) -> np.ndarray:
+    pixels = np.full((height, width, 4), 255, dtype=np.uint8)
+    pixels[..., :3] = color
+    return pixels
+
+
+# 테스트 ----------------------------------------------------------------
+@pytest.mark.parametrize("seed", range(40))
+def test_random_images_match_legacy_loop(seed):
+    rng = np.random.default_rng(seed)
+    width = int(rng.integers(1, 90))
+    height = int(rng.integers(1, 30))
+    pixels = _random_pixels(rng, width, height)
+    for _ in range(5):
+        # 이미지 밖으로 나가는 영역도 포함한다.
+        rect = (
+            int(rng.integers(-5, width)),
+            int(rng.integers(-5, height)),
+            int(rng.integers(0, width + 10)),
+            int(rng.integers(0, height + 10)),
+        )
+        _assert_same(pixels, rect)
+
+
+@pytest.mark.parametrize("color", [FILLED, EMPTY, (200, 60, 60)], ids=["filled", "empty", "neither"])
+def test_solid_images_match_legacy_loop(color):
+    pixels = _solid(64, 12, color)
+    _assert_same(pixels, (0, 0, 64, 12))
+    _assert_same(pixels, (10, 2, 40, 8))
+
+
+@pytest.mark.parametrize("width", [2, 10, 64, 200])
+def test_even_column_counts_with_ties_match_legacy_loop(width):
+    # 열마다 채워진/빈 픽셀 수가 같으면 채워진 열로 센다.
+    pixels = _solid(width, 8, EMPTY)
+    pixels[::2, :, :3] = FILLED
+    pixels[:, width // 2 :, :3] = EMPTY
+    _assert_same(pixels, (0, 0, width, 8))
+
+
+@pytest.mark.parametrize("height", [1, 2, 3, 4])
+def test_thin_bands_match_legacy_loop(height):
+    # 높이가 작으면 가운데 절반 띠가 한 줄이거나 비어 있다.
+    rng = np.random.default_rng(height)
+    pixels = _random_pixels(rng, 50, height)
+    _assert_same(pixels, (0, 0, 50, height))
+    _assert_same(pixels, (5, 0, 30, height))
+
+
+def test_edge_colors_match_legacy_loop():
+    pixels = np.array([[(*color, 255) for color in EDGE_COLORS]] * 4, dtype=np.uint8)
+    for index in range(len(EDGE_COLORS)):
+        _assert_same(pixels, (index, 0, 1, 4))
+    _assert_same(pixels, (0, 0, len(EDGE_COLORS), 4))
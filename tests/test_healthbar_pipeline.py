@@ -0,0 +1,168 @@
+"""바를 놓친 뒤 파이프라인이 작업 스레드에서, 간격을 늘려 가며 다시 찾는지."""
+import os
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from timer_overlay import healthbar, healthbar_pipeline
+from timer_overlay.healthbar_cli import synthesize_frame
+from timer_overlay.healthbar_pipeline import Frame, HealthbarPipeline
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+class FakeScreen:
+    """``screen`` 배열을 캡처하는 스레드 안전 백엔드."""
+
+    name = "fake"
+    thread_safe = True
+
+    def __init__(self, screen: np.ndarray) -> None:
+        self.screen = screen
+        self.full_grabs = 0
+
+    def grab(self, rect):
+        x, y, width, height = rect
+        if (x, y) == (0, 0) and (width, height) == self.screen.shape[1::-1]:
+            self.full_grabs += 1
+        pixels = self.screen[y : y + height, x : x + width].copy()
+        return Frame(pixels, (x, y), time.perf_counter_ns())
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fast_reacquire(monkeypatch):
+    monkeypatch.setattr(healthbar_pipeline, "REACQUIRE_MIN_INTERVAL_S", 0.02)
+    monkeypatch.setattr(healthbar_pipeline, "REACQUIRE_MAX_INTERVAL_S", 0.16)
+
+
+def _run_until(condition, timeout_s: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def _start(screen: np.ndarray, rect, locator) -> tuple[HealthbarPipeline, FakeScreen]:
+    backend = FakeScreen(screen)
+    pipeline = HealthbarPipeline(backend=backend, locator=locator)
+    tracker = healthbar.MultiBarTracker([rect], screen.shape[1::-1])
+    pipeline.start(tracker, interval_s=0.01)
+    return pipeline, backend
+
+
+def test_failed_reacquire_backs_off_off_the_gui_thread():
+    frame, truth = synthesize_frame(640, 360, rng=np.random.default_rng(3))
+    blank = np.random.default_rng(4).integers(110, 256, frame.shape, dtype=np.uint8)
+    calls: list[str] = []
+
+    def locator(pixels):
+        calls.append(threading.current_thread().name)
+        return []
+
+    pipeline, backend = _start(blank, truth[0].rect, locator)
+    lost = []
+    pipeline.lost.connect(lambda: lost.append(True))
+    try:
+        assert _run_until(lambda: pipeline.reacquiring and lost)
+        time.sleep(0.6)
+        QCoreApplication.processEvents()
+    finally:
+        pipeline.stop()
+
+    # 간격을 늘리지 않으면 0.6초 동안 30번 가까이 전체 화면을 캡처한다.
+    assert 2 <= backend.full_grabs <= 10
+    assert pipeline._reacquire_interval_s == healthbar_pipeline.REACQUIRE_MAX_INTERVAL_S
+    assert set(calls) == {"HealthbarAnalyze"}
+
+
+def test_reacquire_switches_to_new_position():
+    frame, truth = synthesize_frame(640, 360, rng=np.random.default_rng(5))
+    blank = np.random.default_rng(6).integers(110, 256, frame.shape, dtype=np.uint8)
+    located = []
+
+    def locator(pixels):
+        found = [candidate.rect for candidate in healthbar.locate_bars(pixels)]
+        located.append(found)
+        return found
+
+    pipeline, backend = _start(blank, (20, 300, 150, 12), locator)
+    reacquired = []
+    pipeline.reacquired.connect(reacquired.append)
+    try:
+        assert _run_until(lambda: pipeline.reacquiring)
+        backend.screen = frame
+        assert _run_until(lambda: reacquired)
+    finally:
+        pipeline.stop()
+
+    assert not pipeline.reacquiring
+    assert pipeline.tracker is reacquired[0]
+    assert pipeline.tracker.rects == located[-1]
+    assert len(pipeline.tracker.rects) == 1
+
+
+def _acquire(pipeline: HealthbarPipeline, screen: np.ndarray) -> None:
+    # 시그널은 작업 스레드에서 바로 나갈 수 있으므로 연결한 뒤에 시작한다.
+    pipeline.start(healthbar.MultiBarTracker([], screen.shape[1::-1]), interval_s=0.01, acquire=True)
+
+
+def test_initial_acquire_runs_on_worker():
+    frame, truth = synthesize_frame(640, 360, rng=np.random.default_rng(7))
+    calls: list[str] = []
+
+    def locator(pixels):
+        calls.append(threading.current_thread().name)
+        return [candidate.rect for candidate in healthbar.locate_bars(pixels)]
+
+    pipeline = HealthbarPipeline(backend=FakeScreen(frame), locator=locator)
+    reacquired = []
+    readings = []
+    pipeline.reacquired.connect(reacquired.append)
+    pipeline.reading.connect(readings.append)
+    _acquire(pipeline, frame)
+    try:
+        assert _run_until(lambda: reacquired and readings)
+    finally:
+        pipeline.stop()
+
+    assert set(calls) == {"HealthbarAnalyze"}
+    assert len(pipeline.tracker.rects) == len(truth)
+
+
+def test_initial_acquire_reports_failure_once():
+    frame, _ = synthesize_frame(640, 360, rng=np.random.default_rng(8))
+    blank = np.random.default_rng(9).integers(110, 256, frame.shape, dtype=np.uint8)
+    backend = FakeScreen(blank)
+    pipeline = HealthbarPipeline(backend=backend, locator=lambda pixels: [])
+    failed = []
+    lost = []
+    pipeline.acquire_failed.connect(lambda: failed.append(True))
+    pipeline.lost.connect(lambda: lost.append(True))
+    _acquire(pipeline, blank)
+    try:
+        assert _run_until(lambda: failed)
+        time.sleep(0.2)
+        QCoreApplication.processEvents()
+    finally:
+        pipeline.stop()
+
+    assert failed == [True]
+    assert not lost
+    assert backend.full_grabs <= 3
+
+
+def test_acquire_requires_locator():
+    pipeline = HealthbarPipeline(backend=FakeScreen(np.zeros((10, 10, 4), np.uint8)))
+    with pytest.raises(ValueError):
+        pipeline.start(healthbar.MultiBarTracker([], (10, 10)), acquire=True)
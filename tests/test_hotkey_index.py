@@ -0,0 +1,85 @@
+"""단축키 색인/매처: 조합키, 연속키, 수식 키를 누른 채 누른 단일 키, 쉼표 키."""
+from timer_overlay.hotkey_index import (
+    HotkeyIndex,
+    HotkeyMatcher,
+    format_binding,
+    normalize_binding,
+    parse_binding,
+)
+
+
+def _matcher(bindings: dict[str, str]) -> HotkeyMatcher:
+    return HotkeyMatcher(HotkeyIndex.build(bindings), sequence_timeout=1.0)
+
+
+def test_chord_needs_modifier():
+    matcher = _matcher({"1": "ctrl+1"})
+
+    assert matcher.press("1", now=0.0) == ()
+    matcher.press("ctrl_l", now=0.1)
+    assert matcher.press("1", now=0.2) == ("1",)
+    matcher.release("ctrl_l")
+    assert matcher.press("1", now=0.3) == ()
+
+
+def test_sequence_and_timeout():
+    matcher = _matcher({"1": "g, 1"})
+
+    assert matcher.press("g", now=0.0) == ()
+    assert matcher.press("1", now=0.5) == ("1",)
+
+    assert matcher.press("g", now=1.0) == ()
+    # 제한 시간이 지나면 처음부터 다시 시작한다.
+    assert matcher.press("1", now=2.5) == ()
+
+
+def test_single_key_fires_while_modifier_held():
+    matcher = _matcher({"1": "g", "2": "shift+h"})
+
+    matcher.press("shift", now=0.0)
+    assert matcher.press("g", now=0.1) == ("1",)
+    assert matcher.press("h", now=0.2) == ("2",)
+
+
+def test_chord_wins_over_bare_key():
+    matcher = _matcher({"1": "g", "2": "ctrl+g"})
+
+    matcher.press("ctrl", now=0.0)
+    assert matcher.press("g", now=0.1) == ("2",)
+
+
+def test_missed_modifier_release_expires():
+    matcher = _matcher({"1": "ctrl+1", "2": "1"})
+
+    matcher.press("ctrl", now=0.0)
+    assert matcher.press("1", now=0.5) == ("1",)
+    # ctrl 뗌 이벤트를 놓쳤어도 한동안 입력이 없으면 뗀 것으로 본다.
+    assert matcher.press("1", now=5.0) == ("2",)
+
+
+def test_held_modifier_stays_with_repeat_events():
+    matcher = _matcher({"1": "ctrl+1"})
+
+    for tick in range(10):
+        matcher.press("ctrl", now=tick * 0.5)
+    assert matcher.press("1", now=4.6) == ("1",)
+
+
+def test_comma_binding():
+    assert parse_binding(",") == ("comma",)
+    assert normalize_binding("ctrl+comma, g") == "ctrl+comma, g"
+    assert format_binding(",") == "Comma"
+
+    matcher = _matcher({"1": ",", "2": "ctrl+comma"})
+    assert matcher.press(",", now=0.0) == ("1",)
+    matcher.press("ctrl", now=0.1)
+    assert matcher.press(",", now=0.2) == ("2",)
+
+
+def test_conflicts_include_prefixes():
+    index = HotkeyIndex.build({"1": "g, 1", "2": "f1"})
+
+    assert index.conflicts("g") == ["1"]
+    assert index.conflicts("g, 1, 2") == ["1"]
+    assert index.conflicts("g, 1", exclude="1") == []
+    assert index.conflicts("f2") == []
@@ -0,0 +1,42 @@
+"""단축키 훅은 시각만 넘기고, 추적은 작업 스레드에서 여는지."""
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+from timer_overlay import tracing  # noqa: E402
+from timer_overlay.hotkey_manager import _STOP, HotkeyManager  # noqa: E402
+
+
+def test_hook_only_queues_and_worker_opens_trace(monkeypatch):
+    tracer = tracing.Tracer()
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    manager = HotkeyManager()
+    manager.register("t1", "f1")
+    pressed = []
+    manager.set_action_callback(pressed.append)
+
+    before = time.perf_counter_ns()
+    manager._on_key_press(SimpleNamespace(char=None, name="f1"))
+
+    # 훅 콜백은 추적기를 건드리지 않는다.
+    assert not tracer.active
+    timer_id, started, hook_thread = manager._actions.get_nowait()
+    assert timer_id == "t1"
+    assert started >= before
+    assert hook_thread == threading.get_ident()
+
+    manager._actions.put_nowait((timer_id, started, hook_thread))
+    manager._actions.put_nowait(_STOP)
+    worker = threading.Thread(target=manager._drain_actions, name="HotkeyActions")
+    worker.start()
+    worker.join(2)
+
+    assert pressed == ["t1"]
+    (trace,) = tracer._open.values()
+    assert trace.source == "hotkey_manager"
+    assert trace.marks[0] == ("hook", started, hook_thread)
+    assert trace.marks[1][0] == "worker"
+    assert trace.marks[1][2] == worker.ident
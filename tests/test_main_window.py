@@ -0,0 +1,86 @@
+"""메인 윈도우가 화면 없이 만들어지고, 핸드셰이크 응답을 첫 화면으로 그리는지."""
+import threading
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+from timer_overlay.config import CONFIG_FILE_NAME, ConfigStore
+from timer_overlay.main_window import MainWindow
+from timer_overlay.standin_server import StandinServer, StandinState
+
+
+def _store(tmp_path, server_url: str, channel_code: str) -> ConfigStore:
+    store = ConfigStore(tmp_path / CONFIG_FILE_NAME)
+    config = store.load()
+    config.server_host = ""
+    config.server_url = server_url
+    config.channel_code = channel_code
+    store.save(config)
+    return store
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        QApplication.processEvents()
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_handshake_payload_fills_table(tmp_path):
+    state = StandinState()
+    state.add_channel("raid", 3)
+    with StandinServer("127.0.0.1", 0, state=state) as server:
+        window = MainWindow(_store(tmp_path, server.url, "raid"), watchdog=False)
+        try:
+            assert _wait_for(lambda: window.table.rowCount() == 3)
+            assert window.disconnect_button.isEnabled()
+        finally:
+            window.close()
+
+
+class _OfflineWindow(MainWindow):
+    def _initialize_connection(self) -> None:
+        pass
+
+
+def test_overlay_follows_payload_and_remembers_position(tmp_path):
+    window = _OfflineWindow(_store(tmp_path, "http://127.0.0.1:9", ""), watchdog=False)
+    try:
+        window._handle_timers_payload(
+            {"timers": [{"id": "1", "name": "혼테일", "duration": 60000, "remaining": 30000}]}
+        )
+        window._toggle_overlay(0)
+        overlay = window.overlays["1"]
+        overlay.update_position(40, 50)
+        window._update_table_remaining()
+
+        window._hide_overlay("1")
+
+        assert "1" not in window.overlays
+        assert window.config.timer_positions["1"] == (40, 50)
+    finally:
+        window.close()
+
+
+def test_hotkey_action_is_sent_off_the_gui_thread(tmp_path):
+    window = _OfflineWindow(_store(tmp_path, "http://127.0.0.1:9", ""), watchdog=False)
+    threads: list[str] = []
+
+    def dispatch(state, now=None):
+        threads.append(threading.current_thread().name)
+        return "시작", False
+
+    window._toggle_dispatcher.dispatch = dispatch
+    try:
+        window._handle_timers_payload({"timers": [{"id": "1", "name": "혼테일", "duration": 60000}]})
+        window._toggle_overlay(0)
+
+        window._handle_hotkey_triggered(("1",))
+
+        assert _wait_for(lambda: "실패" in window.status_label.text())
+        assert threads == ["HotkeyActions"]
+    finally:
+        window.close()
@@ -0,0 +1,99 @@
+"""스레드별 칸에 기록하는 히스토그램이 합친 값을 정확히 내고 읽기 락과 엮이지 않는지."""
+import random
+import threading
+
+from timer_overlay.metrics import Histogram, MetricsRegistry
+
+
+def _values(seed: int, count: int = 5000) -> list[int]:
+    rng = random.Random(seed)
+    return [int(rng.lognormvariate(12, 1.5)) for _ in range(count)]
+
+
+def _record_in_threads(histogram: Histogram, batches: list[list[int]]) -> None:
+    threads = [
+        threading.Thread(target=lambda values=values: [histogram.record(v) for v in values])
+        for values in batches
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_threads_merge_to_same_result_as_single_thread():
+    batches = [_values(seed) for seed in range(8)]
+    merged = Histogram("merged", "")
+    single = Histogram("single", "")
+
+    _record_in_threads(merged, batches)
+    for values in batches:
+        for value in values:
+            single.record(value)
+
+    flat = [value for values in batches for value in values]
+    assert merged.count == len(flat)
+    assert merged.summary() == single.summary()
+    assert merged.summary()["sum"] == sum(flat) * merged.scale
+    assert merged.cumulative() == single.cumulative()
+
+
+def test_record_does_not_wait_for_reader_lock():
+    histogram = Histogram("hook", "")
+    recorded = threading.Event()
+    first_done = threading.Event()
+    proceed = threading.Event()
+
+    def hook_thread() -> None:
+        histogram.record(1000)  # 첫 기록에서만 칸을 등록한다.
+        first_done.set()
+        proceed.wait()
+        for _ in range(100):
+            histogram.record(2000)
+        recorded.set()
+
+    thread = threading.Thread(target=hook_thread)
+    thread.start()
+    assert first_done.wait(2)
+    # 읽는 쪽(/metrics, 디버그 창)이 락을 쥐고 있어도 기록은 끝나야 한다.
+    with histogram._lock:
+        proceed.set()
+        assert recorded.wait(2)
+    thread.join()
+
+    assert histogram.count == 101
+
+
+def test_finished_thread_shards_are_folded_and_kept():
+    histogram = Histogram("folded", "")
+    _record_in_threads(histogram, [[10, 20], [30], [40, 50, 60]])
+
+    summary = histogram.summary()
+
+    assert histogram._shards == []
+    assert summary["count"] == 6
+    assert summary["sum"] == 210 * histogram.scale
+
+
+def test_reset_clears_and_threads_keep_recording():
+    histogram = Histogram("reset", "")
+    histogram.record(500)
+    histogram.reset()
+    assert histogram.count == 0
+
+    histogram.record(700)
+
+    assert histogram.count == 1
+    assert histogram.summary()["max"] == 700 * histogram.scale
+
+
+def test_prometheus_count_matches_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("timer_overlay_test_seconds", "테스트")
+    _record_in_threads(histogram, [_values(seed, 1000) for seed in range(4)])
+
+    lines = registry.render_prometheus().splitlines()
+
+    inf = next(line for line in lines if 'le="+Inf"' in line)
+    count = next(line for line in lines if line.startswith("timer_overlay_test_seconds_count"))
+    assert inf.rsplit(" ", 1)[1] == count.rsplit(" ", 1)[1] == "4000"
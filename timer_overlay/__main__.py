@@ -0,0 +1,18 @@
+"""``python -m timer_overlay`` 진입점. ``--headless`` 를 주면 창 없이 동기화만 실행한다."""
+import sys
+
+
+def main():
+    argv = sys.argv[1:]
+    if "--headless" in argv:
+        from timer_overlay.headless import main as headless_main
+
+        sys.exit(headless_main([arg for arg in argv if arg != "--headless"]))
+
+    from timer_overlay.main import main as gui_main
+
+    gui_main()
+
+
+if __name__ == "__main__":
+    main()
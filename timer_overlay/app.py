@@ -2,24 +2,32 @@
 from __future__ import annotations
 
 import logging
+import threading
 from typing import Dict, List, Optional
 
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtWidgets import (
     QAction, QApplication, QFrame, QGridLayout, QGroupBox, QHBoxLayout,
     QLabel, QMainWindow, QMenu, QMenuBar, QMessageBox, QPushButton,
     QScrollArea, QSlider, QStatusBar, QVBoxLayout, QWidget
 )
 
+from timer_overlay import metrics
 from timer_overlay.config import AppConfig, ConfigStore
+from timer_overlay.endpoints import EndpointSelector, normalize_urls
 from timer_overlay.hotkey_manager import HotkeyManager
+from timer_overlay.metrics_panel import MetricsDialog
 from timer_overlay.overlay_widget import TimerOverlay
+from timer_overlay.recorder import PayloadRecorder
 from timer_overlay.settings_dialog import (
     DisplaySettingsDialog, HotkeyCaptureDialog, ServerSettingsDialog
 )
+from timer_overlay.snapshot_cache import SnapshotCache
 from timer_overlay.timer_api import TimerAPI
 from timer_overlay.timer_poller import TimerPoller
 from timer_overlay.timer_state import TimerState
+from timer_overlay.tracing import export_from_env, get_tracer
+from timer_overlay.watchdog import EventLoopWatchdog
 
 logger = logging.getLogger(__name__)
 
@@ -110,6 +118,7 @@ class TimerCard(QFrame):
     def update_timer(self, timer: TimerState):
         """타이머 상태 업데이트."""
         self._timer = timer
+        get_tracer().shown(timer.id)
         self._name_label.setText(timer.name)
         self._time_label.setText(timer.get_remaining_str())
         
@@ -143,13 +152,18 @@ class TimerCard(QFrame):
 class TimerOverlayApp(QMainWindow):
     """타이머 오버레이 메인 애플리케이션."""
     
-    def __init__(self, config_store: ConfigStore):
+    # 경합 작업 스레드 -> GUI 스레드 (연결 세대, 셀렉터, 채널 코드)
+    _endpoint_raced = pyqtSignal(int, object, str)
+    
+    def __init__(self, config_store: ConfigStore, *, watchdog: bool = True):
         super().__init__()
         
         self.config_store = config_store
         self.config = config_store.load()
+        self._snapshot_cache = SnapshotCache.beside(config_store.path)
         
         # 상태
+        self._showing_stale = False
         self._timers: Dict[str, TimerState] = {}
         self._timer_cards: Dict[str, TimerCard] = {}
         self._overlays: Dict[str, TimerOverlay] = {}
@@ -157,6 +171,19 @@ class TimerOverlayApp(QMainWindow):
         # 서비스
         self._api: Optional[TimerAPI] = None
         self._poller: Optional[TimerPoller] = None
+        # 단축키 작업 스레드 전용 액션 클라이언트. GUI 스레드의 조회 세션과 나눠 쓰지 않고,
+        # 연결을 바꾸는 GUI 스레드와 참조를 주고받을 때는 락을 잡는다.
+        self._action_api: Optional[TimerAPI] = None
+        self._action_api_lock = threading.Lock()
+        self._connect_generation = 0
+        self._endpoint_raced.connect(self._on_endpoint_raced)
+        self._payload_recorder = PayloadRecorder.from_env(source="app")
+        self._metrics_server = metrics.MetricsServer.from_env()
+        self._metrics_dialog: Optional[MetricsDialog] = None
+        # 오프라인 재생/벤치마크 창은 표본 스레드가 측정을 흐리지 않도록 끈다.
+        self._watchdog = EventLoopWatchdog.from_env(parent=self) if watchdog else None
+        if self._watchdog is not None:
+            self._watchdog.start()
         self._hotkey_manager = HotkeyManager()
         self._hotkey_manager.set_action_callback(self._on_hotkey_pressed)
         self._hotkey_manager.set_hotkeys(self.config.timer_hotkeys)
@@ -227,6 +254,10 @@ class TimerOverlayApp(QMainWindow):
         display_action = QAction("디스플레이 설정...", self)
         display_action.triggered.connect(self._show_display_settings)
         view_menu.addAction(display_action)
+        
+        metrics_action = QAction("측정값...", self)
+        metrics_action.triggered.connect(self._show_metrics)
+        view_menu.addAction(metrics_action)
     
     def _setup_ui(self):
         """메인 UI 구성."""
@@ -316,6 +347,9 @@ class TimerOverlayApp(QMainWindow):
         server_url = self.config.server_url
         channel_code = self.config.channel_code
         
+        # 첫 응답 전까지 마지막으로 저장된 상태를 먼저 표시
+        self._restore_snapshot(channel_code)
+        
         if not server_url or not channel_code:
             self._show_server_settings()
         else:
@@ -354,27 +388,110 @@ class TimerOverlayApp(QMainWindow):
             self._scale_slider.setValue(dialog.get_scale())
             self._apply_display_settings()
     
+    def _show_metrics(self):
+        """측정값 디버그 창 표시."""
+        if self._metrics_dialog is None:
+            self._metrics_dialog = MetricsDialog(self, server=self._metrics_server)
+        self._metrics_dialog.show()
+        self._metrics_dialog.raise_()
+    
     def _connect(self, server_url: str, channel_code: str):
         """서버 연결."""
-        # 기존 연결 정리
+        # 기존 연결 정리 (진행 중인 경합 결과도 버린다)
+        self._connect_generation += 1
         if self._poller:
             self._poller.stop()
+            self._poller = None
         if self._api:
             self._api.close()
+            self._api = None
+        self._replace_action_api(None)
         
-        # 새 연결
-        self._api = TimerAPI(server_url)
+        # 새 연결: 설정된 모든 엔드포인트(마지막은 localhost) 중 가장 빠른 곳을 사용
+        urls = normalize_urls([server_url, *self.config.endpoint_urls()])
+        selector = EndpointSelector(urls, hedge=self.config.hedge_requests, parent=self)
+        selector.endpoint_changed.connect(self._on_endpoint_changed)
+        
+        self._hotkey_manager.start()
+        
+        self.statusBar().showMessage(f"연결 중: {server_url}")
+        if len(selector.urls) < 2:
+            self._start_polling(selector, channel_code)
+            return
+        # 첫 조회부터 가장 먼저 응답한 엔드포인트로 보내도록 GUI 스레드 밖에서 먼저 경합한다.
+        threading.Thread(
+            target=self._race_endpoints,
+            args=(self._connect_generation, selector, channel_code),
+            name="EndpointRace",
+            daemon=True,
+        ).start()
+    
+    def _race_endpoints(self, generation: int, selector: EndpointSelector, channel_code: str):
+        """엔드포인트 경합 (작업 스레드)."""
+        try:
+            selector.race()
+        except Exception as e:
+            # 경합에 실패해도 첫 후보로 조회를 시작해 "연결 중" 에 멈추지 않게 한다.
+            logger.warning("엔드포인트 경합 오류: %s", e)
+        self._endpoint_raced.emit(generation, selector, channel_code)
+    
+    def _on_endpoint_raced(self, generation: int, selector: EndpointSelector, channel_code: str):
+        """경합이 끝났다. 그 사이 다시 연결했거나 닫혔으면 결과를 버린다."""
+        if generation != self._connect_generation:
+            selector.deleteLater()
+            return
+        self._start_polling(selector, channel_code)
+    
+    def _start_polling(self, selector: EndpointSelector, channel_code: str):
+        """셀렉터의 현재 엔드포인트로 조회를 시작한다."""
+        selector.start_monitoring()
+        self._api = TimerAPI(selector.current, selector=selector)
+        self._replace_action_api(TimerAPI(selector.current, selector=selector))
         self._poller = TimerPoller(self._api, channel_code, interval_ms=500, parent=self)
+        self._poller.set_recorder(self._payload_recorder)
         self._poller.timers_updated.connect(self._on_timers_updated)
         self._poller.connection_changed.connect(self._on_connection_changed)
         self._poller.start()
+    
+    def _replace_action_api(self, api: Optional[TimerAPI]):
+        """단축키 작업 스레드가 쓸 액션 클라이언트를 교체하고 이전 것을 닫는다."""
+        with self._action_api_lock:
+            previous, self._action_api = self._action_api, api
+        if previous is not None:
+            previous.session.close()
+    
+    def _restore_snapshot(self, channel_code: str):
+        """저장된 스냅샷을 오프라인 상태로 표시."""
+        snapshot = self._snapshot_cache.load(channel_code)
+        if snapshot is None:
+            return
         
-        self._hotkey_manager.start()
+        timers = []
+        for item in snapshot.timers:
+            try:
+                timers.append(TimerState.from_payload(item))
+            except (TypeError, ValueError) as e:
+                logger.debug("스냅샷 타이머 파싱 실패: %s", e)
+        if not timers:
+            return
+        timers.sort(key=lambda t: (t.display_order, t.id))
         
-        self.statusBar().showMessage(f"연결 중: {server_url}")
+        self._apply_timers(timers)
+        self._showing_stale = True
+        self._connection_label.setText("오프라인 (저장된 정보)")
+        self._connection_label.setStyleSheet("color: #ff9800; font-size: 12px;")
     
+    @metrics.GUI_APPLY.timed
     def _on_timers_updated(self, timers: List[TimerState]):
         """타이머 목록 업데이트 처리."""
+        get_tracer().payload_applied()
+        self._apply_timers(timers)
+        self._snapshot_cache.save(
+            self.config.channel_code, [t.to_payload() for t in timers]
+        )
+    
+    def _apply_timers(self, timers: List[TimerState]):
+        """타이머 목록을 카드/오버레이에 반영."""
         # 상태 저장
         new_timers = {t.id: t for t in timers}
         
@@ -436,6 +553,7 @@ class TimerOverlayApp(QMainWindow):
             card = self._timer_cards[timer_id]
             self._grid_layout.addWidget(card, row, col)
     
+    @metrics.UI_TICK.timed
     def _update_ui(self):
         """UI 주기적 갱신 (100ms)."""
         for timer_id, timer in self._timers.items():
@@ -452,11 +570,14 @@ class TimerOverlayApp(QMainWindow):
         timer = self._timers.get(timer_id)
         if not timer or not self._api:
             return
-        
+        self._send_toggle(self._api, timer)
+    
+    def _send_toggle(self, api: TimerAPI, timer: TimerState):
+        """실행 중이면 리셋, 아니면 시작을 요청."""
         if timer.is_running:
-            self._api.reset_timer(self.config.channel_code, timer_id)
+            api.reset_timer(self.config.channel_code, timer.id)
         else:
-            self._api.start_timer(self.config.channel_code, timer_id)
+            api.start_timer(self.config.channel_code, timer.id)
     
     def _on_hotkey_btn_clicked(self, timer_id: str):
         """단축키 버튼 클릭."""
@@ -528,18 +649,36 @@ class TimerOverlayApp(QMainWindow):
         self.config_store.save(self.config)
     
     def _on_hotkey_pressed(self, timer_id: str):
-        """단축키 눌림."""
-        self._on_action_clicked(timer_id)
+        """단축키 눌림 (HotkeyManager 작업 스레드에서 호출)."""
+        timer = self._timers.get(timer_id)
+        if timer is None:
+            get_tracer().drop(timer_id, "타이머 없음")
+            return
+        with self._action_api_lock:
+            api = self._action_api
+        if api is None:
+            get_tracer().drop(timer_id, "연결 없음")
+            return
+        # 요청 중에 연결이 바뀌면 이 세션이 닫혀 요청이 실패로 기록된다.
+        self._send_toggle(api, timer)
     
     def _on_connection_changed(self, connected: bool, message: str):
         """연결 상태 변경."""
         if connected:
+            self._showing_stale = False
             self._connection_label.setText("연결됨")
             self._connection_label.setStyleSheet("color: #4caf50; font-size: 12px;")
+        elif self._showing_stale:
+            self._connection_label.setText(f"{message} (저장된 정보 표시 중)")
+            self._connection_label.setStyleSheet("color: #ff9800; font-size: 12px;")
         else:
             self._connection_label.setText(message)
             self._connection_label.setStyleSheet("color: #ff5252; font-size: 12px;")
     
+    def _on_endpoint_changed(self, url: str):
+        """엔드포인트 전환 알림."""
+        self.statusBar().showMessage(f"서버 전환: {url}")
+    
     def _on_opacity_changed(self, value: int):
         """투명도 변경."""
         self.config.overlay_opacity = value
@@ -567,10 +706,19 @@ class TimerOverlayApp(QMainWindow):
         """종료 처리."""
         self._hotkey_manager.stop()
         
+        self._connect_generation += 1
         if self._poller:
             self._poller.stop()
         if self._api:
             self._api.close()
+        self._replace_action_api(None)
+        if self._payload_recorder is not None:
+            self._payload_recorder.close()
+        if self._metrics_server is not None:
+            self._metrics_server.stop()
+        if self._watchdog is not None:
+            self._watchdog.stop()
+        export_from_env()
         
         # 오버레이 닫기
         for overlay in list(self._overlays.values()):
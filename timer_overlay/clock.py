@@ -0,0 +1,100 @@
+"""교체 가능한 시계.
+
+남은 시간 계산, 서버 시계 보정, 단축키 대기 시간처럼 타이머 논리가 읽는 시각은
+모두 :func:`get_clock` 을 거친다. 시뮬레이션에서는 :class:`SimulatedClock` 으로 바꿔
+몇 시간짜리 시나리오를 즉시 빨리 감을 수 있다. 네트워크 대기나 성능 측정처럼
+실제 시간이 필요한 곳은 ``time`` 모듈을 그대로 쓴다.
+"""
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from typing import Iterator
+
+
+class Clock:
+    """시스템 시계."""
+
+    def time(self) -> float:
+        """벽시계 (epoch 초). 사용자가 바꾸거나 NTP 가 보정할 수 있다."""
+
+        return time.time()
+
+    def monotonic(self) -> float:
+        """단조 시계 (초). 간격 계산에만 쓴다."""
+
+        return time.monotonic()
+
+    def time_ms(self) -> int:
+        return int(self.time() * 1000)
+
+
+class SimulatedClock(Clock):
+    """직접 앞으로 감는 시계.
+
+    ``monotonic`` 은 0 에서 시작해 :meth:`advance` 로만 움직인다. 벽시계는
+    실제 경과 시간(``true_time``)에 누적 드리프트(``drift_ppm``)와
+    :meth:`jump` 로 준 순간 변경을 더한 값이다.
+    """
+
+    def __init__(self, start_time: float = 1_700_000_000.0) -> None:
+        self._lock = threading.Lock()
+        self._start_time = start_time
+        self._monotonic = 0.0
+        self._wall_offset = 0.0
+        self.drift_ppm = 0.0
+
+    def time(self) -> float:
+        with self._lock:
+            return self._start_time + self._monotonic + self._wall_offset
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self._monotonic
+
+    def true_time(self) -> float:
+        """드리프트와 변경이 없는 기준 시각 (서버 쪽 시계로 쓴다)."""
+
+        with self._lock:
+            return self._start_time + self._monotonic
+
+    def advance(self, seconds: float) -> None:
+        if seconds < 0:
+            raise ValueError("시계는 뒤로 감을 수 없습니다.")
+        with self._lock:
+            self._monotonic += seconds
+            self._wall_offset += seconds * self.drift_ppm / 1_000_000
+
+    def advance_to(self, monotonic: float) -> None:
+        self.advance(max(0.0, monotonic - self.monotonic()))
+
+    def jump(self, seconds: float) -> None:
+        """벽시계만 ``seconds`` 만큼 바꾼다 (사용자 변경, NTP 보정)."""
+
+        with self._lock:
+            self._wall_offset += seconds
+
+
+_clock: Clock = Clock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """전역 시계를 바꾸고 이전 시계를 반환한다."""
+
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextlib.contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
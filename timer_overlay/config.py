@@ -9,7 +9,9 @@ import tempfile
 import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+from timer_overlay.endpoints import candidate_urls
 
 logger = logging.getLogger(__name__)
 
@@ -102,11 +104,15 @@ class AppConfig:
     server_host: str = "218.234.230.188"
     server_port: int = 47984
     server_url: str = ""  # HTTPS URL (예: https://your-app.vercel.app)
+    server_endpoints: List[str] = field(default_factory=list)  # 추가 미러 (예: LAN 주소)
+    hedge_requests: bool = False
     channel_code: str = ""
     timer_positions: Dict[str, Tuple[int, int]] = field(default_factory=dict)
     timer_hotkeys: Dict[str, str] = field(default_factory=dict)
     overlay_opacity: int = 85
     overlay_scale: int = 1
+    # 화면별 마지막 체력바 위치 목록 (물리 픽셀 x, y, 너비, 높이)
+    healthbar_regions: Dict[str, List[Tuple[int, int, int, int]]] = field(default_factory=dict)
 
     @classmethod
     def from_dict(cls, data: Dict) -> "AppConfig":
@@ -139,15 +145,45 @@ class AppConfig:
                     continue
                 hotkeys[str(timer_id)] = key_name
 
+        endpoints: List[str] = []
+        raw_endpoints = data.get("server_endpoints")
+        if isinstance(raw_endpoints, list):
+            for value in raw_endpoints:
+                if isinstance(value, str) and value.strip():
+                    endpoints.append(value.strip())
+
+        healthbar_regions: Dict[str, List[Tuple[int, int, int, int]]] = {}
+        raw_regions = data.get("healthbar_regions")
+        if isinstance(raw_regions, dict):
+            for screen_key, raw_rects in raw_regions.items():
+                if not isinstance(raw_rects, list):
+                    continue
+                # 단일 영역으로 저장된 이전 형식 지원
+                if raw_rects and not isinstance(raw_rects[0], list):
+                    raw_rects = [raw_rects]
+                rects = []
+                for raw_rect in raw_rects:
+                    try:
+                        x, y, width, height = (int(value) for value in raw_rect)
+                    except (TypeError, ValueError):
+                        continue
+                    if width > 0 and height > 0:
+                        rects.append((x, y, width, height))
+                if rects:
+                    healthbar_regions[str(screen_key)] = rects
+
         return cls(
             server_host=data.get("server_host", "218.234.230.188"),
             server_port=int(data.get("server_port", 47984)),
             server_url=str(data.get("server_url", "")).strip(),
+            server_endpoints=endpoints,
+            hedge_requests=bool(data.get("hedge_requests", False)),
             timer_positions=timer_positions,
             overlay_opacity=int(data.get("overlay_opacity", 85)),
             timer_hotkeys=hotkeys,
             overlay_scale=int(data.get("overlay_scale", 1)),
             channel_code=str(data.get("channel_code", "")).strip(),
+            healthbar_regions=healthbar_regions,
         )
 
     def to_dict(self) -> Dict:
@@ -155,13 +191,25 @@ class AppConfig:
             "server_host": self.server_host,
             "server_port": self.server_port,
             "server_url": self.server_url,
+            "server_endpoints": list(self.server_endpoints),
+            "hedge_requests": bool(self.hedge_requests),
             "channel_code": self.channel_code,
             "timer_positions": {key: list(value) for key, value in self.timer_positions.items()},
             "overlay_opacity": int(self.overlay_opacity),
             "timer_hotkeys": dict(self.timer_hotkeys),
             "overlay_scale": int(self.overlay_scale),
+            "healthbar_regions": {
+                key: [list(rect) for rect in rects] for key, rects in self.healthbar_regions.items()
+            },
         }
 
+    def endpoint_urls(self) -> List[str]:
+        """접속 후보 URL 목록 (우선순위 순, 마지막은 localhost)."""
+
+        return candidate_urls(
+            self.server_url, self.server_host, self.server_port, self.server_endpoints
+        )
+
 
 def _ensure_writable_file_path(path: Path) -> Path:
     """파일을 저장할 수 있는 경로를 보장한다."""
@@ -0,0 +1,351 @@
+"""여러 서버 엔드포인트 중 가장 빠른 곳을 고르고 장애 시 전환하는 모듈."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+from PyQt5.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_URL = "http://localhost:47984"
+
+# RTT 지수 이동 평균 가중치
+_RTT_ALPHA = 0.3
+# 현재 엔드포인트를 유지하는 여유 (다른 곳이 이만큼 빨라야 전환)
+_SWITCH_RATIO = 1.5
+_SWITCH_MARGIN_MS = 20.0
+# 연속으로 이만큼 실패해야 비정상으로 보고 다른 곳으로 전환한다.
+_FAILURE_THRESHOLD = 3
+
+_hedge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hedge")
+
+
+def normalize_urls(urls: Iterable[str]) -> List[str]:
+    """공백/중복/끝 슬래시를 정리한 URL 목록을 순서대로 반환한다."""
+
+    result: List[str] = []
+    for raw in urls:
+        url = (raw or "").strip().rstrip("/")
+        if url and url not in result:
+            result.append(url)
+    return result
+
+
+def candidate_urls(
+    url: str = "", host: str = "", port: int = 0, endpoints: Iterable[str] = ()
+) -> List[str]:
+    """설정에서 접속 후보 URL 목록을 우선순위 순으로 만든다. 마지막 후보는 항상 localhost 이다.
+
+    서버 설정(``ServerSettings``)과 앱 설정(``AppConfig``) 모두 이 함수로 목록을 만든다.
+    """
+
+    candidates: List[str] = []
+    if url:
+        candidates.append(url)
+    if host:
+        candidates.append(f"http://{host}:{port}")
+    candidates.extend(endpoints)
+    candidates.append(FALLBACK_URL)
+    return normalize_urls(candidates)
+
+
+def probe_endpoint(url: str, timeout: float = 5.0) -> Optional[float]:
+    """``/api/health`` 왕복 시간(ms)을 잰다. 실패하면 ``None``."""
+
+    started = time.perf_counter()
+    try:
+        response = requests.get(f"{url}/api/health", timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        logger.debug("엔드포인트 점검 실패 (%s): %s", url, exc)
+        return None
+    return (time.perf_counter() - started) * 1000
+
+
+@dataclass
+class EndpointHealth:
+    """엔드포인트별 측정 상태.
+
+    ``rtt_ms`` 는 ``/api/health`` 점검 RTT 로 모든 후보를 같은 요청으로 재므로
+    엔드포인트 선택에 쓴다. ``request_rtt_ms`` 는 실제 요청(타이머 조회 등) RTT 로
+    현재 엔드포인트에만 쌓이므로 선택에는 쓰지 않고 헤지 지연 계산에만 쓴다.
+    """
+
+    url: str
+    rtt_ms: Optional[float] = None
+    request_rtt_ms: Optional[float] = None
+    healthy: bool = False
+    failures: int = 0
+    checked_at: float = 0.0
+
+
+class EndpointSelector(QObject):
+    """후보 엔드포인트의 RTT 를 계속 측정해 가장 빠른 곳을 현재 엔드포인트로 유지한다."""
+
+    endpoint_changed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        *,
+        hedge: bool = False,
+        probe_interval_s: float = 15.0,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._urls = normalize_urls(urls)
+        if not self._urls:
+            self._urls = [FALLBACK_URL]
+        self._health: Dict[str, EndpointHealth] = {url: EndpointHealth(url) for url in self._urls}
+        self._current = self._urls[0]
+        self._lock = threading.Lock()
+        self._hedge = hedge
+        self._probe_interval_s = probe_interval_s
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self._urls)
+
+    @property
+    def current(self) -> str:
+        return self._current
+
+    @property
+    def hedging(self) -> bool:
+        return self._hedge and len(self._urls) > 1
+
+    def snapshot(self) -> List[EndpointHealth]:
+        with self._lock:
+            return [EndpointHealth(**vars(item)) for item in self._health.values()]
+
+    # 측정 결과 반영 -------------------------------------------------------
+    def report_success(self, url: str, rtt_ms: float, *, probe: bool = False) -> None:
+        """요청 성공을 기록한다. ``probe`` 가 아니면 RTT 는 선택 기준에 넣지 않는다."""
+
+        self._record(url, rtt_ms, probe=probe)
+
+    def report_failure(self, url: str) -> bool:
+        """요청 실패를 기록한다. 다른 엔드포인트로 전환했으면 ``True``.
+
+        연속 ``_FAILURE_THRESHOLD`` 번 실패해야 비정상으로 본다.
+        """
+
+        before = self._current
+        self._record(url, None)
+        return self._current != before
+
+    def _record(self, url: str, rtt_ms: Optional[float], *, probe: bool = True) -> None:
+        changed_to: Optional[str] = None
+        with self._lock:
+            health = self._health.get(url)
+            if health is None:
+                return
+            health.checked_at = time.monotonic()
+            if rtt_ms is None:
+                health.failures += 1
+                if health.failures >= _FAILURE_THRESHOLD:
+                    health.healthy = False
+            else:
+                health.healthy = True
+                health.failures = 0
+                if probe:
+                    health.rtt_ms = _ewma(health.rtt_ms, rtt_ms)
+                else:
+                    health.request_rtt_ms = _ewma(health.request_rtt_ms, rtt_ms)
+            best = self._choose_locked()
+            if best != self._current:
+                self._current = best
+                changed_to = best
+        if changed_to is not None:
+            logger.info("엔드포인트 전환: %s", changed_to)
+            self.endpoint_changed.emit(changed_to)
+
+    def _choose_locked(self) -> str:
+        healthy = [item for item in self._health.values() if item.healthy and item.rtt_ms is not None]
+        if not healthy:
+            return self._current
+        best = min(healthy, key=lambda item: item.rtt_ms)
+        current = self._health[self._current]
+        if current.healthy:
+            # 아직 점검하지 않은 현재 엔드포인트는 요청이 성공하는 동안 유지한다.
+            if current.rtt_ms is None:
+                return self._current
+            if current.rtt_ms <= best.rtt_ms * _SWITCH_RATIO + _SWITCH_MARGIN_MS:
+                return self._current
+        return best.url
+
+    # 헤징 ----------------------------------------------------------------
+    def hedge_target(self) -> Optional[str]:
+        """헤지 요청을 보낼 두 번째로 빠른 정상 엔드포인트."""
+
+        with self._lock:
+            candidates = [
+                item
+                for item in self._health.values()
+                if item.url != self._current and item.healthy
+            ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda item: item.rtt_ms or float("inf")).url
+
+    def hedge_delay_s(self, timeout: float) -> float:
+        current = self._health[self._current]
+        rtt = current.request_rtt_ms if current.request_rtt_ms is not None else current.rtt_ms
+        delay = 0.15 if rtt is None else max(0.05, 3 * rtt / 1000)
+        return min(delay, timeout / 2)
+
+    # 경합 / 감시 ----------------------------------------------------------
+    def race(self, timeout: float = 5.0, stagger_s: float = 0.25) -> Optional[str]:
+        """Happy Eyeballs 방식으로 후보를 순차 시차를 두고 점검한다.
+
+        가장 먼저 응답한 엔드포인트를 현재 엔드포인트로 정하고 반환한다.
+        늦게 도착한 응답도 측정값에는 반영된다.
+        """
+
+        executor = ThreadPoolExecutor(max_workers=len(self._urls), thread_name_prefix="race")
+        pending: set[Future] = set()
+        winner: Optional[str] = None
+        deadline = time.monotonic() + timeout
+
+        def on_done(url: str) -> Callable[[Future], None]:
+            def record(future: Future) -> None:
+                self._record(url, future.result())
+
+            return record
+
+        try:
+            for url in self._urls:
+                future = executor.submit(probe_endpoint, url, timeout)
+                future.add_done_callback(on_done(url))
+                future.url = url  # type: ignore[attr-defined]
+                pending.add(future)
+                winner, pending = self._first_success(pending, stagger_s)
+                if winner is not None:
+                    break
+            while winner is None and pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                winner, pending = self._first_success(pending, remaining)
+        finally:
+            executor.shutdown(wait=False)
+
+        if winner is not None:
+            with self._lock:
+                changed = winner != self._current
+                self._current = winner
+            if changed:
+                self.endpoint_changed.emit(winner)
+        return winner
+
+    @staticmethod
+    def _first_success(pending: set[Future], timeout: float) -> tuple[Optional[str], set[Future]]:
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.result() is not None:
+                    return future.url, pending  # type: ignore[attr-defined]
+        return None, pending
+
+    def start_monitoring(self) -> None:
+        if self._monitor is not None and self._monitor.is_alive():
+            return
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="EndpointMonitor", daemon=True)
+        self._monitor.start()
+
+    def stop_monitoring(self) -> None:
+        self._stop.set()
+
+    def _monitor_loop(self) -> None:
+        if len(self._urls) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=len(self._urls), thread_name_prefix="probe") as executor:
+            while not self._stop.is_set():
+                futures = {url: executor.submit(probe_endpoint, url) for url in self._urls}
+                for url, future in futures.items():
+                    self._record(url, future.result())
+                self._stop.wait(self._probe_interval_s)
+
+
+def _ewma(average: Optional[float], value: float) -> float:
+    return value if average is None else average + _RTT_ALPHA * (value - average)
+
+
+def _timed_get(
+    selector: EndpointSelector,
+    url: str,
+    path: str,
+    get: Callable[..., requests.Response],
+    params: Optional[Dict[str, Any]],
+    timeout: float,
+) -> requests.Response:
+    started = time.perf_counter()
+    try:
+        response = get(f"{url}{path}", params=params, timeout=timeout)
+    except requests.RequestException:
+        selector.report_failure(url)
+        raise
+    if response.status_code >= 500:
+        selector.report_failure(url)
+    else:
+        selector.report_success(url, (time.perf_counter() - started) * 1000)
+    return response
+
+
+def hedged_get(
+    selector: EndpointSelector,
+    path: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: float = 5.0,
+    session: Optional[requests.Session] = None,
+) -> requests.Response:
+    """현재 엔드포인트로 GET 요청을 보낸다.
+
+    헤징이 켜져 있고 응답이 늦으면 두 번째 엔드포인트에도 요청을 보내
+    먼저 도착한 정상 응답을 사용한다.
+    """
+
+    primary = selector.current
+    get = session.get if session is not None else requests.get
+    secondary = selector.hedge_target() if selector.hedging else None
+    if secondary is None:
+        return _timed_get(selector, primary, path, get, params, timeout)
+
+    first = _hedge_executor.submit(_timed_get, selector, primary, path, get, params, timeout)
+    done, _ = wait([first], timeout=selector.hedge_delay_s(timeout))
+    if done:
+        return first.result()
+
+    # 세션은 스레드 간에 공유하지 않으므로 헤지 요청은 별도 연결로 보낸다.
+    second = _hedge_executor.submit(
+        _timed_get, selector, secondary, path, requests.get, params, timeout
+    )
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            exc = future.exception()
+            if exc is None and future.result().status_code < 500:
+                return future.result()
+            error = exc or error
+            if exc is None and not pending:
+                return future.result()
+    assert error is not None
+    raise error
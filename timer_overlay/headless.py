@@ -0,0 +1,291 @@
+"""GUI 없이 타이머 동기화만 실행하는 클라이언트.
+
+``TimerService`` 의 폴링, 서버 시계 보정, 단축키 액션(시작/리셋 전환)을 그대로 쓰고
+상태 변화를 로그나 JSON 줄로 내보낸다. Qt 이벤트 루프가 없어도 동작하도록
+시그널을 ``DirectConnection`` 으로 받으므로 리스너는 서비스 스레드에서 호출된다.
+
+    python -m timer_overlay --headless --server http://127.0.0.1:47984 --channel ca01 --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import Qt
+
+from timer_overlay.clock import get_clock
+from timer_overlay.config import ConfigStore
+from timer_overlay.network import (
+    RemoteTimerState,
+    ServerSettings,
+    TimerService,
+    ToggleDispatcher,
+    estimate_server_clock_offset,
+)
+
+logger = logging.getLogger(__name__)
+
+# 실행 중인 타이머의 종료 시각이 이보다 크게 뒤로 밀리면 새 주기로 본다.
+_ROLLOVER_THRESHOLD_MS = 500
+ACTIONS = ("start", "pause", "reset", "toggle-repeat", "toggle")
+
+
+@dataclass(frozen=True)
+class TimerTransition:
+    """상태 변화 한 건. ``timer_id`` 가 빈 문자열이면 연결 상태 변화다."""
+
+    timestamp: float
+    kind: str
+    timer_id: str = ""
+    name: str = ""
+    remaining_ms: int = 0
+    detail: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def describe(self) -> str:
+        if not self.timer_id:
+            return f"{self.kind}: {self.detail}" if self.detail else self.kind
+        text = f"{self.kind} [{self.timer_id}] {self.name} ({RemoteTimerState.format_duration(self.remaining_ms)})"
+        return f"{text} {self.detail}" if self.detail else text
+
+
+def diff_states(
+    previous: Dict[str, RemoteTimerState],
+    current: Dict[str, RemoteTimerState],
+    timestamp: Optional[float] = None,
+) -> List[TimerTransition]:
+    """두 스냅샷 사이의 타이머 상태 변화를 표시 순서대로 반환한다."""
+
+    timestamp = get_clock().time() if timestamp is None else timestamp
+    transitions: List[TimerTransition] = []
+
+    def emit(kind: str, state: RemoteTimerState, detail: str = "") -> None:
+        transitions.append(
+            TimerTransition(timestamp, kind, state.id, state.name, state.remaining_ms_at(), detail)
+        )
+
+    for state in sorted(current.values(), key=lambda item: item.sort_index):
+        before = previous.get(state.id)
+        if before is None:
+            emit("added", state, "실행 중" if state.is_running else "")
+            continue
+        if before.name != state.name:
+            emit("renamed", state, f"{before.name} -> {state.name}")
+        if before.repeat_enabled != state.repeat_enabled:
+            emit("repeat_on" if state.repeat_enabled else "repeat_off", state)
+        if not before.is_running and state.is_running:
+            emit("started", state)
+        elif before.is_running and not state.is_running:
+            if state.remaining_ms <= 0:
+                emit("finished", state)
+            elif state.remaining_ms >= state.duration_ms:
+                emit("reset", state)
+            else:
+                emit("paused", state)
+        elif state.is_running and before.end_time_ms is not None and state.end_time_ms is not None:
+            if state.end_time_ms - before.end_time_ms > _ROLLOVER_THRESHOLD_MS:
+                emit("rollover" if state.repeat_enabled else "restarted", state)
+        elif not state.is_running and before.remaining_ms != state.remaining_ms:
+            if state.remaining_ms >= state.duration_ms:
+                emit("reset", state)
+    for timer_id, before in previous.items():
+        if timer_id not in current:
+            emit("removed", before)
+    return transitions
+
+
+class HeadlessClient:
+    """창 없이 채널 하나를 따라가는 클라이언트.
+
+    ``add_listener`` 로 등록한 함수는 :class:`TimerTransition` 을 받는다.
+    """
+
+    def __init__(
+        self,
+        settings: ServerSettings,
+        channel_code: str,
+        *,
+        service: Optional[TimerService] = None,
+    ) -> None:
+        self.service = service if service is not None else TimerService(settings)
+        self.service.update_channel_code(channel_code)
+        self.service.timers_updated.connect(self.apply_payload, Qt.DirectConnection)
+        self.service.connection_state_changed.connect(self._handle_connection_state, Qt.DirectConnection)
+        self._dispatcher = ToggleDispatcher(self.service)
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[TimerTransition], None]] = []
+        self._connected: Optional[bool] = None
+        self.timer_states: Dict[str, RemoteTimerState] = {}
+        self.server_clock_offset_ms = 0
+        self.payload_count = 0
+
+    def add_listener(self, callback: Callable[[TimerTransition], None]) -> None:
+        self._listeners.append(callback)
+
+    def start(self) -> None:
+        self.service.start()
+
+    def stop(self) -> None:
+        self.service.stop()
+
+    def snapshot(self) -> List[RemoteTimerState]:
+        with self._lock:
+            return sorted(self.timer_states.values(), key=lambda item: item.sort_index)
+
+    def perform(self, action: str, timer_id: str) -> Tuple[str, bool]:
+        """액션을 보내고 ``(액션, 성공 여부)`` 를 반환한다. ``toggle`` 은 단축키와 같다."""
+
+        if action == "toggle":
+            with self._lock:
+                state = self.timer_states.get(timer_id)
+            if state is None:
+                return action, False
+            if self._dispatcher.cooling_down(timer_id):
+                return action, False
+            return self._dispatcher.dispatch(state)
+        handlers = {
+            "start": self.service.start_timer,
+            "pause": self.service.pause_timer,
+            "reset": self.service.reset_timer,
+            "toggle-repeat": self.service.toggle_repeat,
+        }
+        if action not in handlers:
+            raise ValueError(f"알 수 없는 액션: {action}")
+        return action, handlers[action](timer_id)
+
+    # 서비스 스레드 -------------------------------------------------------
+    def apply_payload(self, payload: Dict) -> None:
+        timers_data = payload.get("timers")
+        if not isinstance(timers_data, list):
+            logger.debug("타이머 데이터 형식이 올바르지 않습니다: %s", payload)
+            return
+        offset = estimate_server_clock_offset(timers_data)
+        updated: Dict[str, RemoteTimerState] = {}
+        for item in timers_data:
+            try:
+                state = RemoteTimerState.from_payload(item)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.debug("타이머 데이터 파싱 실패: %s", exc)
+                continue
+            updated[state.id] = state
+        with self._lock:
+            if offset is not None:
+                self.server_clock_offset_ms = offset
+            for state in updated.values():
+                state.server_clock_offset_ms = self.server_clock_offset_ms
+            # 빈 응답이고 기존 타이머가 있으면 상태 유지 (MainWindow 와 같음)
+            if not updated and self.timer_states:
+                return
+            previous, self.timer_states = self.timer_states, updated
+            self.payload_count += 1
+        for transition in diff_states(previous, updated):
+            self._notify(transition)
+
+    def _handle_connection_state(self, connected: bool, message: str) -> None:
+        if connected == self._connected:
+            return
+        self._connected = connected
+        self._notify(TimerTransition(get_clock().time(), "connected" if connected else "disconnected", detail=message))
+
+    def _notify(self, transition: TimerTransition) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(transition)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("상태 변화 리스너 오류: %s", exc)
+
+
+def _settings_from_args(args: argparse.Namespace) -> Tuple[ServerSettings, str]:
+    if args.server and args.channel:
+        return ServerSettings(url=args.server), args.channel
+    config = ConfigStore(Path(args.config) if args.config else None).load()
+    settings = ServerSettings(
+        host=config.server_host,
+        port=config.server_port,
+        url=args.server or config.server_url,
+        endpoints=tuple(config.server_endpoints),
+        hedge=config.hedge_requests,
+    )
+    return settings, args.channel or config.channel_code
+
+
+def _read_commands(client: HeadlessClient, emit: Callable[[TimerTransition], None], done: threading.Event) -> None:
+    """표준 입력의 ``<액션> <타이머 id>`` 줄을 실행한다.
+
+    ``list`` 는 현재 상태를 출력하고, ``quit`` 이나 입력 끝에서 클라이언트를 종료한다.
+    """
+
+    for line in sys.stdin:
+        words = line.split()
+        if not words:
+            continue
+        if words[0] == "quit":
+            break
+        if words[0] == "list":
+            for state in client.snapshot():
+                emit(TimerTransition(get_clock().time(), "state", state.id, state.name, state.remaining_ms_at(),
+                                     "실행 중" if state.is_running else "정지"))
+            continue
+        if len(words) != 2 or words[0] not in ACTIONS:
+            emit(TimerTransition(get_clock().time(), "error", detail=f"알 수 없는 명령: {line.strip()}"))
+            continue
+        action, success = client.perform(words[0], words[1])
+        emit(TimerTransition(get_clock().time(), "action", words[1], detail=f"{action} {'성공' if success else '실패'}"))
+    done.set()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m timer_overlay --headless", description="GUI 없이 타이머 동기화 실행")
+    parser.add_argument("--server", help="서버 URL (지정하지 않으면 설정 파일 사용)")
+    parser.add_argument("--channel", help="채널 코드 (지정하지 않으면 설정 파일 사용)")
+    parser.add_argument("--config", help="설정 파일 경로")
+    parser.add_argument("--duration", type=float, help="이 시간(초)만 실행하고 종료")
+    parser.add_argument("--json", action="store_true", help="상태 변화를 JSON 줄로 표준 출력에 씀")
+    parser.add_argument("--commands", action="store_true", help="표준 입력에서 '<액션> <타이머 id>' 명령을 읽음")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] %(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+    settings, channel_code = _settings_from_args(args)
+    if not channel_code:
+        logger.error("채널 코드가 필요합니다 (--channel 또는 설정 파일).")
+        return 2
+
+    output_lock = threading.Lock()
+
+    def emit(transition: TimerTransition) -> None:
+        if args.json:
+            with output_lock:
+                print(json.dumps(transition.to_dict(), ensure_ascii=False), flush=True)
+        else:
+            logger.info("%s", transition.describe())
+
+    client = HeadlessClient(settings, channel_code)
+    client.add_listener(emit)
+    done = threading.Event()
+    if args.commands:
+        threading.Thread(target=_read_commands, args=(client, emit, done), daemon=True).start()
+    logger.info("헤드리스 클라이언트 시작: %s (채널 %s)", settings.base_url, channel_code)
+    client.start()
+    try:
+        done.wait(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.stop()
+    logger.info("헤드리스 클라이언트 종료 (응답 %d건)", client.payload_count)
+    return 0
@@ -0,0 +1,830 @@
+"""화면 캡처에서 체력바를 찾고 남은 체력을 계산하는 모듈.
+
+``QImage`` 픽셀 버퍼를 복사 없이 NumPy 배열로 보고, 색 판정과 구간 탐색을
+배열 연산으로 처리한다.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PyQt5.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+
+COLOR_TABLE_FILE_NAME = "timer_overlay_healthbar_colors.npz"
+
+CLASS_NONE = 0
+CLASS_FILLED = 1
+CLASS_EMPTY = 2
+
+# 색상표 양자화: 채널당 상위 5비트 (32 x 32 x 32)
+_LUT_BITS = 5
+_LUT_LEVELS = 1 << _LUT_BITS
+_LUT_SHIFT = 8 - _LUT_BITS
+_LUT_MASK = _LUT_LEVELS - 1
+
+# 바 구간으로 인정하는 세로 방향 행의 바 픽셀 비율
+_ROW_FILL_RATIO = 0.55
+# 세로 범위를 넓힐 때 한 번에 판정하는 행 수
+_GROW_CHUNK = 16
+# 저해상도 후보 탐색의 가로 간격 (전체 해상도 대비)
+_COARSE_STEP_X = 8
+# 이보다 신뢰도가 낮은 후보는 체력바로 보지 않는다.
+MIN_CONFIDENCE = 0.2
+# 한 가지 색만 보이는 후보(가득 차거나 빈 바, 같은 색 UI 블록)는 모양과 경계가 깨끗해야 한다.
+MIN_SOLID_CONFIDENCE = 0.55
+# 여러 바 탐색에서 가장 좋은 후보 대비 이 비율보다 낮은 후보는 버린다.
+_RELATIVE_CONFIDENCE = 0.5
+# 화면 너비의 이 비율 이상을 가로지르는 구간은 체력바보다 UI 띠일 가능성이 높다.
+_FULL_SPAN_RATIO = 0.9
+_FULL_SPAN_PENALTY = 0.3
+# 채워진 열과 빈 열이 각각 이 비율 이상이어야 두 색이 함께 보이는 것으로 본다 (잡음 열 무시).
+_MIXED_MIN_RATIO = 0.02
+_SOLID_PENALTY = 0.6
+
+
+def image_view(image: QImage) -> np.ndarray:
+    """RGBA8888 ``QImage`` 의 픽셀 버퍼를 ``(높이, 너비, 4)`` 배열로 본다.
+
+    데이터를 복사하지 않으므로 배열을 쓰는 동안 ``image`` 를 살려 두어야 한다.
+    """
+
+    if image.format() != QImage.Format_RGBA8888:
+        raise ValueError("RGBA8888 형식의 QImage 만 지원합니다.")
+    width = image.width()
+    height = image.height()
+    if width == 0 or height == 0:
+        return np.zeros((height, width, 4), dtype=np.uint8)
+    stride = image.bytesPerLine()
+    # bits() 는 공유 중인 이미지를 분리(복사)하므로 읽기 전용 constBits() 를 쓴다.
+    pointer = image.constBits()
+    pointer.setsize(stride * height)
+    buffer = np.frombuffer(pointer, dtype=np.uint8).reshape(height, stride)
+    return buffer[:, : width * 4].reshape(height, width, 4)
+
+
+def _channels(pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rgb = pixels[..., :3].astype(np.int16)
+    return rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+
+def _filled(r: np.ndarray, g: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (g >= 150) & (g >= r + 20) & (g >= b + 20)
+
+
+def _empty(r: np.ndarray, g: np.ndarray, b: np.ndarray) -> np.ndarray:
+    spread = np.maximum(np.maximum(r, g), b) - np.minimum(np.minimum(r, g), b)
+    # 평균 밝기 < 140 은 합 < 420 과 같다.
+    return (r + g + b < 420) & (spread < 35)
+
+
+def filled_mask(pixels: np.ndarray, colors: Optional["ColorTable"] = None) -> np.ndarray:
+    """남은 체력(초록색) 픽셀 마스크."""
+
+    if colors is not None:
+        return colors.classify(pixels) == CLASS_FILLED
+    return _filled(*_channels(pixels))
+
+
+def empty_mask(pixels: np.ndarray, colors: Optional["ColorTable"] = None) -> np.ndarray:
+    """잃은 체력(어두운 회색) 픽셀 마스크."""
+
+    if colors is not None:
+        return colors.classify(pixels) == CLASS_EMPTY
+    return _empty(*_channels(pixels))
+
+
+def bar_mask(pixels: np.ndarray, colors: Optional["ColorTable"] = None) -> np.ndarray:
+    """체력바를 이루는 (채워진 또는 빈) 픽셀 마스크."""
+
+    if colors is not None:
+        return colors.classify(pixels) != CLASS_NONE
+    channels = _channels(pixels)
+    return _filled(*channels) | _empty(*channels)
+
+
+def _classes(pixels: np.ndarray, colors: Optional["ColorTable"]) -> Tuple[np.ndarray, np.ndarray]:
+    """(채워진 마스크, 빈 마스크). 두 마스크는 겹치지 않는다."""
+
+    if colors is not None:
+        classes = colors.classify(pixels)
+        return classes == CLASS_FILLED, classes == CLASS_EMPTY
+    channels = _channels(pixels)
+    filled = _filled(*channels)
+    return filled, _empty(*channels) & ~filled
+
+
+class ColorTable:
+    """양자화된 RGB -> 체력바 색 분류 조회표.
+
+    화면마다 다른 체력바 색을 위해 사용자가 고른 영역에서 보정할 수 있다.
+    보정하지 않았으면 :func:`locate_bar` 등은 기본 임계값 판정을 그대로 쓴다.
+    """
+
+    def __init__(self, table: np.ndarray) -> None:
+        if table.shape != (_LUT_LEVELS,) * 3:
+            raise ValueError("색상표 크기가 올바르지 않습니다.")
+        self._flat = np.ascontiguousarray(table, dtype=np.uint8).ravel()
+
+    @property
+    def table(self) -> np.ndarray:
+        return self._flat.reshape((_LUT_LEVELS,) * 3)
+
+    @staticmethod
+    def _bin_centers() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        levels = np.arange(_LUT_LEVELS, dtype=np.int16) * (1 << _LUT_SHIFT) + (1 << _LUT_SHIFT) // 2
+        return np.meshgrid(levels, levels, levels, indexing="ij")
+
+    @classmethod
+    def from_thresholds(cls) -> "ColorTable":
+        """기본 임계값 판정을 각 양자화 칸의 중심색에 적용해 만든다."""
+
+        r, g, b = cls._bin_centers()
+        table = np.full(r.shape, CLASS_NONE, dtype=np.uint8)
+        table[_empty(r, g, b)] = CLASS_EMPTY
+        table[_filled(r, g, b)] = CLASS_FILLED
+        return cls(table)
+
+    @classmethod
+    def calibrate(cls, pixels: np.ndarray, max_samples: int = 20000) -> "ColorTable":
+        """체력바 일부가 깎인 상태의 영역에서 채워진/빈 색을 학습한다.
+
+        영역의 색을 두 무리로 나누고(k-평균), 채도가 높은 쪽을 채워진 색으로 본다.
+        각 무리 중심에서 가까운 양자화 칸만 해당 분류로 표시한다.
+        """
+
+        samples = pixels[..., :3].reshape(-1, 3).astype(np.float32)
+        if samples.shape[0] < 16:
+            raise ValueError("보정 영역이 너무 작습니다.")
+        if samples.shape[0] > max_samples:
+            step = samples.shape[0] // max_samples + 1
+            samples = samples[::step]
+
+        chroma = samples.max(axis=1) - samples.min(axis=1)
+        order = np.argsort(chroma, kind="stable")
+        centers = np.stack([samples[order[len(order) // 10]], samples[order[-1 - len(order) // 10]]])
+        labels = np.zeros(samples.shape[0], dtype=np.intp)
+        for _ in range(12):
+            distances = ((samples[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+            labels = distances.argmin(axis=1)
+            updated = centers.copy()
+            for cluster in range(2):
+                members = samples[labels == cluster]
+                if members.size:
+                    updated[cluster] = members.mean(axis=0)
+            if np.allclose(updated, centers, atol=0.5):
+                centers = updated
+                break
+            centers = updated
+
+        if np.sqrt(((centers[0] - centers[1]) ** 2).sum()) < 30:
+            raise ValueError("채워진 색과 빈 색을 구분하지 못했습니다. 체력이 일부 깎인 상태에서 다시 선택해 주세요.")
+
+        center_chroma = centers.max(axis=1) - centers.min(axis=1)
+        filled_index = int(np.argmax(center_chroma))
+        if center_chroma[0] == center_chroma[1]:
+            filled_index = int(np.argmax(centers.sum(axis=1)))
+
+        radii = np.empty(2, dtype=np.float32)
+        for cluster in range(2):
+            members = samples[labels == cluster]
+            spread = np.sqrt(((members - centers[cluster]) ** 2).sum(axis=1).mean()) if members.size else 0.0
+            radii[cluster] = max(24.0, 2.5 * float(spread))
+
+        grid = np.stack(cls._bin_centers(), axis=-1).astype(np.float32)
+        distances = np.sqrt(((grid[..., None, :] - centers) ** 2).sum(axis=-1))
+        nearest = distances.argmin(axis=-1)
+        within = np.take_along_axis(distances, nearest[..., None], axis=-1)[..., 0] <= radii[nearest]
+        table = np.full(nearest.shape, CLASS_NONE, dtype=np.uint8)
+        table[within & (nearest == filled_index)] = CLASS_FILLED
+        table[within & (nearest != filled_index)] = CLASS_EMPTY
+        return cls(table)
+
+    def classify(self, pixels: np.ndarray) -> np.ndarray:
+        """픽셀마다 ``CLASS_*`` 값을 돌려준다 (조회 한 번)."""
+
+        if pixels.shape[-1] == 4 and pixels.strides[-1] == 1:
+            # RGBA 한 픽셀을 32비트 정수 하나로 보고 비트 연산으로 색인을 만든다.
+            packed = pixels.view("<u4")[..., 0]
+            index = (packed >> _LUT_SHIFT) & _LUT_MASK
+            index <<= 2 * _LUT_BITS
+            index |= ((packed >> (8 + _LUT_SHIFT)) & _LUT_MASK) << _LUT_BITS
+            index |= (packed >> (16 + _LUT_SHIFT)) & _LUT_MASK
+            return self._flat.take(index)
+        quantized = pixels[..., :3] >> _LUT_SHIFT
+        index = quantized[..., 0].astype(np.uint16) << (2 * _LUT_BITS)
+        index |= quantized[..., 1].astype(np.uint16) << _LUT_BITS
+        index |= quantized[..., 2]
+        return self._flat.take(index)
+
+    # 저장 ----------------------------------------------------------------
+    @staticmethod
+    def path_beside(config_path: Path) -> Path:
+        return config_path.parent / COLOR_TABLE_FILE_NAME
+
+    def save(self, path: Path) -> None:
+        temp_path = path.with_name(path.name + ".tmp")
+        with temp_path.open("wb") as handle:
+            np.savez_compressed(handle, table=self.table)
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ColorTable"]:
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                return cls(data["table"])
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning("체력바 색상표를 읽지 못했습니다 (%s): %s", path, exc)
+            return None
+
+
+def longest_run(mask: np.ndarray) -> Tuple[int, int, int]:
+    """2차원 마스크의 행별 True 연속 구간 중 가장 긴 것을 찾는다.
+
+    ``(길이, 행, 시작 열)`` 을 반환하며, 길이가 같으면 행 우선 순서로 먼저 나온 구간이다.
+    """
+
+    if mask.size == 0:
+        return 0, 0, 0
+    rows, cols = mask.shape
+    # 행마다 앞뒤로 False 를 붙여 행을 넘는 구간이 생기지 않게 한 뒤 한 번에 차분한다.
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size == 0:
+        return 0, 0, 0
+    lengths = ends - starts
+    best = int(np.argmax(lengths))
+    row, col = divmod(int(starts[best]), cols + 2)
+    return int(lengths[best]), row, col
+
+
+def _grow_vertical(
+    pixels: np.ndarray,
+    start_x: int,
+    end_x: int,
+    base_y: int,
+    colors: Optional[ColorTable],
+) -> Tuple[int, int]:
+    """``base_y`` 에서 바 픽셀 비율이 충분한 행까지 위아래로 넓힌 (top, bottom)."""
+
+    height = pixels.shape[0]
+    span = max(1, end_x - start_x)
+    band = pixels[:, start_x:end_x]
+
+    def bar_rows(begin: int, end: int) -> np.ndarray:
+        return bar_mask(band[begin:end], colors).sum(axis=1) / span > _ROW_FILL_RATIO
+
+    # 바는 보통 수십 행 이내이므로 기준 행에서부터 조금씩 넓혀 가며 판정한다.
+    top = base_y
+    while top > 0:
+        begin = max(0, top - _GROW_CHUNK)
+        misses = np.flatnonzero(~bar_rows(begin, top))
+        if misses.size:
+            top = begin + int(misses[-1]) + 1
+            break
+        top = begin
+
+    bottom = base_y
+    while bottom + 1 < height:
+        end = min(height, bottom + 1 + _GROW_CHUNK)
+        misses = np.flatnonzero(~bar_rows(bottom + 1, end))
+        if misses.size:
+            bottom = bottom + int(misses[0])
+            break
+        bottom = end - 1
+
+    return top, bottom
+
+
+def locate_bar(pixels: np.ndarray, colors: Optional[ColorTable] = None) -> Optional[Rect]:
+    """캡처 화면에서 가장 긴 가로 체력바 구간을 찾는다.
+
+    화면 위쪽 60% 를 일정 간격의 행과 2픽셀 간격의 열로 훑어 가장 긴 바 구간을
+    고른 뒤, 해당 열 범위에서 바 픽셀 비율이 충분한 행까지 위아래로 넓힌다.
+    """
+
+    height, width = pixels.shape[:2]
+    if width == 0 or height == 0:
+        return None
+
+    min_run = max(160, width // 12)
+    search_height = int(height * 0.6)
+    stride_y = max(1, height // 400)
+    first_row = max(0, height // 20)
+    if first_row >= search_height:
+        return None
+
+    sampled = bar_mask(pixels[first_row:search_height:stride_y, ::2], colors)
+    run, row, column = longest_run(sampled)
+    run_length = run * 2
+    if run_length < min_run:
+        return None
+
+    start_x = column * 2
+    base_y = first_row + row * stride_y
+    end_x = min(width - 1, start_x + run_length)
+
+    top, bottom = _grow_vertical(pixels, start_x, end_x, base_y, colors)
+    return start_x, top, end_x - start_x, bottom - top + 1
+
+
+def healthbar_percent(
+    pixels: np.ndarray, rect: Rect, colors: Optional[ColorTable] = None
+) -> Optional[float]:
+    """바 영역의 가운데 절반 높이를 열 단위로 다수결해 남은 체력(%)을 계산한다.
+
+    채워진 픽셀이 빈 픽셀보다 적지 않은 열을 채워진 열로 보고, 어느 쪽도 아닌
+    열(테두리, 글자 등)은 계산에서 뺀다.
+    """
+
+    x, y, width, height = rect
+    if width <= 0 or height <= 0:
+        return None
+
+    image_height, image_width = pixels.shape[:2]
+    start_x = max(0, x)
+    start_y = max(0, y)
+    end_x = min(image_width, x + width)
+    end_y = min(image_height, y + height)
+    if end_x <= start_x or end_y <= start_y:
+        return None
+
+    band_top = max(start_y, start_y + height // 4)
+    band_bottom = min(end_y, start_y + (height * 3) // 4)
+
+    filled, empty = _classes(pixels[band_top:band_bottom, start_x:end_x], colors)
+    filled_counts = filled.sum(axis=0)
+    empty_counts = empty.sum(axis=0)
+    counted = (filled_counts + empty_counts) > 0
+    total_columns = int(np.count_nonzero(counted))
+    if total_columns == 0:
+        return None
+    filled_columns = int(np.count_nonzero(counted & (filled_counts >= empty_counts)))
+    return (filled_columns / total_columns) * 100
+
+
+@dataclass(frozen=True)
+class BarCandidate:
+    """체력바 후보 영역과 신뢰도 (0~1)."""
+
+    rect: Rect
+    confidence: float
+
+
+def _score_candidate(pixels: np.ndarray, rect: Rect, colors: Optional[ColorTable]) -> float:
+    """후보가 체력바다운 정도 (0~1)."""
+
+    return _score_parts(pixels, rect, colors)[0]
+
+
+def _score_parts(pixels: np.ndarray, rect: Rect, colors: Optional[ColorTable]) -> Tuple[float, bool]:
+    """``(신뢰도, 두 색이 함께 보이는지)``.
+
+    영역 안의 바 픽셀 비율, 위아래 경계의 대비, 가로로 긴 모양, 채워진 열이
+    왼쪽에 몰려 있는지(체력바는 왼쪽부터 채워진다), 두 색이 함께 보이는지를 곱하고,
+    화면 가로 전체를 가로지르는 띠는 깎는다.
+    """
+
+    x, y, width, height = rect
+    image_height, image_width = pixels.shape[:2]
+    filled, empty = _classes(pixels[y : y + height, x : x + width], colors)
+    fill = float((filled | empty).mean())
+
+    outside_rows = []
+    if y > 0:
+        outside_rows.append(y - 1)
+    if y + height < image_height:
+        outside_rows.append(y + height)
+    if outside_rows:
+        outside = bar_mask(pixels[outside_rows, x : x + width], colors).mean()
+        edge = 1.0 - float(outside)
+    else:
+        edge = 1.0
+
+    shape = min(1.0, (width / max(1, height)) / 12)
+    span = _FULL_SPAN_PENALTY if width >= image_width * _FULL_SPAN_RATIO else 1.0
+
+    filled_columns = filled.sum(axis=0) >= np.maximum(empty.sum(axis=0), 1)
+    if filled_columns.size:
+        # 채워진 열이 접두사, 빈 열이 접미사가 되는 가장 좋은 분할점과의 일치율
+        prefix_filled = np.concatenate(([0], np.cumsum(filled_columns)))
+        suffix_empty = np.concatenate((np.cumsum((~filled_columns)[::-1])[::-1], [0]))
+        order = float((prefix_filled + suffix_empty).max()) / filled_columns.size
+        # 채워진 색과 빈 색이 모두 보이면 단색 UI 띠보다 체력바일 가능성이 높다.
+        minority = min(int(prefix_filled[-1]), filled_columns.size - int(prefix_filled[-1]))
+        mixed = minority >= max(2, filled_columns.size * _MIXED_MIN_RATIO)
+    else:
+        order = 0.0
+        mixed = False
+    return fill * edge * shape * span * order * (1.0 if mixed else _SOLID_PENALTY), mixed
+
+
+def locate_candidates(
+    pixels: np.ndarray,
+    colors: Optional[ColorTable] = None,
+    limit: int = 5,
+) -> List[BarCandidate]:
+    """저해상도에서 가로 바 구간 후보를 찾고 전체 해상도에서 다듬어 순위를 매긴다.
+
+    먼저 행/열을 듬성듬성 건너뛴 화면에서 충분히 긴 구간을 모두 모으고, 이웃한
+    구간을 하나의 후보로 묶는다. 상위 후보만 원래 해상도의 좁은 창에서 다시
+    찾아 정확한 영역과 신뢰도를 계산한다.
+    """
+
+    height, width = pixels.shape[:2]
+    if width == 0 or height == 0:
+        return []
+
+    min_run = max(160, width // 12)
+    search_height = int(height * 0.6)
+    row_step = max(1, height // 240)
+    first_row = max(0, height // 20)
+    if first_row >= search_height:
+        return []
+
+    coarse = bar_mask(pixels[first_row:search_height:row_step, ::_COARSE_STEP_X], colors)
+    rows, cols = coarse.shape
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = coarse
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    keep = lengths * _COARSE_STEP_X >= min_run * 0.8
+    starts = starts[keep]
+    lengths = lengths[keep]
+    if starts.size == 0:
+        return []
+    run_rows, run_cols = np.divmod(starts, cols + 2)
+
+    # 같은 바를 지나는 이웃 행의 구간을 하나로 묶는다 (긴 구간부터).
+    groups: List[List[int]] = []  # [row, col_start, col_end]
+    for index in np.argsort(-lengths, kind="stable"):
+        row = int(run_rows[index])
+        begin = int(run_cols[index])
+        end = begin + int(lengths[index])
+        for group in groups:
+            overlap = min(end, group[2]) - max(begin, group[1])
+            if abs(row - group[0]) <= 2 and overlap >= 0.5 * (end - begin):
+                break
+        else:
+            groups.append([row, begin, end])
+            if len(groups) >= limit * 2:
+                break
+
+    candidates: List[BarCandidate] = []
+    seen = set()
+    for row, begin, end in groups:
+        base = first_row + row * row_step
+        window_top = max(0, base - row_step)
+        window_bottom = min(height, base + row_step + 1)
+        left = max(0, (begin - 1) * _COARSE_STEP_X)
+        right = min(width, (end + 1) * _COARSE_STEP_X)
+        run, run_row, run_col = longest_run(
+            bar_mask(pixels[window_top:window_bottom, left:right], colors)
+        )
+        if run < min_run:
+            continue
+        start_x = left + run_col
+        base_y = window_top + run_row
+        end_x = min(width - 1, start_x + run)
+        top, bottom = _grow_vertical(pixels, start_x, end_x, base_y, colors)
+        rect = (start_x, top, end_x - start_x, bottom - top + 1)
+        if rect in seen:
+            continue
+        seen.add(rect)
+        candidates.append(BarCandidate(rect, _score_candidate(pixels, rect, colors)))
+
+    candidates.sort(key=lambda item: item.confidence, reverse=True)
+    return candidates[:limit]
+
+
+@dataclass(frozen=True)
+class TrackResult:
+    """추적 한 번의 결과. ``rect`` 는 화면 좌표계다."""
+
+    rect: Rect
+    percent: Optional[float]
+    confidence: float
+    moved: bool = False
+    lost: bool = False
+
+
+class BarTracker:
+    """찾은 체력바 주변만 캡처해 따라가는 추적기.
+
+    매번 바 영역보다 ``margin`` 만큼 넓게 캡처하고, 그 안에서 바를 다시 맞춰
+    위치가 조금 바뀌어도 따라간다. 연속으로 바를 찾지 못하면 ``lost`` 를 알려
+    호출하는 쪽이 전체 화면에서 다시 찾도록 한다.
+    """
+
+    def __init__(
+        self,
+        rect: Rect,
+        screen_size: Tuple[int, int],
+        *,
+        margin: int = 24,
+        max_misses: int = 3,
+        colors: Optional[ColorTable] = None,
+    ) -> None:
+        self._rect = rect
+        self._screen_width, self._screen_height = screen_size
+        self._margin = margin
+        self._max_misses = max_misses
+        self._misses = 0
+        self.colors = colors
+
+    @property
+    def rect(self) -> Rect:
+        return self._rect
+
+    def capture_rect(self) -> Rect:
+        """다음에 캡처할 화면 영역 (바 영역 + 여백, 화면 안으로 자름)."""
+
+        x, y, width, height = self._rect
+        left = max(0, x - self._margin)
+        top = max(0, y - self._margin)
+        right = min(self._screen_width, x + width + self._margin)
+        bottom = min(self._screen_height, y + height + self._margin)
+        return left, top, max(0, right - left), max(0, bottom - top)
+
+    def update(self, pixels: np.ndarray, origin: Tuple[int, int]) -> TrackResult:
+        """``capture_rect()`` 로 캡처한 픽셀로 바 위치와 체력을 갱신한다."""
+
+        origin_x, origin_y = origin
+        x, y, width, height = self._rect
+        local = (x - origin_x, y - origin_y, width, height)
+        aligned = self._realign(pixels, local)
+        if aligned is None:
+            self._misses += 1
+            return TrackResult(
+                self._rect, None, 0.0, lost=self._misses >= self._max_misses
+            )
+        self._misses = 0
+        local_rect, confidence = aligned
+        new_rect = (local_rect[0] + origin_x, local_rect[1] + origin_y, local_rect[2], local_rect[3])
+        moved = new_rect != self._rect
+        self._rect = new_rect
+        percent = healthbar_percent(pixels, local_rect, self.colors)
+        return TrackResult(new_rect, percent, confidence, moved=moved)
+
+    def _realign(self, pixels: np.ndarray, local: Rect) -> Optional[Tuple[Rect, float]]:
+        x, y, width, height = local
+        window_height, window_width = pixels.shape[:2]
+        if window_width == 0 or window_height == 0:
+            return None
+
+        # 기존 바의 세로 범위(+여유) 안에서 가장 긴 가로 구간을 다시 찾는다.
+        top = max(0, y - self._margin // 2)
+        bottom = min(window_height, y + height + self._margin // 2)
+        run, run_row, run_col = longest_run(bar_mask(pixels[top:bottom], self.colors))
+        if run < width * 0.9 or run > width * 1.1 + 2:
+            return None
+        start_x = run_col
+        end_x = min(window_width - 1, start_x + run)
+        bar_top, bar_bottom = _grow_vertical(pixels, start_x, end_x, top + run_row, self.colors)
+        candidate = (start_x, bar_top, end_x - start_x, bar_bottom - bar_top + 1)
+
+        # 한두 픽셀 흔들림은 배경 잡음일 수 있으므로 무시한다.
+        if all(abs(a - b) <= 2 for a, b in zip(candidate, local)):
+            candidate = local
+        if abs(candidate[3] - height) > max(2, height // 2):
+            return None
+
+        cx, cy, cw, ch = candidate
+        filled, empty = _classes(pixels[cy : cy + ch, cx : cx + cw], self.colors)
+        confidence = float((filled | empty).mean()) if cw and ch else 0.0
+        if confidence < _ROW_FILL_RATIO:
+            return None
+        return candidate, confidence
+
+
+def _row_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """마스크의 모든 가로 True 구간 (행, 시작 열, 끝 열[미포함]). 행, 열 순으로 정렬."""
+
+    rows, cols = mask.shape
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    run_rows, run_starts = np.divmod(starts, cols + 2)
+    return run_rows, run_starts, run_starts + (ends - starts)
+
+
+def label_components(mask: np.ndarray, min_run: int = 1) -> Tuple[np.ndarray, int]:
+    """가로 구간 단위 연결 요소 라벨링 (4-연결).
+
+    ``min_run`` 보다 짧은 가로 구간은 잡음으로 보고 버린다. 구간 추출은 배열
+    연산으로, 인접 행 구간의 병합은 구간 수만큼의 union-find 로 처리한다.
+    라벨 배열(0 은 배경)과 요소 개수를 반환한다.
+    """
+
+    labels = np.zeros(mask.shape, dtype=np.int32)
+    if mask.size == 0:
+        return labels, 0
+    run_rows, run_starts, run_ends = _row_runs(mask)
+    keep = (run_ends - run_starts) >= min_run
+    run_rows, run_starts, run_ends = run_rows[keep], run_starts[keep], run_ends[keep]
+    count = run_rows.size
+    if count == 0:
+        return labels, 0
+
+    parent = np.arange(count)
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = int(parent[index])
+        return index
+
+    # 행별 구간 범위. 다음 행 구간 중 열이 겹치는 것과 합친다.
+    row_bounds = np.searchsorted(run_rows, np.arange(mask.shape[0] + 1))
+    for row in range(mask.shape[0] - 1):
+        begin, end = row_bounds[row], row_bounds[row + 1]
+        next_end = row_bounds[row + 2]
+        if begin == end or end == next_end:
+            continue
+        next_starts = run_starts[end:next_end]
+        next_ends = run_ends[end:next_end]
+        for index in range(begin, end):
+            first = int(np.searchsorted(next_ends, run_starts[index], side="right"))
+            last = int(np.searchsorted(next_starts, run_ends[index], side="left"))
+            for other in range(end + first, end + last):
+                root_a, root_b = find(index), find(other)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    roots = np.array([find(index) for index in range(count)])
+    _, component = np.unique(roots, return_inverse=True)
+    for index in range(count):
+        labels[run_rows[index], run_starts[index] : run_ends[index]] = component[index] + 1
+    return labels, int(component.max()) + 1
+
+
+def component_boxes(labels: np.ndarray, count: int) -> List[Tuple[int, int, int, int]]:
+    """라벨별 경계 상자 ``(top, bottom, left, right)`` (끝 미포함)."""
+
+    if count == 0:
+        return []
+    rows, cols = np.nonzero(labels)
+    values = labels[rows, cols] - 1
+    top = np.full(count, labels.shape[0], dtype=np.int64)
+    left = np.full(count, labels.shape[1], dtype=np.int64)
+    bottom = np.zeros(count, dtype=np.int64)
+    right = np.zeros(count, dtype=np.int64)
+    np.minimum.at(top, values, rows)
+    np.minimum.at(left, values, cols)
+    np.maximum.at(bottom, values, rows + 1)
+    np.maximum.at(right, values, cols + 1)
+    return [
+        (int(top[index]), int(bottom[index]), int(left[index]), int(right[index]))
+        for index in range(count)
+    ]
+
+
+def locate_bars(
+    pixels: np.ndarray,
+    colors: Optional[ColorTable] = None,
+    limit: int = 8,
+) -> List[BarCandidate]:
+    """화면의 여러 체력바(보스 + 쫄, 파티원 등)를 한 번에 찾는다.
+
+    저해상도 바 마스크를 연결 요소로 나누고, 가로로 긴 요소마다 전체 해상도에서
+    영역을 다듬어 :func:`locate_candidates` 와 같은 점수로 순위를 매긴다. 신뢰도가
+    ``MIN_CONFIDENCE`` 이상이고 가장 좋은 후보의 절반 이상인 것만 남기며, 한 가지
+    색만 보이는 후보는 ``MIN_SOLID_CONFIDENCE`` 를 넘어야 한다. 위에서 아래 순서로
+    반환한다.
+    """
+
+    height, width = pixels.shape[:2]
+    if width == 0 or height == 0:
+        return []
+
+    min_width = max(60, width // 32)
+    row_step = max(1, height // 240)
+    coarse = bar_mask(pixels[::row_step, ::_COARSE_STEP_X], colors)
+    min_run = max(1, int(min_width * 0.8) // _COARSE_STEP_X)
+    labels, count = label_components(coarse, min_run=min_run)
+
+    found: List[BarCandidate] = []
+    for top, bottom, left, right in component_boxes(labels, count):
+        if (right - left) * _COARSE_STEP_X < min_width * 0.8:
+            continue
+        window_top = max(0, (top - 1) * row_step)
+        window_bottom = min(height, (bottom + 1) * row_step)
+        window_left = max(0, (left - 1) * _COARSE_STEP_X)
+        window_right = min(width, (right + 1) * _COARSE_STEP_X)
+        run, run_row, run_col = longest_run(
+            bar_mask(pixels[window_top:window_bottom, window_left:window_right], colors)
+        )
+        if run < min_width:
+            continue
+        start_x = window_left + run_col
+        end_x = min(width - 1, start_x + run)
+        bar_top, bar_bottom = _grow_vertical(pixels, start_x, end_x, window_top + run_row, colors)
+        rect = (start_x, bar_top, end_x - start_x, bar_bottom - bar_top + 1)
+        if any(_overlaps(rect, other.rect) for other in found):
+            continue
+        confidence, mixed = _score_parts(pixels, rect, colors)
+        if confidence >= (MIN_CONFIDENCE if mixed else MIN_SOLID_CONFIDENCE):
+            found.append(BarCandidate(rect, confidence))
+
+    found.sort(key=lambda item: item.confidence, reverse=True)
+    if found:
+        floor = found[0].confidence * _RELATIVE_CONFIDENCE
+        found = [candidate for candidate in found if candidate.confidence >= floor]
+    found = found[:limit]
+    found.sort(key=lambda item: (item.rect[1], item.rect[0]))
+    return found
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class MultiBarTracker:
+    """여러 체력바를 한 번의 캡처로 함께 추적한다.
+
+    모든 바의 캡처 영역을 감싸는 사각형 하나만 캡처하고, 바마다 그 안의 부분
+    배열(복사 없음)을 각자의 :class:`BarTracker` 에 넘긴다.
+    """
+
+    def __init__(
+        self,
+        rects: List[Rect],
+        screen_size: Tuple[int, int],
+        *,
+        margin: int = 24,
+        max_misses: int = 3,
+        colors: Optional[ColorTable] = None,
+    ) -> None:
+        self.screen_size = screen_size
+        self.colors = colors
+        self._margin = margin
+        self._max_misses = max_misses
+        self.trackers = [
+            BarTracker(rect, screen_size, margin=margin, max_misses=max_misses, colors=colors)
+            for rect in rects
+        ]
+
+    def __len__(self) -> int:
+        return len(self.trackers)
+
+    @property
+    def rects(self) -> List[Rect]:
+        return [tracker.rect for tracker in self.trackers]
+
+    def screen_rect(self) -> Rect:
+        """바를 놓쳤을 때 다시 찾을 전체 화면 영역."""
+
+        return 0, 0, self.screen_size[0], self.screen_size[1]
+
+    def retarget(self, rects: List[Rect]) -> "MultiBarTracker":
+        """같은 화면/설정으로 새 위치의 바들을 추적하는 추적기."""
+
+        return MultiBarTracker(
+            rects, self.screen_size, margin=self._margin, max_misses=self._max_misses, colors=self.colors
+        )
+
+    def capture_rect(self) -> Rect:
+        rects = [tracker.capture_rect() for tracker in self.trackers]
+        if not rects:
+            return 0, 0, 0, 0
+        left = min(rect[0] for rect in rects)
+        top = min(rect[1] for rect in rects)
+        right = max(rect[0] + rect[2] for rect in rects)
+        bottom = max(rect[1] + rect[3] for rect in rects)
+        return left, top, right - left, bottom - top
+
+    def update(self, pixels: np.ndarray, origin: Tuple[int, int]) -> List[TrackResult]:
+        origin_x, origin_y = origin
+        height, width = pixels.shape[:2]
+        results: List[TrackResult] = []
+        for tracker in self.trackers:
+            x, y, w, h = tracker.capture_rect()
+            # 캡처 이후 다른 바의 갱신으로 영역이 조금 달라졌을 수 있어 캡처 범위로 자른다.
+            left = min(max(0, x - origin_x), width)
+            top = min(max(0, y - origin_y), height)
+            right = min(width, max(left, x - origin_x + w))
+            bottom = min(height, max(top, y - origin_y + h))
+            results.append(
+                tracker.update(pixels[top:bottom, left:right], (origin_x + left, origin_y + top))
+            )
+        return results
+
+
+if __name__ == "__main__":
+    from timer_overlay.healthbar_cli import main
+
+    raise SystemExit(main())
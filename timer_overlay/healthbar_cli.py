@@ -0,0 +1,413 @@
+"""체력바 분석기 명령줄 도구 (화면 없이 실행).
+
+사용 예::
+
+    python -m timer_overlay.healthbar analyze frames/            # PNG 분석
+    python -m timer_overlay.healthbar synth --out frames/ -n 20  # 합성 프레임 생성
+    python -m timer_overlay.healthbar bench --json report.json   # 합성 벤치마크
+
+``analyze`` 는 ``<이름>.png`` 옆에 ``<이름>.json`` (``synth`` 가 만드는 형식)이
+있으면 정답과 비교한 정확도도 함께 보고한다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from timer_overlay import healthbar
+
+# 체력바 색 구성: (채워진 색, 빈 색)
+SKINS: Dict[str, Tuple[Tuple[int, int, int], Tuple[int, int, int]]] = {
+    "default": ((40, 200, 60), (62, 62, 66)),
+    "red": ((205, 45, 40), (70, 24, 22)),
+    "blue": ((50, 125, 235), (28, 32, 58)),
+    "gold": ((230, 180, 40), (80, 64, 30)),
+}
+
+DEFAULT_RESOLUTIONS = ("1280x720", "1920x1080", "2560x1440")
+MODES = ("bars", "candidates", "legacy")
+
+
+@dataclass
+class TruthBar:
+    rect: healthbar.Rect
+    percent: float
+
+    def to_dict(self) -> Dict:
+        return {"rect": list(self.rect), "percent": round(self.percent, 3)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TruthBar":
+        x, y, width, height = (int(value) for value in data["rect"])
+        return cls((x, y, width, height), float(data["percent"]))
+
+
+@dataclass
+class FrameResult:
+    name: str
+    width: int
+    height: int
+    found: List[healthbar.BarCandidate]
+    percents: List[Optional[float]]
+    locate_ms: float
+    percent_ms: float
+    truth: List[TruthBar] = field(default_factory=list)
+
+    def matches(self) -> List[Tuple[TruthBar, Optional[int]]]:
+        """정답 바마다 IoU 0.5 이상으로 겹치는 검출 결과의 위치."""
+
+        pairs = []
+        for bar in self.truth:
+            best_index, best_iou = None, 0.5
+            for index, candidate in enumerate(self.found):
+                iou = _iou(bar.rect, candidate.rect)
+                if iou >= best_iou:
+                    best_index, best_iou = index, iou
+            pairs.append((bar, best_index))
+        return pairs
+
+    def to_dict(self) -> Dict:
+        data = {
+            "name": self.name,
+            "size": [self.width, self.height],
+            "bars": [
+                {"rect": list(candidate.rect), "confidence": round(candidate.confidence, 4), "percent": percent}
+                for candidate, percent in zip(self.found, self.percents)
+            ],
+            "locate_ms": round(self.locate_ms, 3),
+            "percent_ms": round(self.percent_ms, 3),
+        }
+        if self.truth:
+            data["truth"] = [bar.to_dict() for bar in self.truth]
+        return data
+
+
+def _iou(a: healthbar.Rect, b: healthbar.Rect) -> float:
+    left = max(a[0], b[0])
+    top = max(a[1], b[1])
+    right = min(a[0] + a[2], b[0] + b[2])
+    bottom = min(a[1] + a[3], b[1] + b[3])
+    if right <= left or bottom <= top:
+        return 0.0
+    inter = (right - left) * (bottom - top)
+    return inter / float(a[2] * a[3] + b[2] * b[3] - inter)
+
+
+# 합성 프레임 -------------------------------------------------------------
+def synthesize_frame(
+    width: int,
+    height: int,
+    skin: str = "default",
+    *,
+    party: int = 0,
+    percent: Optional[float] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, List[TruthBar]]:
+    """게임 화면 비슷한 배경에 체력바를 그린 RGBA 프레임과 정답을 만든다.
+
+    배경은 밝은 잡음 위의 색 블록과, 체력바로 오인하기 쉬운 긴 어두운 UI 띠를
+    포함한다. 첫 번째 정답이 주 체력바(``percent`` 를 주면 그 비율, 0~1)이고,
+    ``party`` 만큼 작은 바를 더 그린다.
+    """
+
+    rng = rng if rng is not None else np.random.default_rng()
+    filled_color, empty_color = SKINS[skin]
+    frame = rng.integers(110, 256, (height, width, 4), dtype=np.uint8)
+    frame[..., 3] = 255
+    for _ in range(12):
+        bw, bh = int(rng.integers(width // 20, width // 5)), int(rng.integers(height // 20, height // 5))
+        bx, by = int(rng.integers(0, width - bw)), int(rng.integers(0, height - bh))
+        frame[by : by + bh, bx : bx + bw, :3] = rng.integers(120, 256, 3, dtype=np.uint8)
+    strip_y = int(rng.integers(height // 20, height // 10))
+    frame[strip_y : strip_y + max(4, height // 36), :, :3] = (40, 40, 46)
+
+    def draw_bar(x: int, y: int, bar_width: int, bar_height: int, ratio: Optional[float] = None) -> TruthBar:
+        ratio = float(rng.uniform(0.0, 1.0)) if ratio is None else ratio
+        filled = int(bar_width * ratio)
+        frame[y - 2 : y + bar_height + 2, x - 2 : x + bar_width + 2, :3] = (235, 225, 200)
+        frame[y : y + bar_height, x : x + bar_width, :3] = empty_color
+        frame[y : y + bar_height, x : x + filled, :3] = filled_color
+        noise = rng.integers(-8, 9, (bar_height, bar_width, 3))
+        region = frame[y : y + bar_height, x : x + bar_width, :3].astype(np.int16) + noise
+        frame[y : y + bar_height, x : x + bar_width, :3] = np.clip(region, 0, 255)
+        return TruthBar((x, y, bar_width, bar_height), filled / bar_width * 100)
+
+    bar_width = int(rng.integers(width // 4, width // 2))
+    bar_height = int(rng.integers(max(6, height // 120), max(8, height // 60)))
+    x = int(rng.integers(width // 10, width - bar_width - width // 10))
+    y = int(rng.integers(height // 5, int(height * 0.5)))
+    truth = [draw_bar(x, y, bar_width, bar_height, percent)]
+
+    party_width = max(80, width // 12)
+    party_height = max(6, height // 140)
+    for index in range(party):
+        truth.append(draw_bar(width // 40 + 2, int(height * 0.65) + index * (party_height + 18), party_width, party_height))
+    return frame, truth
+
+
+# 분석 ------------------------------------------------------------------
+def analyze_pixels(
+    name: str,
+    pixels: np.ndarray,
+    *,
+    mode: str = "bars",
+    colors: Optional[healthbar.ColorTable] = None,
+    truth: Sequence[TruthBar] = (),
+) -> FrameResult:
+    height, width = pixels.shape[:2]
+    started = time.perf_counter()
+    if mode == "bars":
+        found = healthbar.locate_bars(pixels, colors)
+    elif mode == "candidates":
+        found = [
+            candidate
+            for candidate in healthbar.locate_candidates(pixels, colors)
+            if candidate.confidence >= healthbar.MIN_CONFIDENCE
+        ][:1]
+    else:
+        rect = healthbar.locate_bar(pixels, colors)
+        found = [] if rect is None else [healthbar.BarCandidate(rect, 1.0)]
+    located = time.perf_counter()
+    percents = [healthbar.healthbar_percent(pixels, candidate.rect, colors) for candidate in found]
+    finished = time.perf_counter()
+    return FrameResult(
+        name,
+        width,
+        height,
+        found,
+        percents,
+        (located - started) * 1000,
+        (finished - located) * 1000,
+        list(truth),
+    )
+
+
+def _load_png(path: Path):
+    from PyQt5.QtGui import QImage
+
+    image = QImage(str(path))
+    if image.isNull():
+        raise ValueError(f"이미지를 읽을 수 없습니다: {path}")
+    image = image.convertToFormat(QImage.Format_RGBA8888)
+    return image, healthbar.image_view(image)
+
+
+def _load_truth(path: Path) -> List[TruthBar]:
+    sidecar = path.with_suffix(".json")
+    if not sidecar.exists():
+        return []
+    with sidecar.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    return [TruthBar.from_dict(item) for item in data.get("bars", [])]
+
+
+def _iter_images(paths: Iterable[str]) -> Iterable[Path]:
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            yield from sorted(path.glob("*.png"))
+        else:
+            yield path
+
+
+# 보고 ------------------------------------------------------------------
+def _percentiles(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        "mean": round(float(array.mean()), 3),
+        "p50": round(float(np.percentile(array, 50)), 3),
+        "p95": round(float(np.percentile(array, 95)), 3),
+        "max": round(float(array.max()), 3),
+    }
+
+
+def summarize(results: Sequence[FrameResult]) -> Dict:
+    summary: Dict = {
+        "frames": len(results),
+        "locate_ms": _percentiles([result.locate_ms for result in results]),
+        "percent_ms": _percentiles([result.percent_ms for result in results]),
+    }
+    truths = [pair for result in results for pair in result.matches()]
+    if truths:
+        detected = [(bar, result, index) for result in results for bar, index in result.matches() if index is not None]
+        errors = [
+            abs(result.percents[index] - bar.percent)
+            for bar, result, index in detected
+            if result.percents[index] is not None
+        ]
+        summary["truth_bars"] = len(truths)
+        summary["detected"] = len(detected)
+        summary["detection_rate"] = round(len(detected) / len(truths), 4)
+        summary["false_positives"] = sum(
+            len(result.found) - sum(1 for _, index in result.matches() if index is not None)
+            for result in results
+        )
+        summary["percent_abs_error"] = _percentiles(errors)
+    return summary
+
+
+def _print_frame(result: FrameResult) -> None:
+    bars = ", ".join(
+        f"{candidate.rect} {'-' if percent is None else f'{percent:.1f}%'} ({candidate.confidence:.2f})"
+        for candidate, percent in zip(result.found, result.percents)
+    ) or "없음"
+    print(f"{result.name}: {bars} | 탐색 {result.locate_ms:.1f}ms, 계산 {result.percent_ms:.2f}ms")
+
+
+def _print_summary(label: str, summary: Dict) -> None:
+    line = f"[{label}] {summary['frames']}프레임, 탐색 {summary['locate_ms'].get('mean', 0):.1f}ms"
+    line += f" (p95 {summary['locate_ms'].get('p95', 0):.1f}ms)"
+    if "detection_rate" in summary:
+        error = summary["percent_abs_error"]
+        line += f", 검출 {summary['detection_rate'] * 100:.1f}%, 오검출 {summary['false_positives']}"
+        if error:
+            line += f", 체력 오차 평균 {error['mean']:.2f}%p / 최대 {error['max']:.2f}%p"
+    print(line)
+
+
+def _write_json(path: Optional[str], payload: Dict) -> None:
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+
+
+def _parse_resolutions(raw: str) -> List[Tuple[int, int]]:
+    resolutions = []
+    for item in raw.split(","):
+        width, _, height = item.strip().lower().partition("x")
+        resolutions.append((int(width), int(height)))
+    return resolutions
+
+
+def _load_colors(path: Optional[str]) -> Optional[healthbar.ColorTable]:
+    if not path:
+        return None
+    colors = healthbar.ColorTable.load(Path(path))
+    if colors is None:
+        raise SystemExit(f"색상표를 읽을 수 없습니다: {path}")
+    return colors
+
+
+# 명령 ------------------------------------------------------------------
+def _cmd_analyze(args: argparse.Namespace) -> int:
+    colors = _load_colors(args.colors)
+    results = []
+    for path in _iter_images(args.paths):
+        _image, pixels = _load_png(path)
+        result = analyze_pixels(path.name, pixels, mode=args.mode, colors=colors, truth=_load_truth(path))
+        results.append(result)
+        if not args.quiet:
+            _print_frame(result)
+    summary = summarize(results)
+    _print_summary("analyze", summary)
+    _write_json(args.json, {"summary": summary, "frames": [result.to_dict() for result in results]})
+    return 0 if results else 1
+
+
+def _cmd_synth(args: argparse.Namespace) -> int:
+    from PyQt5.QtGui import QImage
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+    index = 0
+    for width, height in _parse_resolutions(args.resolutions):
+        for skin in args.skins.split(","):
+            for _ in range(args.count):
+                frame, truth = synthesize_frame(width, height, skin, party=args.party, rng=rng)
+                name = f"{width}x{height}_{skin}_{index:04d}"
+                image = QImage(frame.data, width, height, width * 4, QImage.Format_RGBA8888)
+                if not image.save(str(out / f"{name}.png")):
+                    raise SystemExit(f"이미지를 저장하지 못했습니다: {name}.png")
+                with (out / f"{name}.json").open("w", encoding="utf-8") as handle:
+                    json.dump({"skin": skin, "bars": [bar.to_dict() for bar in truth]}, handle)
+                index += 1
+    print(f"{index}개 프레임을 {out} 에 만들었습니다.")
+    return 0
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    groups = []
+    all_results: List[FrameResult] = []
+    for width, height in _parse_resolutions(args.resolutions):
+        for skin in args.skins.split(","):
+            results = []
+            colors = None
+            if skin != "default":
+                # 사용자 보정과 같이 체력이 절반쯤 깎인 바 영역에서 색상표를 만든다.
+                frame, truth = synthesize_frame(width, height, skin, percent=0.5, rng=rng)
+                x, y, bar_width, bar_height = truth[0].rect
+                colors = healthbar.ColorTable.calibrate(frame[y : y + bar_height, x : x + bar_width])
+            for index in range(args.frames):
+                frame, truth = synthesize_frame(width, height, skin, party=args.party, rng=rng)
+                results.append(
+                    analyze_pixels(f"{width}x{height}/{skin}/{index}", frame, mode=args.mode, colors=colors, truth=truth)
+                )
+            summary = summarize(results)
+            label = f"{width}x{height} {skin}"
+            _print_summary(label, summary)
+            groups.append({"resolution": [width, height], "skin": skin, **summary})
+            all_results.extend(results)
+    total = summarize(all_results)
+    _print_summary("전체", total)
+    _write_json(
+        args.json,
+        {"mode": args.mode, "seed": args.seed, "numpy": np.__version__, "groups": groups, "total": total},
+    )
+    if args.min_detection is not None and total.get("detection_rate", 0.0) < args.min_detection:
+        print(f"검출률이 기준({args.min_detection:.2f})보다 낮습니다.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m timer_overlay.healthbar", description="체력바 분석기")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser("analyze", help="PNG 파일/디렉터리의 프레임을 분석")
+    analyze.add_argument("paths", nargs="+")
+    analyze.add_argument("--mode", choices=MODES, default="bars")
+    analyze.add_argument("--colors", help="보정된 색상표(.npz)")
+    analyze.add_argument("--json", help="결과를 저장할 JSON 경로")
+    analyze.add_argument("--quiet", action="store_true", help="프레임별 결과를 출력하지 않음")
+    analyze.set_defaults(handler=_cmd_analyze)
+
+    synth = commands.add_parser("synth", help="정답이 붙은 합성 프레임 PNG 생성")
+    synth.add_argument("--out", required=True)
+    synth.add_argument("-n", "--count", type=int, default=5, help="해상도/스킨 조합별 프레임 수")
+    synth.add_argument("--resolutions", default=",".join(DEFAULT_RESOLUTIONS))
+    synth.add_argument("--skins", default=",".join(SKINS))
+    synth.add_argument("--party", type=int, default=0, help="추가로 그릴 작은 체력바 수")
+    synth.add_argument("--seed", type=int, default=0)
+    synth.set_defaults(handler=_cmd_synth)
+
+    bench = commands.add_parser("bench", help="합성 프레임으로 정확도/속도 측정")
+    bench.add_argument("--frames", type=int, default=5, help="해상도/스킨 조합별 프레임 수")
+    bench.add_argument("--resolutions", default=",".join(DEFAULT_RESOLUTIONS))
+    bench.add_argument("--skins", default=",".join(SKINS))
+    bench.add_argument("--party", type=int, default=0)
+    bench.add_argument("--mode", choices=MODES, default="bars")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--json", help="보고서를 저장할 JSON 경로")
+    bench.add_argument("--min-detection", type=float, help="검출률이 이보다 낮으면 종료 코드 1")
+    bench.set_defaults(handler=_cmd_bench)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # PNG 입출력에 Qt 이미지 플러그인만 쓰므로 화면이 없어도 동작하게 한다.
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
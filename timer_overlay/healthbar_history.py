@@ -0,0 +1,139 @@
+"""체력바 측정값 기록과 변화율/남은 시간 추정.
+
+고빈도로 계속 쌓이므로 배열은 처음에 한 번만 만들고, 이후에는 제자리에서만 쓴다.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+# 이보다 느리게 줄어들면 남은 시간을 추정하지 않는다 (%/초).
+_MIN_DAMAGE_RATE = 0.05
+
+
+@dataclass(frozen=True)
+class HealthEstimate:
+    """한 시점의 체력 추정치."""
+
+    timestamp: float
+    percent: float
+    smoothed: float
+    rate_per_s: float  # 음수면 체력이 줄어드는 중
+    seconds_to_zero: Optional[float]
+
+
+class HealthbarHistory:
+    """``(monotonic 시각, 체력%)`` 고정 크기 링 버퍼.
+
+    추가할 때마다 직전 3개 값의 중앙값으로 한 프레임짜리 오검출을 거르고
+    지수 이동 평균으로 다듬은 값을 함께 저장한다. 변화율은 최근
+    ``regression_window_s`` 초 동안의 다듬은 값에 대한 최소제곱 기울기다.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        *,
+        ema_alpha: float = 0.35,
+        regression_window_s: float = 5.0,
+    ) -> None:
+        if capacity < 3:
+            raise ValueError("capacity 는 3 이상이어야 합니다.")
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._raw = np.zeros(capacity, dtype=np.float64)
+        self._smoothed = np.zeros(capacity, dtype=np.float64)
+        self._capacity = capacity
+        self._head = 0  # 다음에 쓸 위치
+        self._count = 0
+        self._base_time = 0.0
+        self._ema: Optional[float] = None
+        self.ema_alpha = ema_alpha
+        self.regression_window_s = regression_window_s
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def clear(self) -> None:
+        self._head = 0
+        self._count = 0
+        self._ema = None
+
+    def append(self, timestamp: float, percent: float) -> HealthEstimate:
+        """측정값을 추가하고 새 추정치를 반환한다."""
+
+        if self._count == 0:
+            # 시각을 첫 샘플 기준으로 저장해 제곱합의 정밀도를 지킨다.
+            self._base_time = timestamp
+        filtered = percent
+        if self._count >= 2:
+            previous = self._raw[(self._head - 1) % self._capacity]
+            earlier = self._raw[(self._head - 2) % self._capacity]
+            filtered = sorted((percent, float(previous), float(earlier)))[1]
+        if self._ema is None:
+            self._ema = filtered
+        else:
+            self._ema += self.ema_alpha * (filtered - self._ema)
+
+        index = self._head
+        self._times[index] = timestamp - self._base_time
+        self._raw[index] = percent
+        self._smoothed[index] = self._ema
+        self._head = (index + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+        rate = self.rate_per_s()
+        seconds_to_zero = None
+        if rate < -_MIN_DAMAGE_RATE:
+            seconds_to_zero = max(0.0, self._ema / -rate)
+        return HealthEstimate(timestamp, percent, self._ema, rate, seconds_to_zero)
+
+    def _segments(self) -> Tuple[slice, slice]:
+        """기록을 시간 순서로 나눈 (오래된 쪽, 최신 쪽) 구간."""
+
+        if self._count < self._capacity:
+            return slice(0, 0), slice(0, self._count)
+        return slice(self._head, self._capacity), slice(0, self._head)
+
+    def rate_per_s(self) -> float:
+        """최근 구간의 체력 변화율 (%/초)."""
+
+        if self._count < 2:
+            return 0.0
+        latest = self._times[(self._head - 1) % self._capacity]
+        since = latest - self.regression_window_s
+        n = 0
+        sum_t = sum_v = sum_tt = sum_tv = 0.0
+        for segment in self._segments():
+            times = self._times[segment]
+            if times.size == 0:
+                continue
+            start = int(np.searchsorted(times, since, side="left"))
+            times = times[start:]
+            values = self._smoothed[segment][start:]
+            n += times.size
+            sum_t += float(times.sum())
+            sum_v += float(values.sum())
+            sum_tt += float(np.dot(times, times))
+            sum_tv += float(np.dot(times, values))
+        if n < 2:
+            return 0.0
+        denominator = n * sum_tt - sum_t * sum_t
+        if denominator <= 1e-12 or not math.isfinite(denominator):
+            return 0.0
+        return (n * sum_tv - sum_t * sum_v) / denominator
+
+    def samples(self) -> Tuple[np.ndarray, np.ndarray]:
+        """시간 순서로 정렬한 (시각, 다듬은 체력) 복사본 (표시/내보내기용)."""
+
+        older, newer = self._segments()
+        times = np.concatenate((self._times[older], self._times[newer])) + self._base_time
+        values = np.concatenate((self._smoothed[older], self._smoothed[newer]))
+        return times, values
@@ -1,10 +1,12 @@
 """체력바 오버레이 위젯."""
 from __future__ import annotations
 
-from PyQt5.QtCore import QRect, Qt
-from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from PyQt5.QtCore import QPoint, QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QGuiApplication, QPainter, QPen
 from PyQt5.QtWidgets import QWidget
 
+from timer_overlay.healthbar_history import HealthEstimate
+
 
 class HealthbarOverlayWidget(QWidget):
     """체력바 영역과 남은 체력을 표시하는 오버레이."""
@@ -12,6 +14,8 @@ class HealthbarOverlayWidget(QWidget):
     def __init__(self) -> None:
         super().__init__()
         self._percent = 0.0
+        self._rate_per_s = 0.0
+        self._seconds_to_zero: float | None = None
         self._padding = 6
         self._label_margin = 20
         self._bar_rect: QRect | None = None
@@ -50,6 +54,14 @@ class HealthbarOverlayWidget(QWidget):
         self._percent = max(0.0, percent)
         self.update()
 
+    def set_estimate(self, estimate: HealthEstimate) -> None:
+        """다듬은 체력과 변화율/남은 시간 추정치를 표시한다."""
+
+        self._percent = max(0.0, estimate.smoothed)
+        self._rate_per_s = estimate.rate_per_s
+        self._seconds_to_zero = estimate.seconds_to_zero
+        self.update()
+
     def paintEvent(self, event):  # type: ignore[override]
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -58,7 +70,8 @@ class HealthbarOverlayWidget(QWidget):
             pen = QPen(self._border_color, 3)
             painter.setPen(pen)
             painter.setBrush(Qt.NoBrush)
-            painter.drawRect(self._bar_rect.adjusted(1, 1, -1, -1))
+            # 테두리는 바 바깥에 그려 다음 캡처의 바 픽셀을 가리지 않게 한다.
+            painter.drawRect(self._bar_rect.adjusted(-3, -3, 2, 2))
 
         painter.setPen(QPen(self._text_color))
         font = QFont("Arial", 14, QFont.Bold)
@@ -66,4 +79,92 @@ class HealthbarOverlayWidget(QWidget):
         text_rect = self.rect().adjusted(0, 2, 0, 0)
         painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, f"{self._percent:.1f}%")
 
+        if self._seconds_to_zero is not None:
+            seconds = int(self._seconds_to_zero)
+            detail = f"{self._rate_per_s:+.1f}%/s {seconds // 60}:{seconds % 60:02d}"
+            painter.setFont(QFont("Arial", 9))
+            painter.drawText(
+                text_rect.adjusted(0, 4, -self._padding, 0), Qt.AlignRight | Qt.AlignTop, detail
+            )
+
         super().paintEvent(event)
+
+
+class RegionSelectWidget(QWidget):
+    """화면 위에서 마우스로 사각형 영역을 고르는 전체 화면 위젯."""
+
+    region_selected = pyqtSignal(QRect)
+    cancelled = pyqtSignal()
+
+    def __init__(self, message: str = "") -> None:
+        super().__init__()
+        self._message = message
+        self._origin: QPoint | None = None
+        self._current: QPoint | None = None
+
+        self.setWindowFlags(
+            Qt.Window | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool
+        )
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setCursor(Qt.CrossCursor)
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def start(self) -> None:
+        screen = QGuiApplication.primaryScreen()
+        if screen is not None:
+            self.setGeometry(screen.geometry())
+        self.show()
+        self.activateWindow()
+        self.setFocus()
+
+    def _selection(self) -> QRect | None:
+        if self._origin is None or self._current is None:
+            return None
+        return QRect(self._origin, self._current).normalized()
+
+    def mousePressEvent(self, event):  # type: ignore[override]
+        if event.button() != Qt.LeftButton:
+            return
+        self._origin = event.pos()
+        self._current = event.pos()
+        self.update()
+
+    def mouseMoveEvent(self, event):  # type: ignore[override]
+        if self._origin is None:
+            return
+        self._current = event.pos()
+        self.update()
+
+    def mouseReleaseEvent(self, event):  # type: ignore[override]
+        if event.button() != Qt.LeftButton or self._origin is None:
+            return
+        self._current = event.pos()
+        selection = self._selection()
+        self.close()
+        if selection is None or selection.width() < 4 or selection.height() < 2:
+            self.cancelled.emit()
+            return
+        self.region_selected.emit(selection.translated(self.geometry().topLeft()))
+
+    def keyPressEvent(self, event):  # type: ignore[override]
+        if event.key() == Qt.Key_Escape:
+            self.close()
+            self.cancelled.emit()
+            return
+        super().keyPressEvent(event)
+
+    def paintEvent(self, event):  # type: ignore[override]
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 80))
+        selection = self._selection()
+        if selection is not None:
+            painter.setCompositionMode(QPainter.CompositionMode_Clear)
+            painter.fillRect(selection, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setPen(QPen(QColor("#ff5252"), 2))
+            painter.drawRect(selection)
+        if self._message:
+            painter.setPen(QPen(QColor("#ffffff")))
+            painter.setFont(QFont("Arial", 14, QFont.Bold))
+            painter.drawText(self.rect().adjusted(0, 40, 0, 0), Qt.AlignHCenter | Qt.AlignTop, self._message)
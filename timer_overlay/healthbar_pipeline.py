@@ -0,0 +1,482 @@
+"""체력바 캡처/분석 파이프라인.
+
+캡처 -> (크기 제한 큐, 오래된 프레임 버림) -> 분석 작업 스레드 -> 결과 시그널 순서로
+동작해 GUI 스레드에서는 캡처(Qt 백엔드일 때)와 결과 반영만 한다.
+
+바를 놓치면 같은 경로로 전체 화면을 캡처해 분석 작업 스레드에서 다시 찾는다. 찾지
+못하면 재탐색 간격을 두 배씩 늘려(최대 ``REACQUIRE_MAX_INTERVAL_S``) 바가 없는 화면에서
+전체 화면 캡처/탐색을 계속 반복하지 않는다. 처음 바를 찾을 때(``start(..., acquire=True)``)도
+같은 경로를 쓰며, 이때는 한 번 찾지 못하면 ``acquire_failed`` 를 보내고 더 찾지 않는다.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QGuiApplication, QImage
+
+from timer_overlay import healthbar, metrics
+from timer_overlay.healthbar_history import HealthbarHistory, HealthEstimate
+from timer_overlay.hook_timing import HookTimingStats
+
+try:  # 선택 의존성: 화면 캡처를 GUI 스레드 밖에서 할 수 있다 (Linux 는 XShm 사용).
+    import mss
+except ImportError:  # pragma: no cover - 설치되지 않은 환경
+    mss = None
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("capture", "queue", "analyze", "deliver", "cpu")
+REACQUIRE_MIN_INTERVAL_S = 0.5
+REACQUIRE_MAX_INTERVAL_S = 8.0
+
+# 전체 화면 픽셀에서 체력바 영역들을 찾는 함수 (분석 작업 스레드에서 호출)
+Locator = Callable[[np.ndarray], List[healthbar.Rect]]
+
+
+@dataclass
+class Frame:
+    """캡처한 화면 조각. ``keepalive`` 는 ``pixels`` 가 가리키는 버퍼의 주인이다."""
+
+    pixels: np.ndarray
+    origin: tuple[int, int]
+    captured_at_ns: int
+    keepalive: Any = None
+    capture_cpu_ns: int = 0
+    full_screen: bool = False
+
+
+class AdaptiveRate:
+    """체력 변화에 따라 샘플링 간격을 조절한다.
+
+    값이 바뀌면 바로 가장 짧은 간격으로, 변화가 없으면 조금씩 길게 늘린다.
+    """
+
+    def __init__(
+        self,
+        fast_interval_s: float = 0.04,
+        slow_interval_s: float = 0.5,
+        growth: float = 1.5,
+        threshold: float = 0.5,
+    ) -> None:
+        self.fast_interval_s = fast_interval_s
+        self.slow_interval_s = slow_interval_s
+        self.growth = growth
+        self.threshold = threshold
+        self.interval_s = fast_interval_s
+        self._last_percents: List[Optional[float]] = []
+
+    def reset(self) -> None:
+        self.interval_s = self.fast_interval_s
+        self._last_percents = []
+
+    def observe(self, percents: Optional[Sequence[Optional[float]]]) -> float:
+        """바별 새 측정값(변화 없는 프레임이면 ``None``)을 반영한 다음 간격을 반환한다.
+
+        바 하나라도 값이 바뀌면 변화로 본다.
+        """
+
+        changed = False
+        if percents is not None:
+            if len(percents) != len(self._last_percents):
+                self._last_percents = [None] * len(percents)
+            for index, percent in enumerate(percents):
+                if percent is None:
+                    continue
+                last = self._last_percents[index]
+                if last is None or abs(percent - last) >= self.threshold:
+                    changed = True
+                self._last_percents[index] = percent
+        if changed:
+            self.interval_s = self.fast_interval_s
+        else:
+            self.interval_s = min(self.slow_interval_s, self.interval_s * self.growth)
+        return self.interval_s
+
+
+class QtCaptureBackend:
+    """``QScreen.grabWindow`` 캡처. Qt 제약으로 GUI 스레드에서만 호출한다."""
+
+    name = "qt"
+    thread_safe = False
+
+    def grab(self, rect: healthbar.Rect) -> Optional[Frame]:
+        screen = QGuiApplication.primaryScreen()
+        if screen is None:
+            return None
+        x, y, width, height = rect
+        image = screen.grabWindow(0, x, y, width, height).toImage()
+        image = image.convertToFormat(QImage.Format_RGBA8888)
+        if image.isNull():
+            return None
+        return Frame(healthbar.image_view(image), (x, y), time.perf_counter_ns(), image)
+
+    def close(self) -> None:
+        pass
+
+
+class MssCaptureBackend:
+    """``mss`` 캡처. 스레드마다 별도 인스턴스를 만들어 아무 스레드에서나 쓸 수 있다."""
+
+    name = "mss"
+    thread_safe = True
+
+    def __init__(self) -> None:
+        if mss is None:
+            raise RuntimeError("mss 패키지가 설치되어 있지 않습니다.")
+        self._local = threading.local()
+
+    def grab(self, rect: healthbar.Rect) -> Optional[Frame]:
+        grabber = getattr(self._local, "grabber", None)
+        if grabber is None:
+            grabber = mss.mss()
+            self._local.grabber = grabber
+        x, y, width, height = rect
+        shot = grabber.grab({"left": x, "top": y, "width": width, "height": height})
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        # 작은 ROI 이므로 BGRA -> RGBA 재배치 복사 비용은 무시할 만하다.
+        pixels = bgra[..., [2, 1, 0, 3]]
+        return Frame(pixels, (x, y), time.perf_counter_ns())
+
+    def close(self) -> None:
+        grabber = getattr(self._local, "grabber", None)
+        if grabber is not None:
+            grabber.close()
+            self._local.grabber = None
+
+
+def create_capture_backend(preferred: str = "auto"):
+    """사용 가능한 캡처 백엔드를 만든다 (``auto`` 는 mss 우선)."""
+
+    if preferred in ("auto", "mss") and mss is not None:
+        try:
+            return MssCaptureBackend()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("mss 캡처를 사용할 수 없습니다: %s", exc)
+    return QtCaptureBackend()
+
+
+class HealthbarPipeline(QObject):
+    """체력바 추적기를 주기적으로 캡처/분석해 결과를 GUI 스레드로 보낸다."""
+
+    reading = pyqtSignal(object)  # List[healthbar.TrackResult], 바 순서
+    estimate = pyqtSignal(object)  # List[Optional[HealthEstimate]], 바 순서
+    lost = pyqtSignal()  # 바를 놓쳐 전체 화면 재탐색을 시작함
+    reacquired = pyqtSignal(object)  # 재탐색으로 만든 새 healthbar.MultiBarTracker
+    acquire_failed = pyqtSignal()  # 처음 탐색에서 바를 찾지 못함
+    _interval_changed = pyqtSignal(float)
+    # 작업 스레드 -> GUI 스레드 전달용 (결과, 분석 완료 시각 ns)
+    _analyzed = pyqtSignal(object, object)
+
+    def __init__(
+        self,
+        backend=None,
+        parent: Optional[QObject] = None,
+        queue_size: int = 2,
+        rate: Optional[AdaptiveRate] = None,
+        locator: Optional[Locator] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.rate = rate if rate is not None else AdaptiveRate()
+        # 없으면 바를 놓친 결과도 ``reading`` 으로 그대로 보낸다.
+        self.locator = locator
+        # 작업 스레드에서만 쓴다. 추적기가 바뀌면 작업 스레드가 바 개수만큼 새로 만든다.
+        self.histories: List[HealthbarHistory] = []
+        self._history_stale = True
+        self._last_percents: List[Optional[float]] = []
+        self._backend = backend if backend is not None else create_capture_backend()
+        self._tracker: Optional[healthbar.MultiBarTracker] = None
+        self._frames: Deque[Frame] = deque(maxlen=queue_size)
+        self._frames_ready = threading.Condition()
+        self._stop = threading.Event()
+        self._interval_s = 0.5
+        self._adaptive = True
+        self._fixed_interval_s = 0.5
+        self._reacquiring = False
+        self._acquiring = False
+        self._reacquire_interval_s = REACQUIRE_MIN_INTERVAL_S
+        self._worker: Optional[threading.Thread] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_timer: Optional[QTimer] = None
+        self.stats: Dict[str, HookTimingStats] = {stage: HookTimingStats() for stage in STAGES}
+        self.dropped_frames = 0
+        self.unchanged_frames = 0
+        self._last_digest: Optional[int] = None
+        self._analyzed.connect(self._deliver)
+        self._interval_changed.connect(self.set_interval)
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.name
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None
+
+    @property
+    def tracker(self) -> Optional[healthbar.MultiBarTracker]:
+        return self._tracker
+
+    @property
+    def reacquiring(self) -> bool:
+        return self._reacquiring
+
+    def set_tracker(self, tracker: healthbar.MultiBarTracker) -> None:
+        """추적기를 교체한다 (재탐색 후 등). 큐에 남은 이전 프레임은 버린다."""
+
+        with self._frames_ready:
+            self._frames.clear()
+            self._tracker = tracker
+            self._reacquiring = False
+            self._acquiring = False
+            self._last_digest = None
+            self._history_stale = True
+
+    def set_interval(self, interval_s: float) -> None:
+        self._interval_s = max(0.01, interval_s)
+        if self._capture_timer is not None:
+            self._capture_timer.setInterval(int(self._interval_s * 1000))
+
+    def start(
+        self,
+        tracker: healthbar.MultiBarTracker,
+        interval_s: Optional[float] = None,
+        *,
+        acquire: bool = False,
+    ) -> None:
+        """추적을 시작한다. ``interval_s`` 를 주면 고정 간격, 아니면 적응형 간격.
+
+        ``acquire`` 면 ``tracker`` 의 바 위치는 쓰지 않고 전체 화면에서 ``locator`` 로
+        먼저 찾는다. 찾으면 ``reacquired``, 못 찾으면 ``acquire_failed`` 를 보낸다.
+        """
+
+        if acquire and self.locator is None:
+            raise ValueError("처음 탐색에는 locator 가 필요합니다.")
+        self.stop()
+        self.set_tracker(tracker)
+        self._adaptive = interval_s is None
+        if interval_s is not None:
+            self._fixed_interval_s = interval_s
+        self.rate.reset()
+        self._interval_s = max(0.01, self.rate.interval_s if interval_s is None else interval_s)
+        if acquire:
+            self._reacquiring = True
+            self._acquiring = True
+            self._reacquire_interval_s = REACQUIRE_MIN_INTERVAL_S
+            self._interval_s = REACQUIRE_MIN_INTERVAL_S
+        # 실행마다 새 이벤트를 써서 이전 실행의 스레드가 다시 살아나지 않게 한다.
+        self._stop = threading.Event()
+        for stats in self.stats.values():
+            stats.reset()
+        self.dropped_frames = 0
+        self.unchanged_frames = 0
+        self._worker = threading.Thread(
+            target=self._analyze_loop, args=(self._stop,), name="HealthbarAnalyze", daemon=True
+        )
+        self._worker.start()
+        if self._backend.thread_safe:
+            self._capture_thread = threading.Thread(
+                target=self._capture_loop, args=(self._stop,), name="HealthbarCapture", daemon=True
+            )
+            self._capture_thread.start()
+        else:
+            if self._capture_timer is None:
+                self._capture_timer = QTimer(self)
+                self._capture_timer.timeout.connect(self._capture_once)
+            self._capture_timer.setInterval(int(self._interval_s * 1000))
+            self._capture_timer.start()
+            if acquire:
+                # 첫 전체 화면 캡처는 한 주기를 기다리지 않는다.
+                QTimer.singleShot(0, self._capture_once)
+        logger.info("체력바 파이프라인 시작 (캡처: %s)", self._backend.name)
+
+    def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._stop.set()
+        if self._capture_timer is not None:
+            self._capture_timer.stop()
+        with self._frames_ready:
+            self._frames.clear()
+            self._frames_ready.notify_all()
+        self._worker = None
+        self._capture_thread = None
+        logger.info("체력바 파이프라인 중지: %s", self.stats_summary())
+
+    def stats_summary(self) -> str:
+        parts = [f"{stage} {self.stats[stage].summary()}" for stage in STAGES]
+        parts.append(f"버린 프레임 {self.dropped_frames}")
+        parts.append(f"변화 없는 프레임 {self.unchanged_frames}")
+        return ", ".join(parts)
+
+    # 캡처 단계 -------------------------------------------------------------
+    def _capture_once(self) -> None:
+        tracker = self._tracker
+        if tracker is None:
+            return
+        full_screen = self._reacquiring
+        started = time.perf_counter_ns()
+        cpu_started = time.thread_time_ns()
+        try:
+            frame = self._backend.grab(tracker.screen_rect() if full_screen else tracker.capture_rect())
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("체력바 캡처 실패: %s", exc)
+            return
+        if frame is None:
+            return
+        frame.capture_cpu_ns = time.thread_time_ns() - cpu_started
+        frame.full_screen = full_screen
+        elapsed = time.perf_counter_ns() - started
+        self.stats["capture"].record(elapsed)
+        metrics.HEALTHBAR_CAPTURE.record(elapsed)
+        with self._frames_ready:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped_frames += 1
+            self._frames.append(frame)
+            self._frames_ready.notify()
+
+    def _capture_loop(self, stop: threading.Event) -> None:
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                self._capture_once()
+                stop.wait(max(0.0, self._interval_s - (time.monotonic() - started)))
+        finally:
+            self._backend.close()
+
+    # 분석 단계 -------------------------------------------------------------
+    def _analyze_loop(self, stop: threading.Event) -> None:
+        while True:
+            with self._frames_ready:
+                while not self._frames and not stop.is_set():
+                    self._frames_ready.wait()
+                if stop.is_set():
+                    return
+                frame = self._frames.popleft()
+                tracker = self._tracker
+            if tracker is None or frame.full_screen != self._reacquiring:
+                # 재탐색을 시작하기 전/끝낸 뒤의 프레임은 버린다.
+                continue
+            if frame.full_screen:
+                self._reacquire(frame, tracker, stop)
+                continue
+            dequeued = time.perf_counter_ns()
+            cpu_started = time.thread_time_ns()
+            self.stats["queue"].record(dequeued - frame.captured_at_ns)
+            # 캡처 내용이 이전 프레임과 같으면 분석을 건너뛴다.
+            digest = zlib.crc32(np.ascontiguousarray(frame.pixels))
+            if digest == self._last_digest:
+                self.unchanged_frames += 1
+                if not stop.is_set():
+                    self.estimate.emit(self._record_history(self._last_percents))
+                self.stats["cpu"].record(frame.capture_cpu_ns + time.thread_time_ns() - cpu_started)
+                self._adapt(None)
+                continue
+            try:
+                results = tracker.update(frame.pixels, frame.origin)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("체력바 분석 실패: %s", exc)
+                continue
+            # 바를 못 찾은 프레임은 다시 분석해야 놓친 횟수가 쌓인다.
+            found_all = all(result.percent is not None for result in results)
+            self._last_digest = digest if found_all else None
+            if self.locator is not None and any(result.lost for result in results):
+                if not stop.is_set() and tracker is self._tracker:
+                    self._begin_reacquire()
+                continue
+            if self._history_stale:
+                self.histories = [HealthbarHistory() for _ in results]
+                self._history_stale = False
+            self._last_percents = [result.percent for result in results]
+            estimates = self._record_history(self._last_percents)
+            finished = time.perf_counter_ns()
+            self.stats["analyze"].record(finished - dequeued)
+            metrics.HEALTHBAR_ANALYZE.record(finished - dequeued)
+            self.stats["cpu"].record(frame.capture_cpu_ns + time.thread_time_ns() - cpu_started)
+            if stop.is_set() or tracker is not self._tracker:
+                continue
+            self._adapt(self._last_percents)
+            self._analyzed.emit(results, finished)
+            self.estimate.emit(estimates)
+
+    # 재탐색 ---------------------------------------------------------------
+    def _begin_reacquire(self) -> None:
+        logger.info("체력바를 놓쳐 전체 화면에서 다시 탐색합니다.")
+        with self._frames_ready:
+            self._frames.clear()
+            self._reacquiring = True
+            self._last_digest = None
+        self._reacquire_interval_s = REACQUIRE_MIN_INTERVAL_S
+        self._set_capture_interval(REACQUIRE_MIN_INTERVAL_S)
+        self.lost.emit()
+
+    def _reacquire(
+        self, frame: Frame, tracker: healthbar.MultiBarTracker, stop: threading.Event
+    ) -> None:
+        """전체 화면 프레임에서 바를 다시 찾는다. 못 찾으면 다음 탐색 간격을 늘린다."""
+
+        started = time.perf_counter_ns()
+        try:
+            rects = self.locator(frame.pixels) if self.locator is not None else []
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("체력바 재탐색 실패: %s", exc)
+            rects = []
+        self.stats["analyze"].record(time.perf_counter_ns() - started)
+        if stop.is_set() or tracker is not self._tracker:
+            return
+        if not rects and self._acquiring:
+            logger.info("전체 화면에서 체력바를 찾지 못했습니다.")
+            # 멈출 때까지 더 캡처/탐색하지 않는다.
+            with self._frames_ready:
+                self._frames.clear()
+                self._tracker = None
+            self.acquire_failed.emit()
+            return
+        if not rects:
+            self._reacquire_interval_s = min(REACQUIRE_MAX_INTERVAL_S, self._reacquire_interval_s * 2)
+            logger.info("체력바를 찾지 못했습니다. %.1f초 뒤 다시 탐색합니다.", self._reacquire_interval_s)
+            self._set_capture_interval(self._reacquire_interval_s)
+            return
+        reacquired = tracker.retarget(rects)
+        self.set_tracker(reacquired)
+        self.rate.reset()
+        self._set_capture_interval(self.rate.interval_s if self._adaptive else self._fixed_interval_s)
+        logger.info("체력바 %d개를 다시 찾았습니다: %s", len(rects), rects)
+        self.reacquired.emit(reacquired)
+
+    def _set_capture_interval(self, interval_s: float) -> None:
+        """작업 스레드에서 캡처 간격을 바꾼다."""
+
+        self._interval_s = interval_s
+        if self._capture_timer is not None:
+            # Qt 타이머는 GUI 스레드에서만 바꿀 수 있다.
+            self._interval_changed.emit(interval_s)
+
+    def _record_history(self, percents: Sequence[Optional[float]]) -> List[Optional[HealthEstimate]]:
+        now = time.monotonic()
+        return [
+            history.append(now, percent) if percent is not None else None
+            for history, percent in zip(self.histories, percents)
+        ]
+
+    def _adapt(self, percents: Optional[Sequence[Optional[float]]]) -> None:
+        if not self._adaptive:
+            return
+        before = self._interval_s
+        interval = self.rate.observe(percents)
+        if interval == before:
+            return
+        self._set_capture_interval(interval)
+
+    def _deliver(self, results: List[healthbar.TrackResult], analyzed_ns: int) -> None:
+        if self._worker is None:
+            return
+        self.stats["deliver"].record(time.perf_counter_ns() - analyzed_ns)
+        self.reading.emit(results)
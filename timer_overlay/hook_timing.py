@@ -0,0 +1,43 @@
+"""키보드 훅 콜백 소요 시간 측정 도우미."""
+from __future__ import annotations
+
+
+class HookTimingStats:
+    """훅 스레드에서 기록하는 콜백 소요 시간 통계 (나노초).
+
+    훅 스레드 하나만 기록하므로 락을 쓰지 않는다. 읽는 쪽은 근사값을 본다.
+    """
+
+    __slots__ = ("count", "total_ns", "max_ns", "last_ns")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.last_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        self.last_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def reset(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.last_ns = 0
+
+    @property
+    def mean_us(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.total_ns / self.count / 1000
+
+    @property
+    def max_us(self) -> float:
+        return self.max_ns / 1000
+
+    def summary(self) -> str:
+        return f"{self.count}회, 평균 {self.mean_us:.1f}us, 최대 {self.max_us:.1f}us"
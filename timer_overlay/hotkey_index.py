@@ -0,0 +1,313 @@
+"""단축키 색인 및 조합키/연속키 매칭 모듈.
+
+단축키 문자열 형식:
+
+* 단일 키: ``"f1"``, ``"a"``
+* 조합키: ``"ctrl+1"``, ``"ctrl+shift+f2"`` (수식 키 + 일반 키 하나)
+* 연속키: ``"g, 1"`` 처럼 단계를 쉼표로 구분 (각 단계는 조합키일 수 있음)
+* 쉼표 키: 구분자와 겹치므로 ``"comma"`` 로 쓴다 (``"ctrl+comma"``). ``","`` 하나만 있으면
+  쉼표 키 단일 바인딩으로 본다.
+
+:class:`HotkeyIndex` 는 바인딩이 바뀔 때만 만들어지는 불변 트라이이고,
+:class:`HotkeyMatcher` 는 키 이벤트마다 사전 조회 한 번으로 다음 상태를 찾는다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from timer_overlay.clock import get_clock
+
+MODIFIERS: Tuple[str, ...] = ("ctrl", "alt", "shift", "meta")
+
+# keyboard / pynput / Qt 가 쓰는 수식 키 이름을 하나로 맞춘다.
+_KEY_ALIASES: Dict[str, str] = {
+    "control": "ctrl",
+    "ctrl_l": "ctrl",
+    "ctrl_r": "ctrl",
+    "left ctrl": "ctrl",
+    "right ctrl": "ctrl",
+    "shift_l": "shift",
+    "shift_r": "shift",
+    "left shift": "shift",
+    "right shift": "shift",
+    "alt_l": "alt",
+    "alt_r": "alt",
+    "alt_gr": "alt",
+    "alt gr": "alt",
+    "left alt": "alt",
+    "right alt": "alt",
+    "option": "alt",
+    "cmd": "meta",
+    "cmd_l": "meta",
+    "cmd_r": "meta",
+    "command": "meta",
+    "windows": "meta",
+    "left windows": "meta",
+    "right windows": "meta",
+    "win": "meta",
+    "super": "meta",
+    # 쉼표는 연속키 구분자이므로 키 이름으로는 "comma" 를 쓴다.
+    ",": "comma",
+}
+
+SEQUENCE_SEPARATOR = ","
+CHORD_SEPARATOR = "+"
+COMMA_KEY = "comma"
+
+
+def normalize_key_name(name: Optional[str]) -> Optional[str]:
+    """라이브러리별 키 이름을 소문자 표준 이름으로 변환한다."""
+
+    if not name:
+        return None
+    key = name.strip().lower()
+    if not key:
+        return None
+    return _KEY_ALIASES.get(key, key)
+
+
+def _normalize_step(raw: str) -> Optional[str]:
+    parts = [part for part in raw.split(CHORD_SEPARATOR)]
+    # "ctrl++" 처럼 '+' 자체를 키로 쓰는 경우
+    if raw.strip().endswith(CHORD_SEPARATOR + CHORD_SEPARATOR) or raw.strip() == CHORD_SEPARATOR:
+        parts = parts[:-2] + [CHORD_SEPARATOR]
+    modifiers = set()
+    key: Optional[str] = None
+    for part in parts:
+        name = normalize_key_name(part) if part != CHORD_SEPARATOR else CHORD_SEPARATOR
+        if name is None:
+            continue
+        if name in MODIFIERS:
+            modifiers.add(name)
+        elif key is None:
+            key = name
+        else:
+            return None  # 일반 키는 단계마다 하나만 허용
+    if key is None:
+        return None
+    ordered = [modifier for modifier in MODIFIERS if modifier in modifiers]
+    return CHORD_SEPARATOR.join(ordered + [key])
+
+
+def parse_binding(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """단축키 문자열을 표준화된 단계 튜플로 변환한다. 잘못된 형식이면 ``None``."""
+
+    if not raw or not raw.strip():
+        return None
+    if raw.strip() == SEQUENCE_SEPARATOR:
+        return (COMMA_KEY,)
+    steps: List[str] = []
+    for raw_step in raw.split(SEQUENCE_SEPARATOR):
+        if not raw_step.strip():
+            continue
+        step = _normalize_step(raw_step)
+        if step is None:
+            return None
+        steps.append(step)
+    return tuple(steps) if steps else None
+
+
+def normalize_binding(raw: Optional[str]) -> Optional[str]:
+    """단축키 문자열의 표준 표기 (예: ``"Ctrl+1 ,g"`` -> ``"ctrl+1, g"``)."""
+
+    steps = parse_binding(raw)
+    if steps is None:
+        return None
+    return (SEQUENCE_SEPARATOR + " ").join(steps)
+
+
+def step_key(step: str) -> str:
+    """단계에서 수식 키를 뺀 일반 키 이름."""
+
+    if step == CHORD_SEPARATOR or step.endswith(CHORD_SEPARATOR * 2):
+        return CHORD_SEPARATOR
+    return step.rsplit(CHORD_SEPARATOR, 1)[-1]
+
+
+@dataclass
+class _Node:
+    children: Dict[str, "_Node"] = field(default_factory=dict)
+    timer_ids: Tuple[str, ...] = ()
+
+
+class HotkeyIndex:
+    """타이머 단축키의 역색인 + 연속키 트라이 (불변)."""
+
+    def __init__(self, bindings: Mapping[str, str]) -> None:
+        self._root = _Node()
+        self._owners: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        keys = set()
+        for timer_id, raw in bindings.items():
+            steps = parse_binding(raw)
+            if steps is None:
+                continue
+            node = self._root
+            for step in steps:
+                node = node.children.setdefault(step, _Node())
+                keys.add(step_key(step))
+            node.timer_ids = node.timer_ids + (str(timer_id),)
+            self._owners[steps] = node.timer_ids
+        self._keys = frozenset(keys)
+
+    @classmethod
+    def build(cls, bindings: Mapping[str, str]) -> "HotkeyIndex":
+        return cls(bindings)
+
+    @property
+    def keys(self) -> frozenset[str]:
+        """바인딩에 쓰인 일반 키 이름 집합 (훅 단계의 빠른 거르기용)."""
+
+        return self._keys
+
+    @property
+    def root(self) -> _Node:
+        return self._root
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._owners.values())
+
+    def owners(self, raw: str) -> Tuple[str, ...]:
+        steps = parse_binding(raw)
+        if steps is None:
+            return ()
+        return self._owners.get(steps, ())
+
+    def conflicts(self, raw: str, exclude: Optional[str] = None) -> List[str]:
+        """같은 바인딩이거나 접두사 관계여서 함께 쓸 수 없는 타이머 id 목록."""
+
+        steps = parse_binding(raw)
+        if steps is None:
+            return []
+        found: List[str] = []
+        node = self._root
+        # 새 바인딩의 접두사에 이미 바인딩된 타이머
+        for step in steps:
+            child = node.children.get(step)
+            if child is None:
+                break
+            node = child
+            found.extend(child.timer_ids)
+        else:
+            # 새 바인딩을 접두사로 갖는 기존 바인딩
+            stack = list(node.children.values())
+            while stack:
+                current = stack.pop()
+                found.extend(current.timer_ids)
+                stack.extend(current.children.values())
+        return [timer_id for timer_id in dict.fromkeys(found) if timer_id != exclude]
+
+
+class HotkeyMatcher:
+    """키 이벤트를 받아 완성된 단축키의 타이머 id 를 돌려주는 상태 기계.
+
+    훅 스레드 하나에서만 호출해야 한다. 색인은 :meth:`set_index` 로 통째로 교체한다.
+
+    수식 키를 누른 채 누른 키가 조합키로 등록되어 있지 않으면 수식 키 없이 다시 찾는다
+    (Shift 를 누른 채 눌러도 단일 키 단축키는 동작). 수식 키는 ``sequence_timeout``
+    동안 아무 키 입력도 없으면 뗀 것으로 본다. 누르고 있는 수식 키는 OS 가 반복 입력을
+    보내므로 그대로 유지되고, 뗌 이벤트를 놓친 수식 키는 계속 눌린 상태로 남지 않는다.
+    """
+
+    def __init__(self, index: Optional[HotkeyIndex] = None, sequence_timeout: float = 1.0) -> None:
+        self._index = index if index is not None else HotkeyIndex({})
+        self._node = self._index.root
+        self._deadline = 0.0
+        # 수식 키 -> 마지막으로 눌린 시각
+        self._modifiers: Dict[str, float] = {}
+        self.sequence_timeout = sequence_timeout
+
+    @property
+    def index(self) -> HotkeyIndex:
+        return self._index
+
+    def set_index(self, index: HotkeyIndex) -> None:
+        self._index = index
+        self._node = index.root
+
+    def press(self, name: Optional[str], now: Optional[float] = None) -> Tuple[str, ...]:
+        key = normalize_key_name(name)
+        if key is None:
+            return ()
+        if key in MODIFIERS:
+            self._modifiers[key] = get_clock().monotonic() if now is None else now
+            return ()
+        root = self._index.root
+        node = self._node
+        if node is not root or self._modifiers:
+            now = get_clock().monotonic() if now is None else now
+            if node is not root and now > self._deadline:
+                node = root
+            if self._modifiers:
+                self._refresh_modifiers(now)
+        if node is root and key not in self._index.keys:
+            return ()
+
+        child = None
+        if self._modifiers:
+            ordered = [modifier for modifier in MODIFIERS if modifier in self._modifiers]
+            child = self._find(node, CHORD_SEPARATOR.join(ordered + [key]))
+        if child is None:
+            # 조합키로 등록되어 있지 않으면 수식 키 없이 찾는다.
+            child = self._find(node, key)
+        if child is None:
+            self._node = root
+            return ()
+        if child.children and not child.timer_ids:
+            self._node = child
+            self._deadline = (get_clock().monotonic() if now is None else now) + self.sequence_timeout
+            return ()
+        self._node = root
+        return child.timer_ids
+
+    def _find(self, node: _Node, step: str) -> Optional[_Node]:
+        child = node.children.get(step)
+        root = self._index.root
+        if child is None and node is not root:
+            # 진행 중이던 연속키가 끊기면 이번 키로 새로 시작한다.
+            child = root.children.get(step)
+        return child
+
+    def _refresh_modifiers(self, now: float) -> None:
+        """오래된 수식 키는 버리고, 남은 수식 키는 이번 입력과 함께 눌린 것으로 갱신한다."""
+
+        for modifier, pressed_at in list(self._modifiers.items()):
+            if now - pressed_at > self.sequence_timeout:
+                del self._modifiers[modifier]
+            else:
+                self._modifiers[modifier] = now
+
+    def release(self, name: Optional[str]) -> None:
+        key = normalize_key_name(name)
+        if key in MODIFIERS:
+            self._modifiers.pop(key, None)
+
+    def reset(self) -> None:
+        self._node = self._index.root
+        self._modifiers.clear()
+
+
+def format_binding(raw: Optional[str]) -> Optional[str]:
+    """화면 표시용 단축키 문자열 (예: ``"ctrl+f1, g"`` -> ``"Ctrl+F1, G"``)."""
+
+    steps = parse_binding(raw)
+    if steps is None:
+        return None
+
+    def format_key(key: str) -> str:
+        if len(key) == 1:
+            return key.upper()
+        if key.startswith("f") and key[1:].isdigit():
+            return key.upper()
+        return key.replace("_", " ").title()
+
+    return ", ".join(
+        CHORD_SEPARATOR.join(format_key(part) for part in _split_step(step)) for step in steps
+    )
+
+
+def _split_step(step: str) -> Iterable[str]:
+    key = step_key(step)
+    if key == step:
+        return [key]
+    return step[: -len(key) - 1].split(CHORD_SEPARATOR) + [key]
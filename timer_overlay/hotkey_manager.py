@@ -2,27 +2,48 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
 from typing import Callable, Dict, Optional
 
 from pynput import keyboard
 
+from timer_overlay import metrics
+from timer_overlay.hook_timing import HookTimingStats
+from timer_overlay.hotkey_index import HotkeyIndex, HotkeyMatcher
+from timer_overlay.tracing import get_tracer
+
 logger = logging.getLogger(__name__)
 
+# 작업 스레드 종료 신호
+_STOP = object()
+
 
 class HotkeyManager:
-    """전역 단축키를 등록하고 관리."""
+    """전역 단축키를 등록하고 관리.
+    
+    pynput 훅 콜백에서는 키 조회와 큐 적재만 하고, 실제 콜백(네트워크 요청 등)은
+    별도 작업 스레드에서 실행해 OS 입력이 지연되지 않도록 한다. 지연 추적도 훅에서는
+    시각만 재서 넘기고 작업 스레드에서 연다.
+    """
     
     def __init__(self):
         self._hotkeys: Dict[str, str] = {}  # timer_id -> key
-        self._callbacks: Dict[str, Callable[[str], None]] = {}  # key -> callback
+        # 훅 스레드에서 쓰는 단축키 매처 (색인은 변경 시 통째로 교체)
+        self._matcher = HotkeyMatcher()
         self._listener: Optional[keyboard.Listener] = None
         self._action_callback: Optional[Callable[[str], None]] = None
+        self._actions: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        self.timing = HookTimingStats()
+        self._callback_time = metrics.hook_callback("hotkey_manager")
     
     def set_action_callback(self, callback: Callable[[str], None]):
         """단축키 눌렸을 때 호출될 콜백 설정.
         
         Args:
-            callback: timer_id를 인자로 받는 함수
+            callback: timer_id를 인자로 받는 함수 (작업 스레드에서 호출됨)
         """
         self._action_callback = callback
     
@@ -34,12 +55,14 @@ class HotkeyManager:
         # 새 키 등록
         key_lower = key.lower()
         self._hotkeys[timer_id] = key_lower
+        self._rebuild_index()
         logger.info("단축키 등록: %s -> %s", timer_id, key_lower)
     
     def unregister(self, timer_id: str):
         """타이머의 단축키 해제."""
         if timer_id in self._hotkeys:
-            key = self._hotkeys.pop(timer_id)
+            self._hotkeys.pop(timer_id)
+            self._rebuild_index()
             logger.info("단축키 해제: %s", timer_id)
     
     def get_hotkey(self, timer_id: str) -> Optional[str]:
@@ -53,13 +76,27 @@ class HotkeyManager:
     def set_hotkeys(self, hotkeys: Dict[str, str]):
         """단축키 일괄 설정."""
         self._hotkeys = {k: v.lower() for k, v in hotkeys.items()}
+        self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """단축키 색인 재생성."""
+        self._matcher.set_index(HotkeyIndex.build(self._hotkeys))
+    
+    def get_index(self) -> HotkeyIndex:
+        """현재 단축키 색인 반환 (충돌 검사용)."""
+        return self._matcher.index
     
     def start(self):
         """리스너 시작."""
         if self._listener is not None:
             return
         
-        self._listener = keyboard.Listener(on_press=self._on_key_press)
+        self._worker = threading.Thread(target=self._drain_actions, name="HotkeyActions", daemon=True)
+        self._worker.start()
+        self._listener = keyboard.Listener(
+            on_press=self._on_key_press, on_release=self._on_key_release
+        )
+        self._listener.name = "HotkeyListener"
         self._listener.start()
         logger.info("단축키 리스너 시작")
     
@@ -68,26 +105,61 @@ class HotkeyManager:
         if self._listener is not None:
             self._listener.stop()
             self._listener = None
-            logger.info("단축키 리스너 중지")
+            self._actions.put(_STOP)
+            self._worker = None
+            logger.info("단축키 리스너 중지 (훅 콜백: %s)", self.timing.summary())
+    
+    def _key_name(self, key) -> Optional[str]:
+        """pynput 키 객체를 이름으로 변환."""
+        listener = self._listener
+        if listener is not None:
+            # Ctrl 등이 눌린 상태의 제어 문자를 원래 키로 되돌림
+            key = listener.canonical(key)
+        # 일반 키
+        if hasattr(key, 'char') and key.char:
+            return key.char.lower()
+        # 특수 키 (F1, F2 등)
+        if hasattr(key, 'name'):
+            return key.name.lower()
+        return None
     
     def _on_key_press(self, key):
-        """키 눌림 처리."""
+        """키 눌림 처리 (pynput 훅 스레드)."""
+        started = time.perf_counter_ns()
         try:
-            # 일반 키
-            if hasattr(key, 'char') and key.char:
-                pressed_key = key.char.lower()
-            # 특수 키 (F1, F2 등)
-            elif hasattr(key, 'name'):
-                pressed_key = key.name.lower()
-            else:
-                return
-            
-            # 등록된 단축키인지 확인
-            for timer_id, hotkey in self._hotkeys.items():
-                if hotkey == pressed_key:
-                    if self._action_callback:
-                        self._action_callback(timer_id)
-                    break
-                    
+            # 단축키가 완성되면 타이머 id 를 작업 스레드로 넘김 (먼저 등록된 타이머 우선)
+            timer_ids = self._matcher.press(self._key_name(key))
+            if timer_ids:
+                self._actions.put_nowait((timer_ids[0], started, threading.get_ident()))
         except Exception as e:
             logger.warning("단축키 처리 오류: %s", e)
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            self.timing.record(elapsed)
+            self._callback_time.record(elapsed)
+    
+    def _on_key_release(self, key):
+        """키 뗌 처리 (수식 키 상태 갱신)."""
+        try:
+            self._matcher.release(self._key_name(key))
+        except Exception as e:
+            logger.warning("단축키 처리 오류: %s", e)
+    
+    def _drain_actions(self):
+        """큐에 쌓인 단축키 액션을 순서대로 실행 (작업 스레드)."""
+        while True:
+            item = self._actions.get()
+            if item is _STOP:
+                break
+            timer_id, started, hook_thread = item
+            tracer = get_tracer()
+            tracer.begin(timer_id, "hotkey_manager", started, hook_thread)
+            tracer.mark(timer_id, "worker")
+            callback = self._action_callback
+            if callback is None:
+                tracer.drop(timer_id, "콜백 없음")
+                continue
+            try:
+                callback(timer_id)
+            except Exception as e:
+                logger.warning("단축키 액션 처리 오류: %s", e)
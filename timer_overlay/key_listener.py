@@ -2,28 +2,48 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
 from typing import Any, Optional
 
 import keyboard
 from PyQt5.QtCore import QObject, pyqtSignal
 
+from timer_overlay import metrics
+from timer_overlay.hook_timing import HookTimingStats
+from timer_overlay.hotkey_index import HotkeyIndex, HotkeyMatcher
+
 logger = logging.getLogger(__name__)
 
 
 class GlobalKeyListener(QObject):
-    """keyboard 라이브러리를 이용해 특정 키 감지를 지원한다."""
+    """keyboard 라이브러리를 이용해 등록된 단축키 감지를 지원한다.
+
+    훅 콜백은 OS 입력 처리를 지연시키므로, 단축키 매칭까지 훅 안에서 끝내고
+    완성된 단축키의 타이머 id 와 훅 시각만 시그널로 넘긴다. 지연 추적은 받는 쪽에서 연다.
+    """
 
-    key_detected = pyqtSignal(str)
+    # Tuple[str, ...] timer ids, 훅 콜백 시작 시각(perf_counter_ns), 훅 스레드 id
+    hotkey_triggered = pyqtSignal(object, object, object)
 
     def __init__(self) -> None:
         super().__init__()
         self._handler: Optional[Any] = None
+        # 훅 스레드 전용 상태 기계. 색인은 불변 객체를 통째로 교체한다.
+        self._matcher = HotkeyMatcher()
+        self.timing = HookTimingStats()
+        self._callback_time = metrics.hook_callback("key_listener")
+
+    def set_index(self, index: HotkeyIndex) -> None:
+        """단축키 색인을 교체한다."""
+
+        self._matcher.set_index(index)
 
     def start(self) -> None:
         if self._handler is not None:
             return
         try:
-            self._handler = keyboard.on_press(self._handle_key_event)
+            self._handler = keyboard.hook(self._handle_key_event)
         except Exception as exc:  # pylint: disable=broad-except
             logger.warning("전역 키 후킹을 시작하지 못했습니다: %s", exc)
             self._handler = None
@@ -37,9 +57,17 @@ class GlobalKeyListener(QObject):
             logger.warning("전역 키 후킹을 중지하지 못했습니다: %s", exc)
         finally:
             self._handler = None
+            self._matcher.reset()
+            logger.info("전역 키 훅 콜백: %s", self.timing.summary())
 
     def _handle_key_event(self, event: keyboard.KeyboardEvent) -> None:
-        name = event.name
-        if not name:
-            return
-        self.key_detected.emit(name.lower())
+        started = time.perf_counter_ns()
+        if event.event_type == keyboard.KEY_DOWN:
+            timer_ids = self._matcher.press(event.name)
+            if timer_ids:
+                self.hotkey_triggered.emit(timer_ids, started, threading.get_ident())
+        else:
+            self._matcher.release(event.name)
+        elapsed = time.perf_counter_ns() - started
+        self.timing.record(elapsed)
+        self._callback_time.record(elapsed)
@@ -0,0 +1,538 @@
+"""여러 오버레이 클라이언트를 흉내 내는 부하 생성기 (asyncio, 표준 라이브러리 HTTP).
+
+각 가상 클라이언트는 ``TimerService`` 와 같은 폴링 주기/재시도 대기, 같은 응답 해석
+(``RemoteTimerState.from_payload``, ``estimate_server_clock_offset``), 같은 단축키 판단
+(``ToggleDispatcher.action_for``)을 쓴다. 전송 방식별로 처리량, 조회/액션 지연,
+다른 클라이언트의 액션이 화면에 반영되기까지의 지연(staleness), 오류율을 보고한다.
+
+    python -m timer_overlay.loadgen --standin --clients 200 --duration 30 --transports poll,conditional,stream
+    python -m timer_overlay.loadgen --server http://127.0.0.1:47984 --channel ca01 --clients 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from timer_overlay.network import (
+    BACKOFF_INITIAL_S,
+    BACKOFF_MAX_S,
+    HOTKEY_COOLDOWN_S,
+    POLL_INTERVAL_S,
+    RemoteTimerState,
+    ToggleDispatcher,
+    estimate_server_clock_offset,
+)
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ("poll", "conditional", "stream")
+_REQUEST_TIMEOUT_S = 5.0
+
+
+class _ProtocolError(Exception):
+    """서버 응답을 HTTP 로 해석하지 못함."""
+
+
+class _HttpConnection:
+    """keep-alive 연결 하나로 요청을 순서대로 보내는 최소 HTTP/1.1 클라이언트."""
+
+    def __init__(self, base_url: str) -> None:
+        parts = urlsplit(base_url)
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port or (443 if self._https else 80)
+        self._host_header = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._writer is None or self._writer.is_closing():
+            context = ssl.create_default_context() if self._https else None
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port, ssl=context)
+        return self._reader, self._writer
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    def _request_bytes(self, method: str, path: str, params: Dict[str, str], headers: Dict[str, str], body: bytes) -> bytes:
+        target = f"{self._prefix}{path}"
+        if params:
+            target += "?" + urlencode(params)
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self._host_header}", "Connection: keep-alive"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        if body or method == "POST":
+            lines.append("Content-Type: application/json")
+            lines.append(f"Content-Length: {len(body)}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _read_head(self, reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("서버가 응답 없이 연결을 닫았습니다.")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError) as exc:
+            raise _ProtocolError(status_line[:80]) from exc
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    @staticmethod
+    async def _iter_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> AsyncIterator[bytes]:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await reader.readline()
+                if not size_line:
+                    raise ConnectionResetError("청크 도중 연결이 끊어졌습니다.")
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    await reader.readline()
+                    return
+                chunk = await reader.readexactly(size)
+                await reader.readline()
+                yield chunk
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if length:
+                yield await reader.readexactly(length)
+        else:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, str],
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        try:
+            reader, writer = await self._connect()
+            writer.write(self._request_bytes(method, path, params, headers or {}, body))
+            await writer.drain()
+            status, response_headers = await self._read_head(reader)
+            chunks = [chunk async for chunk in self._iter_body(reader, response_headers)]
+        except BaseException:
+            self.close()
+            raise
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, response_headers, b"".join(chunks)
+
+    async def events(self, path: str, params: Dict[str, str]) -> AsyncIterator[str]:
+        """SSE ``data:`` 이벤트를 차례로 돌려준다 (``TimerService._listen_stream`` 과 같은 해석)."""
+
+        reader, writer = await self._connect()
+        try:
+            writer.write(self._request_bytes("GET", path, params, {"Accept": "text/event-stream"}, b""))
+            await writer.drain()
+            status, headers = await self._read_head(reader)
+            if status != 200:
+                raise _ProtocolError(f"HTTP {status}")
+            pending = b""
+            buffer = ""
+            async for chunk in self._iter_body(reader, headers):
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                for raw_line in lines:
+                    line = raw_line.decode("utf-8").rstrip("\r").strip("\ufeff")
+                    if not line:
+                        if buffer:
+                            yield buffer.rstrip("\n")
+                            buffer = ""
+                    elif line.startswith("data:"):
+                        buffer += line[5:].lstrip() + "\n"
+            raise ConnectionResetError("스트림이 끊어졌습니다.")
+        finally:
+            self.close()
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def _distribution(values: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50": round(_percentile(ordered, 50), 2),
+        "p95": round(_percentile(ordered, 95), 2),
+        "p99": round(_percentile(ordered, 99), 2),
+        "max": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+@dataclass
+class LoadStats:
+    """한 실행의 집계. 이벤트 루프 스레드 하나에서만 기록한다."""
+
+    requests: int = 0
+    payloads: int = 0
+    not_modified: int = 0
+    actions: int = 0
+    bytes_received: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    poll_ms: List[float] = field(default_factory=list)
+    action_ms: List[float] = field(default_factory=list)
+    staleness_ms: List[float] = field(default_factory=list)
+    parse_ms: List[float] = field(default_factory=list)
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def summary(self, transport: str, clients: int, duration_s: float) -> Dict[str, Any]:
+        error_count = sum(self.errors.values())
+        return {
+            "transport": transport,
+            "clients": clients,
+            "duration_s": round(duration_s, 2),
+            "requests": self.requests,
+            "requests_per_s": round(self.requests / duration_s, 1) if duration_s else 0.0,
+            "payloads_per_s": round(self.payloads / duration_s, 1) if duration_s else 0.0,
+            "not_modified": self.not_modified,
+            "actions": self.actions,
+            "bytes_per_s": round(self.bytes_received / duration_s) if duration_s else 0,
+            "errors": dict(self.errors),
+            "error_rate": round(error_count / max(1, self.requests + self.actions), 4),
+            "poll_ms": _distribution(self.poll_ms),
+            "action_ms": _distribution(self.action_ms),
+            "staleness_ms": _distribution(self.staleness_ms),
+            "parse_ms": _distribution(self.parse_ms),
+        }
+
+
+def _signature(item: Dict[str, Any]) -> Tuple[bool, Any]:
+    """액션 결과를 알아보기 위한 타이머 상태 요약."""
+
+    running = bool(item.get("isRunning"))
+    return running, item.get("endTime") if running else item.get("remaining")
+
+
+class _Propagation:
+    """타이머별 마지막 액션 결과. 각 클라이언트가 그 결과를 처음 본 시각으로 staleness 를 잰다."""
+
+    def __init__(self) -> None:
+        self.latest: Dict[str, Tuple[Tuple[bool, Any], float]] = {}
+
+
+class SimulatedClient:
+    """오버레이 하나를 흉내 낸다: 상태 수신 루프 + (선택) 단축키 액션 루프."""
+
+    def __init__(
+        self,
+        index: int,
+        base_url: str,
+        channel_code: str,
+        transport: str,
+        stats: LoadStats,
+        propagation: _Propagation,
+        *,
+        action_interval_s: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.index = index
+        self._base_url = base_url
+        self._params = {"channelCode": channel_code}
+        self._transport = transport
+        self._stats = stats
+        self._propagation = propagation
+        self._action_interval_s = action_interval_s
+        self._random = random.Random(seed * 100003 + index)
+        self._states: Dict[str, RemoteTimerState] = {}
+        self._seen: Dict[str, float] = {}
+        self._offset_ms = 0
+        self._etag: Optional[str] = None
+        self._last_triggered: Dict[str, float] = {}
+
+    async def run(self, stop: asyncio.Event, start_delay_s: float) -> None:
+        try:
+            await asyncio.wait_for(stop.wait(), start_delay_s)
+            return
+        except asyncio.TimeoutError:
+            pass
+        tasks = [asyncio.ensure_future(self._receive_loop(stop))]
+        if self._action_interval_s > 0:
+            tasks.append(asyncio.ensure_future(self._action_loop(stop)))
+        await stop.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 상태 수신 ----------------------------------------------------------
+    async def _receive_loop(self, stop: asyncio.Event) -> None:
+        connection = _HttpConnection(self._base_url)
+        backoff = BACKOFF_INITIAL_S
+        try:
+            while not stop.is_set():
+                try:
+                    if self._transport == "stream":
+                        await self._listen(connection)
+                        continue
+                    wait_s = POLL_INTERVAL_S if await self._poll_once(connection) else None
+                    if wait_s is not None:
+                        backoff = BACKOFF_INITIAL_S
+                        await asyncio.sleep(wait_s)
+                        continue
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, _ProtocolError) as exc:
+                    self._stats.error(type(exc).__name__)
+                # TimerService 와 같은 지수 재시도 대기
+                await asyncio.sleep(min(backoff, BACKOFF_MAX_S))
+                backoff = min(backoff * 2, BACKOFF_MAX_S)
+        finally:
+            connection.close()
+
+    async def _poll_once(self, connection: _HttpConnection) -> bool:
+        headers = {"If-None-Match": self._etag} if self._transport == "conditional" and self._etag else None
+        started = time.perf_counter()
+        self._stats.requests += 1
+        status, response_headers, body = await asyncio.wait_for(
+            connection.request("GET", "/api/timers", self._params, headers), _REQUEST_TIMEOUT_S
+        )
+        self._stats.poll_ms.append((time.perf_counter() - started) * 1000)
+        self._stats.bytes_received += len(body)
+        if status == 304:
+            self._stats.not_modified += 1
+            return True
+        if status != 200:
+            self._stats.error(f"HTTP {status}")
+            return False
+        self._etag = response_headers.get("etag")
+        return self._apply(body.decode("utf-8"))
+
+    async def _listen(self, connection: _HttpConnection) -> None:
+        self._stats.requests += 1
+        async for data in connection.events("/api/timers/stream", self._params):
+            self._stats.bytes_received += len(data)
+            self._apply(data)
+
+    def _apply(self, text: str) -> bool:
+        received = time.perf_counter()
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            self._stats.error("JSONDecodeError")
+            return False
+        timers_data = payload.get("timers") if isinstance(payload, dict) else None
+        if not isinstance(timers_data, list):
+            self._stats.error("payload")
+            return False
+        offset = estimate_server_clock_offset(timers_data)
+        if offset is not None:
+            self._offset_ms = offset
+        states: Dict[str, RemoteTimerState] = {}
+        for item in timers_data:
+            try:
+                state = RemoteTimerState.from_payload(item)
+            except Exception:  # pylint: disable=broad-except
+                continue
+            state.server_clock_offset_ms = self._offset_ms
+            states[state.id] = state
+            latest = self._propagation.latest.get(state.id)
+            if latest is not None and self._seen.get(state.id) != latest[1] and _signature(item) == latest[0]:
+                self._seen[state.id] = latest[1]
+                self._stats.staleness_ms.append((received - latest[1]) * 1000)
+        self._stats.parse_ms.append((time.perf_counter() - received) * 1000)
+        if states or not self._states:
+            self._states = states
+        self._stats.payloads += 1
+        return True
+
+    # 단축키 액션 --------------------------------------------------------
+    async def _action_loop(self, stop: asyncio.Event) -> None:
+        connection = _HttpConnection(self._base_url)
+        try:
+            while not stop.is_set():
+                await asyncio.sleep(self._random.expovariate(1.0 / self._action_interval_s))
+                if not self._states:
+                    continue
+                state = self._random.choice(list(self._states.values()))
+                now = time.monotonic()
+                last = self._last_triggered.get(state.id)
+                if last is not None and now - last < HOTKEY_COOLDOWN_S:
+                    continue
+                await self._act(connection, state)
+                self._last_triggered[state.id] = now
+        finally:
+            connection.close()
+
+    async def _act(self, connection: _HttpConnection, state: RemoteTimerState) -> None:
+        path = f"/api/timers/{state.id}/{ToggleDispatcher.action_for(state)}"
+        started = time.perf_counter()
+        self._stats.actions += 1
+        try:
+            status, _headers, body = await asyncio.wait_for(
+                connection.request("POST", path, self._params, body=b"{}"), _REQUEST_TIMEOUT_S
+            )
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, _ProtocolError) as exc:
+            self._stats.error(f"action {type(exc).__name__}")
+            return
+        finished = time.perf_counter()
+        if status != 200:
+            self._stats.error(f"action HTTP {status}")
+            return
+        self._stats.action_ms.append((finished - started) * 1000)
+        try:
+            item = json.loads(body)
+        except json.JSONDecodeError:
+            return
+        self._propagation.latest[state.id] = (_signature(item), finished)
+
+
+async def run_load(
+    base_url: str,
+    channel_code: str,
+    *,
+    transport: str = "poll",
+    clients: int = 10,
+    duration_s: float = 10.0,
+    action_interval_s: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """가상 클라이언트 ``clients`` 개를 ``duration_s`` 초 동안 실행하고 요약을 반환한다.
+
+    시작 시각은 폴링 주기 안에 고르게 흩어 모든 클라이언트가 동시에 요청하지 않게 한다.
+    """
+
+    if transport not in TRANSPORTS:
+        raise ValueError(f"알 수 없는 전송 방식: {transport}")
+    stats = LoadStats()
+    propagation = _Propagation()
+    stop = asyncio.Event()
+    simulated = [
+        SimulatedClient(
+            index,
+            base_url,
+            channel_code,
+            transport,
+            stats,
+            propagation,
+            action_interval_s=action_interval_s,
+            seed=seed,
+        )
+        for index in range(clients)
+    ]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(client.run(stop, POLL_INTERVAL_S * index / max(1, clients)))
+        for index, client in enumerate(simulated)
+    ]
+    await asyncio.sleep(duration_s)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats.summary(transport, clients, time.perf_counter() - started)
+
+
+def _format_row(result: Dict[str, Any]) -> str:
+    def triple(key: str) -> str:
+        dist = result[key]
+        return f"{dist['p50']:.0f}/{dist['p95']:.0f}/{dist['p99']:.0f}"
+
+    return (
+        f"{result['transport']:<12}{result['clients']:>8}{result['requests_per_s']:>9.1f}"
+        f"{result['payloads_per_s']:>10.1f}{result['error_rate'] * 100:>7.2f}%"
+        f"{triple('poll_ms'):>16}{triple('action_ms'):>16}{triple('staleness_ms'):>18}{result['not_modified']:>7}"
+    )
+
+
+def print_report(results: Sequence[Dict[str, Any]]) -> None:
+    print(
+        f"{'transport':<12}{'clients':>8}{'req/s':>9}{'payload/s':>10}{'errors':>8}"
+        f"{'poll p50/95/99':>16}{'act p50/95/99':>16}{'stale p50/95/99':>18}{'304':>7}"
+    )
+    for result in results:
+        print(_format_row(result))
+        if result["errors"]:
+            print(f"{'':<12}오류: {result['errors']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m timer_overlay.loadgen", description="다중 클라이언트 부하 생성기")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--server", help="대상 서버 URL")
+    target.add_argument("--standin", action="store_true", help="같은 프로세스에 대역 서버를 띄워 사용 (측정 오차 있음)")
+    parser.add_argument("--channel", default="ca01")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="전송 방식별 실행 시간(초)")
+    parser.add_argument("--transports", default="poll", help=f"쉼표로 구분 ({', '.join(TRANSPORTS)})")
+    parser.add_argument("--action-interval", type=float, default=0.0, help="클라이언트별 평균 단축키 간격(초), 0 이면 없음")
+    parser.add_argument("--timers", type=int, default=12, help="대역 서버의 타이머 수")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="대역 서버 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="대역 서버 지연 흔들림")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 서버 오류 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s %(name)s: %(message)s")
+    transports = [item.strip() for item in args.transports.split(",") if item.strip()]
+    unknown = [item for item in transports if item not in TRANSPORTS]
+    if unknown:
+        raise SystemExit(f"알 수 없는 전송 방식: {', '.join(unknown)}")
+
+    server = None
+    base_url = args.server
+    if args.standin:
+        from timer_overlay.standin_server import FaultProfile, StandinServer, StandinState
+
+        state = StandinState()
+        state.add_channel(args.channel, args.timers)
+        faults = FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate)
+        server = StandinServer(port=0, state=state, faults=faults, seed=args.seed)
+        server.start()
+        base_url = server.url
+
+    results = []
+    try:
+        for transport in transports:
+            logger.info("부하 실행: %s, 클라이언트 %d개, %.0f초", transport, args.clients, args.duration)
+            results.append(
+                asyncio.run(
+                    run_load(
+                        base_url,
+                        args.channel,
+                        transport=transport,
+                        clients=args.clients,
+                        duration_s=args.duration,
+                        action_interval_s=args.action_interval,
+                        seed=args.seed,
+                    )
+                )
+            )
+    finally:
+        if server is not None:
+            server.stop()
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"server": base_url, "channel": args.channel, "results": results}, handle, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,10 +2,12 @@
 import logging
 import sys
 
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 
 from timer_overlay.app import TimerOverlayApp
 from timer_overlay.config import ConfigStore
+from timer_overlay.profiling import SessionProfiler
 
 
 def main():
@@ -20,6 +22,14 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("타이머 오버레이")
     
+    # 프로파일링 (TIMER_OVERLAY_PROFILE_DIR 지정 시, 스레드가 뜨기 전에 시작)
+    profiler = SessionProfiler.from_env()
+    if profiler is not None:
+        profiler.start()
+        app.aboutToQuit.connect(profiler.stop)
+        if profiler.duration_s:
+            QTimer.singleShot(int(profiler.duration_s * 1000), profiler.stop)
+    
     # 설정 로드
     config_store = ConfigStore()
     
@@ -2,13 +2,15 @@
 from __future__ import annotations
 
 import logging
-import time
-from typing import Dict
+import queue
+import threading
+from typing import Any, Dict
 
-import requests
-from PyQt5.QtCore import QEvent, QTimer, Qt, QRect
+import numpy as np
+from PyQt5.QtCore import QEvent, QTimer, Qt, QRect, pyqtSignal
 from PyQt5.QtGui import QColor, QGuiApplication, QImage, QKeySequence
 from PyQt5.QtWidgets import (
+    QCheckBox,
     QDialog,
     QDialogButtonBox,
     QFormLayout,
@@ -28,14 +30,42 @@ from PyQt5.QtWidgets import (
     QHeaderView,
 )
 
+from timer_overlay import metrics
+from timer_overlay.clock import get_clock
 from timer_overlay.config import AppConfig, ConfigStore
+from timer_overlay import healthbar
+from timer_overlay.endpoints import EndpointSelector
+from timer_overlay.hotkey_index import (
+    HotkeyIndex,
+    format_binding,
+    normalize_binding,
+    normalize_key_name,
+)
 from timer_overlay.key_listener import GlobalKeyListener
-from timer_overlay.network import RemoteTimerState, ServerSettings, TimerService
-from timer_overlay.healthbar_overlay import HealthbarOverlayWidget
+from timer_overlay.network import (
+    HandshakeResult,
+    RemoteTimerState,
+    ServerHandshake,
+    ServerSettings,
+    TimerService,
+    ToggleDispatcher,
+    estimate_server_clock_offset,
+)
+from timer_overlay.healthbar_history import HealthEstimate
+from timer_overlay.healthbar_overlay import HealthbarOverlayWidget, RegionSelectWidget
+from timer_overlay.healthbar_pipeline import HealthbarPipeline
+from timer_overlay.metrics_panel import MetricsDialog
 from timer_overlay.overlay_widget import TimerOverlayWidget
+from timer_overlay.recorder import PayloadRecorder
+from timer_overlay.snapshot_cache import SnapshotCache
+from timer_overlay.tracing import export_from_env, get_tracer
+from timer_overlay.watchdog import EventLoopWatchdog
 
 logger = logging.getLogger(__name__)
 
+# 단축키 액션 작업 스레드 종료 신호
+_STOP = object()
+
 
 class ServerSettingsDialog(QDialog):
     """서버 연결 정보를 입력하는 다이얼로그."""
@@ -52,11 +82,18 @@ class ServerSettingsDialog(QDialog):
         self.port_spin.setRange(1, 65535)
         self.port_spin.setValue(config.server_port)
 
+        self.endpoints_edit = QLineEdit(", ".join(config.server_endpoints))
+        self.endpoints_edit.setPlaceholderText("예: http://192.168.0.10:47984")
+        self.hedge_check = QCheckBox("느린 응답은 다른 서버에도 동시에 요청")
+        self.hedge_check.setChecked(config.hedge_requests)
+
         form = QFormLayout()
         form.addRow("서버 URL (Vercel)", self.url_edit)
-        form.addRow(QLabel("--- 또는 ---"))
+        form.addRow(QLabel("--- 및 ---"))
         form.addRow("호스트", self.host_edit)
         form.addRow("포트", self.port_spin)
+        form.addRow("추가 서버 (쉼표 구분)", self.endpoints_edit)
+        form.addRow(self.hedge_check)
 
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.accepted.connect(self.accept)
@@ -73,6 +110,10 @@ class ServerSettingsDialog(QDialog):
         config.server_url = self.url_edit.text().strip()
         config.server_host = self.host_edit.text().strip() or "218.234.230.188"
         config.server_port = self.port_spin.value()
+        config.server_endpoints = [
+            value.strip() for value in self.endpoints_edit.text().split(",") if value.strip()
+        ]
+        config.hedge_requests = self.hedge_check.isChecked()
         return True
 
 
@@ -111,18 +152,27 @@ class ChannelCodeDialog(QDialog):
 
 
 class HotkeyCaptureDialog(QDialog):
-    """사용자로부터 단일 키 입력을 받기 위한 다이얼로그."""
+    """사용자로부터 단축키(조합키/연속키 포함) 입력을 받기 위한 다이얼로그."""
+
+    MAX_STEPS = 3
+    SEQUENCE_WAIT_MS = 700
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self.setWindowTitle("단축키 설정")
-        self._label = QLabel("설정할 키를 입력하세요")
+        self._label = QLabel("설정할 키를 입력하세요\n(Ctrl/Alt 조합, 연속 입력 가능)")
         self._label.setAlignment(Qt.AlignCenter)
         layout = QVBoxLayout()
         layout.addWidget(self._label)
         self.setLayout(layout)
         self.setModal(True)
         self._captured: str | None = None
+        self._steps: list[str] = []
+        # 마지막 키 입력 후 잠시 기다렸다가 연속키 입력을 마무리한다.
+        self._finish_timer = QTimer(self)
+        self._finish_timer.setSingleShot(True)
+        self._finish_timer.setInterval(self.SEQUENCE_WAIT_MS)
+        self._finish_timer.timeout.connect(self._finish_capture)
 
     @property
     def captured_key(self) -> str | None:
@@ -131,6 +181,7 @@ class HotkeyCaptureDialog(QDialog):
     def keyPressEvent(self, event):  # type: ignore[override]
         key = event.key()
         if key in (Qt.Key_Escape, Qt.Key_Cancel):
+            self._finish_timer.stop()
             self.reject()
             return
         if key in (
@@ -143,32 +194,56 @@ class HotkeyCaptureDialog(QDialog):
             Qt.Key_Super_R,
         ):
             return
-        modifiers = event.modifiers() & (
-            Qt.ControlModifier | Qt.MetaModifier | Qt.AltModifier
-        )
-        if modifiers:
-            return
         sequence = QKeySequence(key).toString()
         if not sequence:
             return
-        normalized = sequence.strip().lower()
+        key_name = normalize_key_name(sequence)
+        if not key_name:
+            return
+        modifiers = event.modifiers()
+        parts = []
+        if modifiers & Qt.ControlModifier:
+            parts.append("ctrl")
+        if modifiers & Qt.AltModifier:
+            parts.append("alt")
+        if modifiers & Qt.MetaModifier:
+            parts.append("meta")
+        self._steps.append("+".join(parts + [key_name]))
+        self._label.setText(format_binding(", ".join(self._steps)) or "")
+        if len(self._steps) >= self.MAX_STEPS:
+            self._finish_capture()
+            return
+        self._finish_timer.start()
+
+    def _finish_capture(self) -> None:
+        self._finish_timer.stop()
+        normalized = normalize_binding(", ".join(self._steps))
         if not normalized:
+            self._steps = []
+            self._label.setText("사용할 수 없는 키입니다. 다시 입력하세요.")
             return
         self._captured = normalized
         self.accept()
 
+
 class MainWindow(QMainWindow):
     """타이머 오버레이 메인 윈도우."""
 
-    def __init__(self, store: ConfigStore):
+    # 단축키 액션 작업 스레드 -> GUI 스레드 (실패한 액션 이름)
+    _hotkey_action_failed = pyqtSignal(str)
+
+    def __init__(self, store: ConfigStore, *, watchdog: bool = True):
         super().__init__()
         self.setWindowTitle("혼테일 타이머 오버레이")
         self.resize(640, 420)
 
         self.store = store
         self.config = store.load()
+        self.snapshot_cache = SnapshotCache.beside(store.path)
         self._server_clock_offset_ms = 0
         self._connected = False
+        self._showing_stale = False
+        self._displayed_channel: str | None = None
 
         self.status_label = QLabel("서버에 연결되지 않았습니다.")
         self.status_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
@@ -206,10 +281,38 @@ class MainWindow(QMainWindow):
         self.healthbar_button = QPushButton("체력바")
         self.healthbar_button.setEnabled(False)
         self.healthbar_button.clicked.connect(self._handle_healthbar_clicked)
-        self._healthbar_overlay: HealthbarOverlayWidget | None = None
-        self._healthbar_timer: QTimer | None = None
-        self._healthbar_region: QRect | None = None
+        self._healthbar_overlays: list[HealthbarOverlayWidget] = []
+        self._healthbar_pipeline = HealthbarPipeline(parent=self, locator=self._locate_healthbars)
+        self._healthbar_pipeline.reading.connect(self._handle_healthbar_reading)
+        self._healthbar_pipeline.lost.connect(self._handle_healthbar_lost)
+        self._healthbar_pipeline.reacquired.connect(self._handle_healthbar_reacquired)
+        self._healthbar_pipeline.acquire_failed.connect(self._handle_healthbar_acquire_failed)
+        self._healthbar_pipeline.estimate.connect(self._handle_healthbar_estimate)
+        self._healthbar_tracker: healthbar.MultiBarTracker | None = None
         self._healthbar_device_ratio: float = 1.0
+        self._healthbar_regions_key: str | None = None
+        self._healthbar_regions_dirty = False
+        self._healthbar_colors_path = healthbar.ColorTable.path_beside(store.path)
+        self._healthbar_colors = healthbar.ColorTable.load(self._healthbar_colors_path)
+        self._region_selector: RegionSelectWidget | None = None
+
+        self.metrics_button = QPushButton("측정값")
+        self.metrics_button.clicked.connect(self._show_metrics)
+        self._metrics_server = metrics.MetricsServer.from_env()
+        self._metrics_dialog: MetricsDialog | None = None
+        # 오프라인 재생/벤치마크 창은 표본 스레드가 측정을 흐리지 않도록 끈다.
+        self._watchdog = EventLoopWatchdog.from_env(parent=self) if watchdog else None
+        if self._watchdog is not None:
+            self._watchdog.start()
+
+        self.healthbar_color_button = QPushButton("체력바 색상")
+        healthbar_color_menu = QMenu(self.healthbar_color_button)
+        healthbar_color_menu.addAction("영역을 선택해 보정", self._begin_healthbar_calibration)
+        self._reset_colors_action = healthbar_color_menu.addAction(
+            "기본 색상으로 되돌리기", self._reset_healthbar_colors
+        )
+        self._reset_colors_action.setEnabled(self._healthbar_colors is not None)
+        self.healthbar_color_button.setMenu(healthbar_color_menu)
 
         header_layout = QHBoxLayout()
         header_layout.addWidget(self.status_label)
@@ -221,6 +324,8 @@ class MainWindow(QMainWindow):
         header_layout.addWidget(self.scale_slider)
         header_layout.addStretch(1)
         header_layout.addWidget(self.healthbar_button)
+        header_layout.addWidget(self.healthbar_color_button)
+        header_layout.addWidget(self.metrics_button)
         header_layout.addWidget(self.disconnect_button)
 
         self.table = QTableWidget(0, 4)
@@ -246,19 +351,36 @@ class MainWindow(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
-        settings = ServerSettings(host=self.config.server_host, port=self.config.server_port, url=self.config.server_url)
+        settings = self._server_settings()
         self.timer_service = TimerService(settings)
+        self._payload_recorder = PayloadRecorder.from_env(source="main_window")
+        self.timer_service.set_recorder(self._payload_recorder)
         self.timer_service.timers_updated.connect(self._handle_timers_payload)
         self.timer_service.connection_state_changed.connect(self._handle_connection_state)
 
+        self._handshake = ServerHandshake(self)
+        self._handshake.finished.connect(self._handle_handshake_finished)
+        self._handshake_initial = False
+        self._handshake_retry = False
+        self._handshake_prompted = False
+
         self.overlays: Dict[str, TimerOverlayWidget] = {}
         self.timer_states: Dict[str, RemoteTimerState] = {}
         self._table_order: list[str] = []
         self._row_index: Dict[str, int] = {}
-        self._hotkey_cooldowns: Dict[str, float] = {}
+        self._toggle_dispatcher = ToggleDispatcher(self.timer_service)
+        # 단축키 액션(서버 요청)은 GUI 스레드를 막지 않도록 작업 스레드 하나에서 차례로 보낸다.
+        self._hotkey_actions: queue.SimpleQueue = queue.SimpleQueue()
+        self._hotkey_action_failed.connect(self._handle_hotkey_action_failed)
+        self._hotkey_worker = threading.Thread(
+            target=self._drain_hotkey_actions, name="HotkeyActions", daemon=True
+        )
+        self._hotkey_worker.start()
 
         self.key_listener = GlobalKeyListener()
-        self.key_listener.key_detected.connect(self._handle_key_detected)
+        self.key_listener.hotkey_triggered.connect(self._handle_hotkey_triggered)
+        self._hotkey_index = HotkeyIndex.build({})
+        self._rebuild_hotkey_index()
         self.key_listener.start()
 
         self._table_update_timer = QTimer(self)
@@ -277,54 +399,133 @@ class MainWindow(QMainWindow):
         self.store.save(self.config)
         self._apply_server_settings(initial=False, force_prompt=False)
 
+    def _show_metrics(self) -> None:
+        if self._metrics_dialog is None:
+            self._metrics_dialog = MetricsDialog(self, server=self._metrics_server)
+        self._metrics_dialog.show()
+        self._metrics_dialog.raise_()
+
     def _initialize_connection(self) -> None:
+        self._restore_snapshot(getattr(self.config, "channel_code", "").strip())
         self._apply_server_settings(initial=True, force_prompt=False)
 
-    def _apply_server_settings(self, *, initial: bool, force_prompt: bool) -> None:
-        settings = ServerSettings(host=self.config.server_host, port=self.config.server_port, url=self.config.server_url)
-        target_settings = settings if self._test_connection(settings) else self._handle_connection_failure(initial)
-        if target_settings is None:
+    def _restore_snapshot(self, channel_code: str) -> None:
+        """디스크에 남은 마지막 상태를 오프라인 표시로 먼저 그린다."""
+
+        snapshot = self.snapshot_cache.load(channel_code)
+        if snapshot is None:
             return
+        self._server_clock_offset_ms = snapshot.server_clock_offset_ms
+        if not self._apply_timer_items(snapshot.timers):
+            return
+        self._showing_stale = True
+        self._displayed_channel = channel_code
+        logger.info(
+            "저장된 타이머 스냅샷 표시: %s (%d개, %.0f초 전)",
+            channel_code,
+            len(snapshot.timers),
+            snapshot.age_seconds,
+        )
 
+    def _server_settings(self) -> ServerSettings:
+        return ServerSettings(
+            host=self.config.server_host,
+            port=self.config.server_port,
+            url=self.config.server_url,
+            endpoints=tuple(self.config.server_endpoints),
+            hedge=self.config.hedge_requests,
+        )
+
+    def _apply_server_settings(self, *, initial: bool, force_prompt: bool) -> None:
+        settings = self._server_settings()
         stored_code = "" if force_prompt else getattr(self.config, "channel_code", "").strip()
-        if stored_code:
-            if self._verify_channel_code(target_settings, stored_code):
-                self._connect_to_channel(target_settings, stored_code)
+        self._begin_handshake(settings, stored_code, initial=initial)
+
+    def _begin_handshake(
+        self,
+        settings: ServerSettings,
+        channel_code: str,
+        *,
+        initial: bool,
+        retry: bool = False,
+        prompted: bool = False,
+    ) -> None:
+        self._handshake_initial = initial
+        self._handshake_retry = retry
+        self._handshake_prompted = prompted
+        if self._showing_stale:
+            self.status_label.setText("저장된 타이머 정보를 표시 중입니다. 서버에 연결하는 중...")
+        else:
+            self.status_label.setText("서버에 연결하는 중입니다...")
+        self.status_label.setStyleSheet("color: #ff9800;")
+        self._handshake.start(settings, channel_code)
+
+    def _handle_handshake_finished(self, result: HandshakeResult) -> None:
+        initial = self._handshake_initial
+        if not result.healthy:
+            # 모든 엔드포인트(localhost 포함)가 응답하지 않은 경우에만 사용자에게 묻는다.
+            if self._handshake_retry:
+                QMessageBox.critical(
+                    self,
+                    "서버",
+                    "어떤 서버에도 연결하지 못했습니다. 프로그램을 종료합니다.",
+                )
+                self.close()
                 return
-            QMessageBox.warning(
-                self,
-                "채널",
-                "이전에 저장된 채널 코드가 더 이상 유효하지 않습니다. 다시 입력해주세요.",
-            )
-            self.config.channel_code = ""
-            self.store.save(self.config)
+            if self._confirm_connection_failure(initial):
+                self._begin_handshake(
+                    result.settings,
+                    result.channel_code,
+                    initial=initial,
+                    retry=True,
+                    prompted=self._handshake_prompted,
+                )
+            return
 
-        channel_code = self._prompt_valid_channel_code(target_settings, initial=initial)
+        if result.channel_code:
+            if result.channel_valid:
+                self._connect_to_channel(
+                    result.settings, result.channel_code, result.payload, result.selector
+                )
+                return
+            if self._handshake_prompted:
+                QMessageBox.warning(
+                    self,
+                    "채널",
+                    "유효한 채널 코드를 확인하지 못했습니다. 다시 입력해주세요.",
+                )
+            else:
+                QMessageBox.warning(
+                    self,
+                    "채널",
+                    "이전에 저장된 채널 코드가 더 이상 유효하지 않습니다. 다시 입력해주세요.",
+                )
+                self.config.channel_code = ""
+                self.store.save(self.config)
+                self._reset_timer_views(remove_positions=False)
+
+        channel_code = self._prompt_channel_code()
         if not channel_code:
+            if initial:
+                self.close()
             return
-
-        self._connect_to_channel(target_settings, channel_code)
-
-    def _prompt_valid_channel_code(self, settings: ServerSettings, *, initial: bool) -> str | None:
-        while True:
-            channel_code = self._prompt_channel_code()
-            if not channel_code:
-                if initial:
-                    self.close()
-                return None
-            if self._verify_channel_code(settings, channel_code):
-                return channel_code
-            QMessageBox.warning(
-                self,
-                "채널",
-                "유효한 채널 코드를 확인하지 못했습니다. 다시 입력해주세요.",
-            )
-
-    def _connect_to_channel(self, settings: ServerSettings, channel_code: str) -> None:
+        self._begin_handshake(result.settings, channel_code, initial=initial, prompted=True)
+
+    def _connect_to_channel(
+        self,
+        settings: ServerSettings,
+        channel_code: str,
+        initial_payload: Dict[str, Any] | None = None,
+        selector: EndpointSelector | None = None,
+    ) -> None:
         self.config.channel_code = channel_code
         self.store.save(self.config)
-        self._reset_timer_views(remove_positions=False)
-        self._start_service(settings, channel_code)
+        if channel_code != self._displayed_channel:
+            self._reset_timer_views(remove_positions=False)
+        if initial_payload is not None:
+            # 채널 검증 응답을 첫 스냅샷으로 바로 그린다.
+            self.timer_service.prime(initial_payload)
+        self._start_service(settings, channel_code, selector)
         self.disconnect_button.setEnabled(True)
 
     def _disconnect_channel(self) -> None:
@@ -341,22 +542,12 @@ class MainWindow(QMainWindow):
         self._apply_server_settings(initial=False, force_prompt=True)
 
     def _handle_healthbar_clicked(self) -> None:
-        if self._healthbar_timer and self._healthbar_timer.isActive():
+        if self._healthbar_pipeline.running:
             self._stop_healthbar_tracking()
             return
         self._start_healthbar_tracking()
 
-    def _test_connection(self, settings: ServerSettings) -> bool:
-        url = f"{settings.base_url}/api/health"
-        try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            return True
-        except requests.RequestException as exc:
-            logger.warning("서버 연결 사전 점검 실패: %s", exc)
-            return False
-
-    def _handle_connection_failure(self, initial: bool) -> ServerSettings | None:
+    def _confirm_connection_failure(self, initial: bool) -> bool:
         message_box = QMessageBox(self)
         message_box.setIcon(QMessageBox.Warning)
         message_box.setWindowTitle("서버 연결 실패")
@@ -368,45 +559,20 @@ class MainWindow(QMainWindow):
         if message_box.clickedButton() is not retry_button:
             if initial:
                 self.close()
-            return None
-
-        fallback = ServerSettings(host="localhost", port=47984)
-        if self._test_connection(fallback):
-            self.config.server_host = fallback.host
-            self.config.server_port = fallback.port
-            self.store.save(self.config)
-            return fallback
-
-        QMessageBox.critical(
-            self,
-            "서버",
-            "localhost:47984 서버에 연결하지 못했습니다. 프로그램을 종료합니다.",
-        )
-        self.close()
-        return None
+            return False
+        return True
 
     def _prompt_channel_code(self) -> str | None:
         dialog = ChannelCodeDialog(self, getattr(self.config, "channel_code", ""))
         return dialog.prompt()
 
-    def _verify_channel_code(self, settings: ServerSettings, channel_code: str) -> bool:
-        url = f"{settings.base_url}/api/timers"
-        try:
-            response = requests.get(url, params={"channelCode": channel_code}, timeout=5)
-            response.raise_for_status()
-            return True
-        except requests.HTTPError as exc:
-            status = exc.response.status_code if exc.response is not None else None
-            if status == 404:
-                return False
-            logger.warning("채널 검증 실패: %s", exc)
-            return False
-        except requests.RequestException as exc:
-            logger.warning("채널 검증 실패: %s", exc)
-            return False
-
-    def _start_service(self, settings: ServerSettings, channel_code: str) -> None:
-        self.timer_service.update_settings(settings)
+    def _start_service(
+        self,
+        settings: ServerSettings,
+        channel_code: str,
+        selector: EndpointSelector | None = None,
+    ) -> None:
+        self.timer_service.update_settings(settings, selector)
         self.timer_service.update_channel_code(channel_code)
         if not self.timer_service.is_running:
             self.timer_service.start()
@@ -418,15 +584,27 @@ class MainWindow(QMainWindow):
         self._table_order = []
         self._row_index = {}
         self.table.setRowCount(0)
+        self._showing_stale = False
+        self._displayed_channel = None
 
     # 타이머 데이터 처리 ----------------------------------------------------
+    @metrics.GUI_APPLY.timed
     def _handle_timers_payload(self, payload: Dict) -> None:
         timers_data = payload.get("timers")
         if not isinstance(timers_data, list):
             logger.debug("타이머 데이터 형식이 올바르지 않습니다: %s", payload)
             return
 
+        get_tracer().payload_applied()
+        self._showing_stale = False
         self._update_server_clock_offset(timers_data)
+        if not self._apply_timer_items(timers_data):
+            return
+        channel_code = getattr(self.config, "channel_code", "")
+        self._displayed_channel = channel_code
+        self.snapshot_cache.save(channel_code, timers_data, self._server_clock_offset_ms)
+
+    def _apply_timer_items(self, timers_data: list[Dict]) -> bool:
         updated_states: Dict[str, RemoteTimerState] = {}
         for item in timers_data:
             try:
@@ -440,12 +618,13 @@ class MainWindow(QMainWindow):
         # 빈 응답이고 기존 타이머가 있으면 상태 유지 (서버 일시 장애 대응)
         if len(updated_states) == 0 and len(self.timer_states) > 0:
             logger.debug("빈 타이머 응답 무시 (기존 %d개 타이머 유지)", len(self.timer_states))
-            return
+            return False
 
         self.timer_states = updated_states
         self._update_visible_overlays()
         self._cleanup_missing_timers(updated_states)
         self._refresh_table()
+        return True
 
     def _update_visible_overlays(self) -> None:
         for timer_id, overlay in list(self.overlays.items()):
@@ -454,6 +633,7 @@ class MainWindow(QMainWindow):
                 self._hide_overlay(timer_id, remove_position=True)
                 continue
             overlay.update_state(state)
+            get_tracer().shown(timer_id)
             overlay.set_overlay_opacity(self.config.overlay_opacity)
             overlay.set_hotkey(self._format_hotkey(self.config.timer_hotkeys.get(timer_id)))
             overlay.set_scale(getattr(self.config, "overlay_scale", 1))
@@ -471,12 +651,13 @@ class MainWindow(QMainWindow):
                 changed = True
         if changed:
             self.store.save(self.config)
+            self._rebuild_hotkey_index()
 
     def _refresh_table(self) -> None:
         states = sorted(self.timer_states.values(), key=lambda item: item.sort_index)
         self._table_order = [state.id for state in states]
         self.table.setRowCount(len(states))
-        now = time.monotonic()
+        now = get_clock().monotonic()
         self._row_index = {}
         for row, state in enumerate(states):
             name_item = QTableWidgetItem(state.name)
@@ -501,10 +682,13 @@ class MainWindow(QMainWindow):
             self._row_index[state.id] = row
             self._apply_row_style(row, state.id)
 
+    @metrics.UI_TICK.timed
     def _update_table_remaining(self) -> None:
         if not self._table_order:
             return
-        now = time.monotonic()
+        now = get_clock().monotonic()
+        for overlay in self.overlays.values():
+            overlay.refresh(now)
         for row, timer_id in enumerate(self._table_order):
             state = self.timer_states.get(timer_id)
             if state is None:
@@ -523,20 +707,10 @@ class MainWindow(QMainWindow):
             self._apply_row_style(row, timer_id)
 
     def _normalize_hotkey(self, raw: str | None) -> str | None:
-        if not raw:
-            return None
-        normalized = raw.strip().lower()
-        return normalized or None
+        return normalize_binding(raw)
 
     def _format_hotkey(self, raw: str | None) -> str | None:
-        normalized = self._normalize_hotkey(raw)
-        if normalized is None:
-            return None
-        if len(normalized) == 1:
-            return normalized.upper()
-        if normalized.startswith("f") and normalized[1:].isdigit():
-            return normalized.upper()
-        return normalized.replace("_", " ").title()
+        return format_binding(raw)
 
     def _display_hotkey_text(self, timer_id: str) -> str:
         display = self._format_hotkey(self.config.timer_hotkeys.get(timer_id))
@@ -566,20 +740,22 @@ class MainWindow(QMainWindow):
             normalized = self._normalize_hotkey(key)
             if normalized is None:
                 return
-            in_use = any(
-                other_id != timer_id
-                and self._normalize_hotkey(value) == normalized
-                for other_id, value in self.config.timer_hotkeys.items()
-            )
-            if in_use:
+            if self._hotkey_index.conflicts(normalized, exclude=timer_id):
                 QMessageBox.warning(self, "단축키", "이미 사용중인 단축키입니다")
                 continue
             self.config.timer_hotkeys[timer_id] = normalized
             self.store.save(self.config)
-            self._hotkey_cooldowns.pop(timer_id, None)
+            self._rebuild_hotkey_index()
+            self._toggle_dispatcher.forget(timer_id)
             self._update_hotkey_views(timer_id)
             break
 
+    def _rebuild_hotkey_index(self) -> None:
+        """단축키 설정이 바뀌었을 때만 색인을 다시 만들어 훅에 넘긴다."""
+
+        self._hotkey_index = HotkeyIndex.build(self.config.timer_hotkeys)
+        self.key_listener.set_index(self._hotkey_index)
+
     def _update_hotkey_views(self, timer_id: str) -> None:
         row = self._row_index.get(timer_id)
         display_text = self._display_hotkey_text(timer_id)
@@ -609,12 +785,8 @@ class MainWindow(QMainWindow):
             self._show_overlay(state)
 
     def _show_overlay(self, state: RemoteTimerState) -> None:
-        overlay = TimerOverlayWidget(
-            self.timer_service, state, scale=getattr(self.config, "overlay_scale", 1)
-        )
-        overlay.position_changed.connect(
-            lambda x, y, timer_id=state.id: self._on_overlay_moved(timer_id, x, y)
-        )
+        overlay = TimerOverlayWidget(state, scale=getattr(self.config, "overlay_scale", 1))
+        overlay.position_changed.connect(self._on_overlay_moved)
         position = self.config.timer_positions.get(state.id, (100, 100))
         overlay.update_position(*position)
         overlay.set_overlay_opacity(self.config.overlay_opacity)
@@ -644,32 +816,53 @@ class MainWindow(QMainWindow):
             self.store.save(self.config)
         self._update_row_background(timer_id)
 
-    def _handle_key_detected(self, key: str) -> None:
-        normalized = self._normalize_hotkey(key)
-        if normalized is None:
-            return
-        now = time.monotonic()
-        for timer_id, assigned in self.config.timer_hotkeys.items():
+    def _handle_hotkey_triggered(
+        self,
+        timer_ids: tuple[str, ...],
+        started_ns: int | None = None,
+        hook_thread: int | None = None,
+    ) -> None:
+        now = get_clock().monotonic()
+        tracer = get_tracer()
+        for timer_id in timer_ids:
+            tracer.begin(timer_id, "key_listener", started_ns, hook_thread)
+            tracer.mark(timer_id, "gui")
             if timer_id not in self.overlays:
-                continue
-            if self._normalize_hotkey(assigned) != normalized:
-                continue
-            last_triggered = self._hotkey_cooldowns.get(timer_id)
-            if last_triggered is not None and (now - last_triggered) < 0.75:
+                tracer.drop(timer_id, "오버레이 없음")
                 continue
             state = self.timer_states.get(timer_id)
             if state is None:
+                tracer.drop(timer_id, "상태 없음")
                 continue
-            if state.is_running:
-                success = self.timer_service.reset_timer(timer_id)
-                action = "리셋"
-            else:
-                success = self.timer_service.start_timer(timer_id)
-                action = "시작"
-            if not success:
-                QMessageBox.warning(self, "서버", f"타이머 {action} 요청에 실패했습니다.")
+            self._hotkey_actions.put_nowait((state, now))
+
+    def _drain_hotkey_actions(self) -> None:
+        """큐에 쌓인 단축키 액션을 순서대로 서버에 보낸다 (작업 스레드).
+
+        연속 입력 대기도 여기서 판단해야 앞선 요청이 끝나기 전에 들어온 반복 입력을 거른다.
+        """
+
+        while True:
+            item = self._hotkey_actions.get()
+            if item is _STOP:
+                break
+            state, now = item
+            tracer = get_tracer()
+            tracer.mark(state.id, "worker")
+            if self._toggle_dispatcher.cooling_down(state.id, now):
+                tracer.drop(state.id, "연속 입력 대기")
                 continue
-            self._hotkey_cooldowns[timer_id] = now
+            try:
+                action, success = self._toggle_dispatcher.dispatch(state, now)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("단축키 액션 처리 오류: %s", exc)
+                continue
+            if not success:
+                self._hotkey_action_failed.emit(action)
+
+    def _handle_hotkey_action_failed(self, action: str) -> None:
+        self.status_label.setText(f"타이머 {action} 요청에 실패했습니다.")
+        self.status_label.setStyleSheet("color: #ff5252;")
 
     # 상태 업데이트 --------------------------------------------------------
     def _handle_connection_state(self, connected: bool, message: str) -> None:
@@ -700,8 +893,17 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):  # type: ignore[override]
         self._capture_positions()
         self.store.save(self.config)
+        self._handshake.cancel()
         self.timer_service.stop()
+        if self._payload_recorder is not None:
+            self._payload_recorder.close()
+        if self._metrics_server is not None:
+            self._metrics_server.stop()
+        if self._watchdog is not None:
+            self._watchdog.stop()
+        export_from_env()
         self.key_listener.stop()
+        self._hotkey_actions.put(_STOP)
         self._table_update_timer.stop()
         self._stop_healthbar_tracking()
         for overlay in self.overlays.values():
@@ -726,192 +928,212 @@ class MainWindow(QMainWindow):
     def _apply_row_style(self, row: int, timer_id: str) -> None:
         is_overlay_visible = timer_id in self.overlays
         color = QColor("#ccffcc") if is_overlay_visible else QColor(Qt.white)
+        # 저장된 스냅샷을 표시하는 동안은 글자를 흐리게 한다.
+        foreground = QColor("#9e9e9e") if self._showing_stale else QColor(Qt.black)
         for column in range(self.table.columnCount()):
             item = self.table.item(row, column)
             if item is not None:
                 item.setBackground(color)
+                item.setForeground(foreground)
 
     def _stop_healthbar_tracking(self) -> None:
-        if self._healthbar_timer is not None:
-            self._healthbar_timer.stop()
-        if self._healthbar_overlay is not None:
-            self._healthbar_overlay.hide()
-        self._healthbar_region = None
+        self._healthbar_pipeline.stop()
+        for overlay in self._healthbar_overlays:
+            overlay.hide()
+        self._healthbar_tracker = None
         self.healthbar_button.setText("체력바")
+        self._save_healthbar_regions()
 
-    def _start_healthbar_tracking(self) -> None:
-        screen = QGuiApplication.primaryScreen()
-        if screen is None:
-            QMessageBox.warning(self, "체력바", "화면 정보를 가져올 수 없습니다.")
-            return
+    @staticmethod
+    def _healthbar_screen_key(screen) -> str:
+        ratio = screen.devicePixelRatio() or 1.0
+        size = screen.geometry().size()
+        return f"{screen.name()}@{int(size.width() * ratio)}x{int(size.height() * ratio)}"
+
+    def _remember_healthbar_regions(self, rects: list[healthbar.Rect]) -> None:
+        """바 위치를 설정에만 반영한다. 파일 저장은 추적을 멈출 때 한 번 한다."""
 
-        screenshot = screen.grabWindow(0)
-        self._healthbar_device_ratio = screenshot.devicePixelRatio() or 1.0
-        image = screenshot.toImage().convertToFormat(QImage.Format_RGBA8888)
-        bar_rect = self._locate_healthbar(image)
-        if bar_rect is None:
-            QMessageBox.warning(self, "체력바", "체력바 영역을 찾지 못했습니다.")
+        key = self._healthbar_regions_key
+        if key is None or self.config.healthbar_regions.get(key) == rects:
             return
+        self.config.healthbar_regions[key] = list(rects)
+        self._healthbar_regions_dirty = True
 
-        percent = self._calculate_healthbar_percent(image, bar_rect)
-        if percent is None:
-            QMessageBox.warning(self, "체력바", "체력 정보를 계산하지 못했습니다.")
+    def _save_healthbar_regions(self) -> None:
+        if not self._healthbar_regions_dirty:
             return
+        self._healthbar_regions_dirty = False
+        self.store.save(self.config)
 
-        logical_rect = QRect(
-            int(bar_rect.x() / self._healthbar_device_ratio),
-            int(bar_rect.y() / self._healthbar_device_ratio),
-            int(bar_rect.width() / self._healthbar_device_ratio),
-            int(bar_rect.height() / self._healthbar_device_ratio),
-        )
+    def _logical_healthbar_rect(self, rect: healthbar.Rect) -> QRect:
+        ratio = self._healthbar_device_ratio or 1.0
+        x, y, width, height = rect
+        return QRect(int(x / ratio), int(y / ratio), int(width / ratio), int(height / ratio))
 
-        if logical_rect.width() <= 0 or logical_rect.height() <= 0:
-            QMessageBox.warning(self, "체력바", "체력바 크기가 올바르지 않습니다.")
-            return
+    def _ensure_healthbar_overlays(self, count: int) -> None:
+        while len(self._healthbar_overlays) < count:
+            self._healthbar_overlays.append(HealthbarOverlayWidget())
+        for overlay in self._healthbar_overlays[count:]:
+            overlay.hide()
 
-        if self._healthbar_overlay is None:
-            self._healthbar_overlay = HealthbarOverlayWidget()
-        self._healthbar_overlay.update_overlay(logical_rect, percent)
+    def _start_healthbar_tracking(self) -> None:
+        """체력바 추적을 시작한다.
 
-        self._healthbar_region = logical_rect
-        if self._healthbar_timer is None:
-            self._healthbar_timer = QTimer(self)
-            self._healthbar_timer.timeout.connect(self._refresh_healthbar_reading)
-        self._healthbar_timer.setInterval(500)
-        self._healthbar_timer.start()
-        self.healthbar_button.setText("체력바 중지")
+        저장된 위치가 있으면 그 위치부터 추적하고(바가 없으면 파이프라인이 다시 찾는다),
+        없으면 전체 화면 탐색까지 파이프라인 작업 스레드에 맡긴다. GUI 스레드에서는
+        화면을 캡처하거나 분석하지 않는다.
+        """
 
-    def _refresh_healthbar_reading(self) -> None:
-        if self._healthbar_region is None:
-            return
         screen = QGuiApplication.primaryScreen()
         if screen is None:
-            self._stop_healthbar_tracking()
+            QMessageBox.warning(self, "체력바", "화면 정보를 가져올 수 없습니다.")
             return
 
-        ratio = self._healthbar_device_ratio or screen.devicePixelRatio() or 1.0
-        region = self._healthbar_region
-        capture = screen.grabWindow(
-            0,
-            int(region.x() * ratio),
-            int(region.y() * ratio),
-            int(region.width() * ratio),
-            int(region.height() * ratio),
-        )
-        image = capture.toImage().convertToFormat(QImage.Format_RGBA8888)
-        percent = self._calculate_healthbar_percent(
-            image, QRect(0, 0, image.width(), image.height())
+        ratio = screen.devicePixelRatio() or 1.0
+        size = screen.geometry().size()
+        screen_size = (int(size.width() * ratio), int(size.height() * ratio))
+        self._healthbar_device_ratio = ratio
+        self._healthbar_regions_key = self._healthbar_screen_key(screen)
+        saved = self.config.healthbar_regions.get(self._healthbar_regions_key)
+        tracker = healthbar.MultiBarTracker(
+            list(saved or []), screen_size, colors=self._healthbar_colors
         )
-        if percent is None:
-            return
-        if self._healthbar_overlay is not None:
-            self._healthbar_overlay.update_overlay(region, percent)
 
-    def _locate_healthbar(self, image: QImage) -> QRect | None:
-        width = image.width()
-        height = image.height()
-        if width == 0 or height == 0:
-            return None
+        self._ensure_healthbar_overlays(len(tracker))
+        self._healthbar_tracker = tracker
+        self._healthbar_pipeline.start(tracker, acquire=not saved)
+        self.healthbar_button.setText("체력바 중지")
 
-        min_run = max(160, width // 12)
-        search_height = int(height * 0.6)
-        stride_y = max(1, height // 400)
-        best_run = (0, 0, 0)  # length, start_x, y
-
-        for y in range(max(0, height // 20), search_height, stride_y):
-            run_start = None
-            run_length = 0
-            for x in range(0, width, 2):
-                if self._is_bar_pixel(image, x, y):
-                    if run_start is None:
-                        run_start = x
-                        run_length = 2
-                    else:
-                        run_length += 2
-                else:
-                    if run_start is not None and run_length > best_run[0]:
-                        best_run = (run_length, run_start, y)
-                    run_start = None
-                    run_length = 0
-            if run_start is not None and run_length > best_run[0]:
-                best_run = (run_length, run_start, y)
-
-        if best_run[0] < min_run:
-            return None
+    def _handle_healthbar_reading(self, results: list[healthbar.TrackResult]) -> None:
+        """파이프라인 분석 결과를 바별 오버레이에 반영한다 (GUI 스레드)."""
 
-        _, start_x, base_y = best_run
-        end_x = min(width - 1, start_x + best_run[0])
+        tracker = self._healthbar_tracker
+        if tracker is None:
+            return
 
-        def row_ratio(target_y: int) -> float:
-            bar_pixels = 0
-            for x in range(start_x, end_x):
-                if self._is_bar_pixel(image, x, target_y):
-                    bar_pixels += 1
-            return bar_pixels / max(1, end_x - start_x)
+        if any(result.moved for result in results):
+            self._remember_healthbar_regions(tracker.rects)
+        # 숫자는 estimate 시그널로 갱신되므로 여기서는 위치가 바뀔 때만 다시 배치한다.
+        for overlay, result in zip(self._healthbar_overlays, results):
+            if result.percent is None:
+                continue
+            if result.moved or not overlay.isVisible():
+                rect = self._logical_healthbar_rect(result.rect)
+                if not rect.isEmpty():
+                    overlay.update_overlay(rect, result.percent)
 
-        top = base_y
-        while top > 0 and row_ratio(top - 1) > 0.55:
-            top -= 1
+    def _handle_healthbar_lost(self) -> None:
+        """바를 놓쳤다. 파이프라인이 다시 찾는 동안 오버레이를 숨긴다."""
 
-        bottom = base_y
-        while bottom + 1 < height and row_ratio(bottom + 1) > 0.55:
-            bottom += 1
+        if self._healthbar_tracker is None:
+            return
+        for overlay in self._healthbar_overlays:
+            overlay.hide()
 
-        return QRect(start_x, top, end_x - start_x, bottom - top + 1)
+    def _handle_healthbar_reacquired(self, tracker: healthbar.MultiBarTracker) -> None:
+        """파이프라인이 전체 화면에서 바를 (다시) 찾았다. 오버레이는 다음 결과에서 배치한다."""
 
-    def _calculate_healthbar_percent(self, image: QImage, rect: QRect) -> float | None:
-        if rect.width() <= 0 or rect.height() <= 0:
-            return None
+        if self._healthbar_tracker is None:
+            return
+        self._healthbar_tracker = tracker
+        self._ensure_healthbar_overlays(len(tracker))
+        self._remember_healthbar_regions(tracker.rects)
 
-        start_x = max(0, rect.x())
-        start_y = max(0, rect.y())
-        end_x = min(image.width(), rect.x() + rect.width())
-        end_y = min(image.height(), rect.y() + rect.height())
-        if end_x <= start_x or end_y <= start_y:
-            return None
+    def _handle_healthbar_acquire_failed(self) -> None:
+        if self._healthbar_tracker is None:
+            return
+        self._stop_healthbar_tracking()
+        QMessageBox.warning(self, "체력바", "체력바 영역을 찾지 못했습니다.")
 
-        band_top = start_y + rect.height() // 4
-        band_bottom = start_y + (rect.height() * 3) // 4
-        band_top = max(start_y, band_top)
-        band_bottom = min(end_y, band_bottom)
-
-        filled_columns = 0
-        total_columns = 0
-        for x in range(start_x, end_x):
-            filled_pixels = 0
-            empty_pixels = 0
-            for y in range(band_top, band_bottom):
-                color = image.pixelColor(x, y)
-                if self._is_filled_color(color):
-                    filled_pixels += 1
-                elif self._is_empty_color(color):
-                    empty_pixels += 1
-            if filled_pixels == 0 and empty_pixels == 0:
-                continue
-            total_columns += 1
-            if filled_pixels >= empty_pixels:
-                filled_columns += 1
+    def _handle_healthbar_estimate(self, estimates: list[HealthEstimate | None]) -> None:
+        if self._healthbar_tracker is None:
+            return
+        for overlay, estimate in zip(self._healthbar_overlays, estimates):
+            if estimate is not None and overlay.isVisible():
+                overlay.set_estimate(estimate)
+
+    def _locate_healthbars(self, pixels: np.ndarray) -> list[healthbar.Rect]:
+        """화면 픽셀에서 추적할 체력바 영역들을 찾는다.
+
+        처음 탐색과 재탐색 모두 체력바 파이프라인의 분석 작업 스레드에서 호출되므로 Qt 객체를 쓰지 않는다.
+        """
+
+        colors = self._healthbar_colors
+        bars = healthbar.locate_bars(pixels, colors)
+        for candidate in bars:
+            logger.info("체력바 발견: %s (신뢰도 %.2f)", candidate.rect, candidate.confidence)
+        if bars:
+            return [candidate.rect for candidate in bars]
+        # 연결 요소로 찾지 못하면 단일 바 후보 탐색으로 한 번 더 시도한다.
+        located = self._locate_healthbar(pixels, colors)
+        return [] if located is None else [located]
 
-        if total_columns == 0:
+    @staticmethod
+    def _locate_healthbar(
+        pixels: np.ndarray, colors: healthbar.ColorTable | None
+    ) -> healthbar.Rect | None:
+        candidates = healthbar.locate_candidates(pixels, colors)
+        for rank, candidate in enumerate(candidates, start=1):
+            logger.info("체력바 후보 %d: %s (신뢰도 %.2f)", rank, candidate.rect, candidate.confidence)
+        if not candidates or candidates[0].confidence < healthbar.MIN_CONFIDENCE:
             return None
-        return (filled_columns / total_columns) * 100
+        return candidates[0].rect
 
-    @staticmethod
-    def _is_filled_color(color: QColor) -> bool:
-        r, g, b = color.red(), color.green(), color.blue()
-        return g >= 150 and g >= r + 20 and g >= b + 20
+    def _calculate_healthbar_percent(self, image: QImage, rect: QRect) -> float | None:
+        return healthbar.healthbar_percent(
+            healthbar.image_view(image),
+            (rect.x(), rect.y(), rect.width(), rect.height()),
+            self._healthbar_colors,
+        )
 
-    @staticmethod
-    def _is_empty_color(color: QColor) -> bool:
-        r, g, b = color.red(), color.green(), color.blue()
-        max_c = max(r, g, b)
-        min_c = min(r, g, b)
-        brightness = (r + g + b) / 3
-        return brightness < 140 and (max_c - min_c) < 35
+    def _begin_healthbar_calibration(self) -> None:
+        if self._region_selector is not None:
+            return
+        selector = RegionSelectWidget("체력이 일부 깎인 체력바를 드래그해 선택하세요 (Esc: 취소)")
+        selector.region_selected.connect(self._handle_calibration_region)
+        selector.destroyed.connect(self._handle_region_selector_closed)
+        self._region_selector = selector
+        selector.start()
 
-    def _is_bar_pixel(self, image: QImage, x: int, y: int) -> bool:
-        color = image.pixelColor(x, y)
-        return self._is_filled_color(color) or self._is_empty_color(color)
+    def _handle_region_selector_closed(self) -> None:
+        self._region_selector = None
+
+    def _handle_calibration_region(self, region: QRect) -> None:
+        screen = QGuiApplication.primaryScreen()
+        if screen is None:
+            QMessageBox.warning(self, "체력바", "화면 정보를 가져올 수 없습니다.")
+            return
+        ratio = screen.devicePixelRatio() or 1.0
+        capture = screen.grabWindow(
+            0,
+            int(region.x() * ratio),
+            int(region.y() * ratio),
+            int(region.width() * ratio),
+            int(region.height() * ratio),
+        )
+        image = capture.toImage().convertToFormat(QImage.Format_RGBA8888)
+        try:
+            colors = healthbar.ColorTable.calibrate(healthbar.image_view(image))
+        except ValueError as exc:
+            QMessageBox.warning(self, "체력바", str(exc))
+            return
+        try:
+            colors.save(self._healthbar_colors_path)
+        except OSError as exc:
+            logger.warning("체력바 색상표 저장 실패: %s", exc)
+        self._healthbar_colors = colors
+        self._reset_colors_action.setEnabled(True)
+        QMessageBox.information(self, "체력바", "체력바 색상을 보정했습니다.")
+
+    def _reset_healthbar_colors(self) -> None:
+        self._healthbar_colors = None
+        self._reset_colors_action.setEnabled(False)
+        try:
+            self._healthbar_colors_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning("체력바 색상표 삭제 실패: %s", exc)
 
     def _update_row_background(self, timer_id: str) -> None:
         row = self._row_index.get(timer_id)
@@ -946,21 +1168,8 @@ class MainWindow(QMainWindow):
             logger.info("오버레이 크기 변경: %s", clamped)
 
     def _update_server_clock_offset(self, timers_data: list[Dict]) -> None:
-        offsets: list[int] = []
-        now_ms = int(time.time() * 1000)
-        for item in timers_data:
-            updated_raw = item.get("updatedAt")
-            try:
-                updated_at = int(updated_raw)
-            except (TypeError, ValueError):
-                continue
-            offsets.append(updated_at - now_ms)
-
-        if not offsets:
-            return
-
-        new_offset = int(sum(offsets) / len(offsets))
-        if new_offset == self._server_clock_offset_ms:
+        new_offset = estimate_server_clock_offset(timers_data)
+        if new_offset is None or new_offset == self._server_clock_offset_ms:
             return
 
         self._server_clock_offset_ms = new_offset
@@ -0,0 +1,496 @@
+"""프로세스 안 측정값 모음.
+
+카운터, 게이지, HDR 방식 히스토그램을 한 레지스트리에 모아 두고 Prometheus 텍스트
+형식(``/metrics``)과 디버그 창으로 보여 준다. 측정값은 모듈을 불러올 때
+:func:`get_registry` 에서 이름으로 받아 두고, 기록할 때는 정수 연산만 하므로 항상
+켜 둔다. 히스토그램은 스레드별 칸에 락 없이 기록하고 읽을 때 합친다. HTTP
+엔드포인트는 ``TIMER_OVERLAY_METRICS_PORT`` 를 지정했을 때만 127.0.0.1 에서 연다.
+
+히스토그램은 정수(나노초, 바이트)를 2의 거듭제곱 구간마다 16칸으로 나눠 센다.
+백분위 오차는 약 3% 이고 값 범위와 상관없이 기록하는 스레드마다 메모리가 일정하다.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import operator
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENV_VAR = "TIMER_OVERLAY_METRICS_PORT"
+METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 47985
+
+NANOSECONDS = 1e-9
+BYTES = 1.0
+
+# 내보낼 누적 구간 경계 (초, 바이트)
+SECONDS_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_SUB_BITS = 5
+_SUB_COUNT = 1 << (_SUB_BITS - 1)  # 구간당 칸 수 (16)
+_LINEAR_LIMIT = 1 << _SUB_BITS  # 이보다 작은 값은 값 그대로 한 칸씩
+_MAX_INDEX = 64 * _SUB_COUNT + _LINEAR_LIMIT
+_NO_MIN = 1 << 64
+
+Labels = Tuple[Tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _bucket_index(value: int) -> int:
+    if value < _LINEAR_LIMIT:
+        return max(0, value)
+    shift = value.bit_length() - _SUB_BITS
+    return shift * _SUB_COUNT + (value >> shift)
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """칸에 들어가는 가장 작은 값과 가장 큰 값."""
+
+    if index < _LINEAR_LIMIT:
+        return index, index
+    shift = index // _SUB_COUNT - 1
+    sub = index - shift * _SUB_COUNT
+    return sub << shift, ((sub + 1) << shift) - 1
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Labels = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+
+
+class Counter(Metric):
+    """늘어나기만 하는 값."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Labels = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge(Metric):
+    """현재 값."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Labels = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _Shard:
+    """한 스레드가 기록하는 히스토그램 칸. 그 스레드만 쓰므로 락 없이 더한다."""
+
+    __slots__ = ("owner", "generation", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, owner: Optional[threading.Thread] = None, generation: int = 0) -> None:
+        self.owner = owner
+        self.generation = generation
+        self.counts = [0] * _MAX_INDEX
+        self.count = 0
+        self.sum = 0
+        self.min = _NO_MIN
+        self.max = 0
+
+    def absorb(self, other: "_Shard") -> None:
+        # 다른 스레드가 기록 중인 칸도 읽을 수 있다 (원소 단위 갱신이라 근사값).
+        self.counts = list(map(operator.add, self.counts, other.counts))
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class Histogram(Metric):
+    """정수 값 분포. ``scale`` 은 내보낼 때 곱하는 단위 환산값 (나노초 -> 초 등).
+
+    기록은 스레드마다 따로 둔 칸(:class:`_Shard`)에 락 없이 더하고, 읽을 때 합친다.
+    그래서 키보드 훅 스레드의 기록이 ``/metrics`` 나 디버그 창의 읽기와 락을 다투지
+    않는다. 끝난 스레드의 칸은 읽을 때 하나로 접어 둔다.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Labels = (),
+        *,
+        scale: float = NANOSECONDS,
+        buckets: Sequence[float] = SECONDS_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.scale = scale
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._generation = 0
+        self._shards: List[_Shard] = []
+        self._retired = _Shard()
+
+    def record(self, value: int) -> None:
+        shard = getattr(self._local, "shard", None)
+        if shard is None or shard.generation != self._generation:
+            shard = self._new_shard()
+        shard.counts[_bucket_index(value)] += 1
+        shard.count += 1
+        shard.sum += value
+        if value > shard.max:
+            shard.max = value
+        if value < shard.min:
+            shard.min = value
+
+    def _new_shard(self) -> _Shard:
+        """이 스레드의 첫 기록(또는 초기화 뒤 첫 기록)에서 한 번만 락을 잡는다."""
+
+        with self._lock:
+            shard = _Shard(threading.current_thread(), self._generation)
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def _snapshot(self) -> _Shard:
+        merged = _Shard()
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.owner is not None and shard.owner.is_alive():
+                    live.append(shard)
+                else:
+                    self._retired.absorb(shard)
+            self._shards = live
+            merged.absorb(self._retired)
+            for shard in live:
+                merged.absorb(shard)
+        return merged
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """``with`` 블록의 실행 시간(ns)을 기록한다."""
+
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter_ns() - started)
+
+    def timed(self, func: F) -> F:
+        """함수 실행 시간(ns)을 기록하는 데코레이터."""
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(time.perf_counter_ns() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return self._retired.count + sum(shard.count for shard in self._shards)
+
+    def percentile(self, q: float) -> float:
+        """``q`` 백분위 (0~100) 근사값. 단위는 ``scale`` 을 곱한 값."""
+
+        return self._percentile(self._snapshot(), q)
+
+    def _percentile(self, snapshot: _Shard, q: float) -> float:
+        total, low, high = snapshot.count, snapshot.min, snapshot.max
+        if total == 0:
+            return 0.0
+        target = max(1, int(q / 100 * total + 0.5))
+        seen = 0
+        for index, count in enumerate(snapshot.counts):
+            if not count:
+                continue
+            seen += count
+            if seen >= target:
+                lower, upper = _bucket_bounds(index)
+                return min(max((lower + upper) / 2, low), high) * self.scale
+        return high * self.scale
+
+    def summary(self) -> Dict[str, float]:
+        snapshot = self._snapshot()
+        count, total, low, high = snapshot.count, snapshot.sum, snapshot.min, snapshot.max
+        if count == 0:
+            low = 0
+        return {
+            "count": count,
+            "sum": total * self.scale,
+            "min": low * self.scale,
+            "p50": self._percentile(snapshot, 50),
+            "p95": self._percentile(snapshot, 95),
+            "p99": self._percentile(snapshot, 99),
+            "max": high * self.scale,
+        }
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Prometheus 누적 구간 ``(경계, 개수)``. 칸 경계에 걸친 값은 근사한다."""
+
+        counts = self._snapshot().counts
+        result = []
+        index = 0
+        seen = 0
+        for bound in self.buckets:
+            limit = bound / self.scale
+            while index < len(counts) and _bucket_bounds(index)[1] <= limit:
+                seen += counts[index]
+                index += 1
+            result.append((bound, seen))
+        return result
+
+    def reset(self) -> None:
+        """모든 칸을 비운다. 각 스레드는 다음 기록에서 새 칸을 받는다."""
+
+        with self._lock:
+            self._generation += 1
+            self._shards = []
+            self._retired = _Shard()
+
+
+AnyMetric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """이름과 레이블로 측정값을 보관한다. 같은 이름을 다시 요청하면 같은 객체를 준다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[Tuple[str, Labels], AnyMetric] = {}
+
+    def _get(self, cls: type, name: str, help_text: str, labels: Optional[Dict[str, str]], **kwargs: Any):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = cls(name, help_text, key[1], **kwargs)
+                self._metrics[key] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} 은 이미 {metric.kind} 로 등록되어 있습니다.")
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None) -> Counter:
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None) -> Gauge:
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Optional[Dict[str, str]] = None,
+        *,
+        scale: float = NANOSECONDS,
+        buckets: Sequence[float] = SECONDS_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, help_text, labels, scale=scale, buckets=buckets)
+
+    def metrics(self) -> List[AnyMetric]:
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda metric: (metric.name, metric.labels))
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        previous = None
+        for metric in self.metrics():
+            if metric.name != previous:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                previous = metric.name
+            if isinstance(metric, Histogram):
+                for bound, count in metric.cumulative():
+                    lines.append(
+                        f"{metric.name}_bucket{_format_labels(metric.labels, le=_format_value(bound))} {count}"
+                    )
+                summary = metric.summary()
+                lines.append(f"{metric.name}_bucket{_format_labels(metric.labels, le='+Inf')} {summary['count']}")
+                lines.append(f"{metric.name}_sum{_format_labels(metric.labels)} {_format_value(summary['sum'])}")
+                lines.append(f"{metric.name}_count{_format_labels(metric.labels)} {summary['count']}")
+            else:
+                lines.append(f"{metric.name}{_format_labels(metric.labels)} {_format_value(metric.value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels, **extra: str) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    body = ",".join(
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in pairs
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+
+# 클라이언트 측정값 ----------------------------------------------------------
+
+POLL_RTT = _registry.histogram("timer_overlay_poll_rtt_seconds", "타이머 조회 왕복 시간")
+PAYLOAD_BYTES = _registry.histogram(
+    "timer_overlay_payload_bytes", "받은 타이머 응답 크기", scale=BYTES, buckets=BYTES_BUCKETS
+)
+PARSE_TIME = _registry.histogram("timer_overlay_parse_seconds", "타이머 응답 JSON 파싱 시간")
+POLL_ERRORS = _registry.counter("timer_overlay_poll_errors_total", "실패한 타이머 조회 수")
+RECONNECTS = _registry.counter("timer_overlay_reconnects_total", "끊긴 뒤 다시 연결된 횟수")
+CONNECTED = _registry.gauge("timer_overlay_connected", "서버 연결 상태 (1: 연결됨)")
+BACKOFF = _registry.gauge("timer_overlay_backoff_seconds", "재시도 전 대기 시간 (0: 대기 없음)")
+GUI_APPLY = _registry.histogram("timer_overlay_gui_apply_seconds", "응답을 화면에 반영하는 시간 (GUI 스레드)")
+UI_TICK = _registry.histogram("timer_overlay_ui_tick_seconds", "남은 시간 표시 주기 갱신 시간 (GUI 스레드)")
+GUI_STALL = _registry.histogram("timer_overlay_gui_stall_seconds", "GUI 이벤트 루프가 멈춘 시간")
+HEALTHBAR_CAPTURE = _registry.histogram("timer_overlay_healthbar_capture_seconds", "체력바 화면 캡처 시간")
+HEALTHBAR_ANALYZE = _registry.histogram("timer_overlay_healthbar_analyze_seconds", "체력바 분석 시간")
+HOTKEY_LATENCY = _registry.histogram("timer_overlay_hotkey_latency_seconds", "단축키부터 화면에 그려지기까지 시간")
+
+
+def action_rtt(action: str) -> Histogram:
+    return _registry.histogram(
+        "timer_overlay_action_rtt_seconds", "타이머 액션 요청 왕복 시간", {"action": action}
+    )
+
+
+def action_failures(action: str) -> Counter:
+    return _registry.counter(
+        "timer_overlay_action_failures_total", "실패한 타이머 액션 요청 수", {"action": action}
+    )
+
+
+def gui_stalls(site: str) -> Counter:
+    return _registry.counter(
+        "timer_overlay_gui_stalls_total", "호출 위치별 GUI 이벤트 루프 멈춤 횟수", {"site": site}
+    )
+
+
+def hook_callback(hook: str) -> Histogram:
+    return _registry.histogram(
+        "timer_overlay_hook_callback_seconds", "키보드 훅 콜백 실행 시간", {"hook": hook}
+    )
+
+
+def hotkey_hop(hop: str) -> Histogram:
+    return _registry.histogram(
+        "timer_overlay_hotkey_hop_seconds", "단축키 추적의 앞 단계부터 이 단계까지 시간", {"hop": hop}
+    )
+
+
+# HTTP 엔드포인트 ------------------------------------------------------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server 규약
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    registry: MetricsRegistry
+
+
+class MetricsServer:
+    """``/metrics`` 를 127.0.0.1 에서 제공한다."""
+
+    def __init__(self, port: int = DEFAULT_METRICS_PORT, registry: Optional[MetricsRegistry] = None) -> None:
+        self._httpd = _HTTPServer((METRICS_HOST, port), _Handler)
+        self._httpd.registry = registry or get_registry()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["MetricsServer"]:
+        """``TIMER_OVERLAY_METRICS_PORT`` 가 설정되어 있으면 엔드포인트를 연다."""
+
+        raw_port = os.getenv(METRICS_ENV_VAR)
+        if not raw_port:
+            return None
+        try:
+            server = cls(int(raw_port))
+        except (ValueError, OSError) as exc:
+            logger.warning("측정값 엔드포인트를 열지 못했습니다 (%s): %s", raw_port, exc)
+            return None
+        server.start()
+        logger.info("측정값 엔드포인트: %s", server.url)
+        return server
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=2)
+        self._thread = None
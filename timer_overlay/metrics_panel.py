@@ -0,0 +1,114 @@
+"""측정값 디버그 창."""
+from __future__ import annotations
+
+from typing import Optional
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+    QDialog, QHBoxLayout, QHeaderView, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+from timer_overlay.metrics import (
+    NANOSECONDS, Histogram, MetricsRegistry, MetricsServer, get_registry
+)
+
+COLUMNS = ["이름", "값 / 횟수", "p50", "p95", "p99", "최대"]
+REFRESH_INTERVAL_MS = 1000
+
+
+def _metric_label(name: str, labels) -> str:
+    label = name[len("timer_overlay_"):] if name.startswith("timer_overlay_") else name
+    if labels:
+        label += " {" + ", ".join(f"{key}={value}" for key, value in labels) + "}"
+    return label
+
+
+def _format_amount(value: float, histogram: Histogram) -> str:
+    if histogram.scale == NANOSECONDS:
+        return f"{value * 1000:.2f}ms"
+    return f"{value:,.0f}"
+
+
+class MetricsDialog(QDialog):
+    """레지스트리의 측정값을 1초마다 다시 읽어 표로 보여 준다."""
+
+    def __init__(
+        self,
+        parent: Optional[QWidget] = None,
+        registry: Optional[MetricsRegistry] = None,
+        server: Optional[MetricsServer] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._registry = registry or get_registry()
+        self.setWindowTitle("측정값")
+        self.resize(720, 480)
+
+        endpoint = server.url if server is not None else "꺼짐 (TIMER_OVERLAY_METRICS_PORT 로 켬)"
+        self._endpoint_label = QLabel(f"/metrics: {endpoint}")
+        self._endpoint_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        self._table = QTableWidget(0, len(COLUMNS))
+        self._table.setHorizontalHeaderLabels(COLUMNS)
+        self._table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self._table.verticalHeader().setVisible(False)
+        header = self._table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+
+        reset_button = QPushButton("히스토그램 초기화")
+        reset_button.clicked.connect(self._reset_histograms)
+        close_button = QPushButton("닫기")
+        close_button.clicked.connect(self.close)
+        buttons = QHBoxLayout()
+        buttons.addWidget(self._endpoint_label)
+        buttons.addStretch(1)
+        buttons.addWidget(reset_button)
+        buttons.addWidget(close_button)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self._table)
+        layout.addLayout(buttons)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):  # type: ignore[override]
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):  # type: ignore[override]
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self) -> None:
+        metrics = self._registry.metrics()
+        self._table.setRowCount(len(metrics))
+        for row, metric in enumerate(metrics):
+            cells = [_metric_label(metric.name, metric.labels)]
+            if isinstance(metric, Histogram):
+                summary = metric.summary()
+                cells.append(f"{summary['count']:,}")
+                for key in ("p50", "p95", "p99", "max"):
+                    cells.append(_format_amount(summary[key], metric) if summary["count"] else "-")
+            else:
+                value = metric.value
+                cells.append(f"{value:,}" if isinstance(value, int) else f"{value:g}")
+                cells.extend([""] * 4)
+            for column, text in enumerate(cells):
+                item = self._table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column > 0:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self._table.setItem(row, column, item)
+                item.setText(text)
+
+    def _reset_histograms(self) -> None:
+        for metric in self._registry.metrics():
+            if isinstance(metric, Histogram):
+                metric.reset()
+        self.refresh()
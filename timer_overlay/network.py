@@ -5,14 +5,28 @@ import json
 import logging
 import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from PyQt5.QtCore import QObject, pyqtSignal
 
+from timer_overlay import metrics
+from timer_overlay.clock import get_clock
+from timer_overlay.endpoints import EndpointSelector, candidate_urls, hedged_get
+from timer_overlay.recorder import PayloadRecorder
+from timer_overlay.tracing import get_tracer
+
 logger = logging.getLogger(__name__)
 
+# 폴링 주기와 연결 실패 시 재시도 대기 (부하 생성기도 같은 값을 쓴다)
+POLL_INTERVAL_S = 0.5
+BACKOFF_INITIAL_S = 2.0
+BACKOFF_MAX_S = 30.0
+# 같은 타이머의 단축키를 다시 받기까지의 대기 (키 반복 입력 방지)
+HOTKEY_COOLDOWN_S = 0.75
+
 
 @dataclass
 class ServerSettings:
@@ -21,6 +35,8 @@ class ServerSettings:
     host: str = ""
     port: int = 0
     url: str = ""  # HTTPS URL (예: https://your-app.vercel.app)
+    endpoints: Tuple[str, ...] = ()  # 추가 미러 URL
+    hedge: bool = False
 
     @property
     def base_url(self) -> str:
@@ -29,6 +45,14 @@ class ServerSettings:
             return self.url.rstrip("/")
         return f"http://{self.host}:{self.port}"
 
+    def candidate_urls(self) -> List[str]:
+        """경합에 참여할 엔드포인트 목록. 마지막 후보는 항상 localhost 이다."""
+
+        return candidate_urls(self.url, self.host, self.port, self.endpoints)
+
+    def create_selector(self) -> EndpointSelector:
+        return EndpointSelector(self.candidate_urls(), hedge=self.hedge)
+
 
 @dataclass
 class RemoteTimerState:
@@ -44,7 +68,7 @@ class RemoteTimerState:
     end_time_ms: Optional[int] = None
     updated_at_ms: Optional[int] = None
     server_clock_offset_ms: int = 0
-    synced_at_monotonic: float = field(default_factory=time.monotonic)
+    synced_at_monotonic: float = field(default_factory=lambda: get_clock().monotonic())
 
     @classmethod
     def from_payload(cls, payload: Dict[str, Any]) -> "RemoteTimerState":
@@ -86,13 +110,17 @@ class RemoteTimerState:
         return max(0, int(self.remaining_ms_at() // 1000))
 
     def remaining_ms_at(self, monotonic_time: Optional[float] = None) -> int:
-        reference = monotonic_time if monotonic_time is not None else time.monotonic()
+        clock = get_clock()
+        reference = monotonic_time if monotonic_time is not None else clock.monotonic()
         base_remaining = max(0, int(self.remaining_ms))
         if not self.is_running:
             return base_remaining
         if self.end_time_ms is not None:
-            server_now_ms = int(time.time() * 1000 + self.server_clock_offset_ms)
+            server_now_ms = int(clock.time() * 1000 + self.server_clock_offset_ms)
             remaining = int(self.end_time_ms - server_now_ms)
+            if remaining <= 0 and self.repeat_enabled and self.duration_ms > 0:
+                # 반복 타이머는 서버와 같이 endTime 에 다음 주기로 넘어간다 (응답이 늦어도 0 에 멈추지 않음).
+                return self.duration_ms - (-remaining) % self.duration_ms
             return max(0, remaining)
         elapsed = int((reference - self.synced_at_monotonic) * 1000)
         return max(0, base_remaining - max(0, elapsed))
@@ -124,6 +152,172 @@ class RemoteTimerState:
         return (self.display_order, numeric_id, self.name)
 
 
+def estimate_server_clock_offset(
+    timers_data: List[Dict[str, Any]], now_ms: Optional[int] = None
+) -> Optional[int]:
+    """응답의 ``updatedAt`` 들로 서버 시계 - 로컬 시계(ms)를 추정한다. 근거가 없으면 ``None``."""
+
+    if now_ms is None:
+        now_ms = get_clock().time_ms()
+    offsets: List[int] = []
+    for item in timers_data:
+        updated_raw = item.get("updatedAt")
+        try:
+            updated_at = int(updated_raw)
+        except (TypeError, ValueError):
+            continue
+        offsets.append(updated_at - now_ms)
+    if not offsets:
+        return None
+    return int(sum(offsets) / len(offsets))
+
+
+@dataclass
+class HandshakeResult:
+    """서버 사전 점검과 채널 검증 결과."""
+
+    settings: ServerSettings
+    channel_code: str
+    healthy: bool
+    channel_valid: bool = False
+    payload: Optional[Dict[str, Any]] = None
+    selector: Optional[EndpointSelector] = None
+    elapsed_s: float = 0.0
+
+
+def fetch_channel_payload(
+    base_url: str, channel_code: str, timeout: float = 5.0
+) -> Optional[Dict[str, Any]]:
+    """채널의 타이머 목록을 받아온다. 채널이 유효하지 않으면 ``None``."""
+
+    url = f"{base_url}/api/timers"
+    try:
+        response = requests.get(url, params={"channelCode": channel_code}, timeout=timeout)
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        status = exc.response.status_code if exc.response is not None else None
+        if status != 404:
+            logger.warning("채널 검증 실패: %s", exc)
+        return None
+    except requests.RequestException as exc:
+        logger.warning("채널 검증 실패: %s", exc)
+        return None
+    try:
+        payload = response.json()
+    except ValueError as exc:
+        logger.warning("채널 검증 응답을 파싱하지 못했습니다: %s", exc)
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class ServerHandshake(QObject):
+    """엔드포인트 경합과 채널 검증을 GUI 스레드 밖에서 동시에 수행한다.
+
+    검증 응답은 버리지 않고 :class:`HandshakeResult` 에 담아 첫 스냅샷으로 쓴다.
+    """
+
+    finished = pyqtSignal(object)  # HandshakeResult
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def start(self, settings: ServerSettings, channel_code: str = "") -> None:
+        """점검을 시작한다. 진행 중인 이전 점검의 결과는 무시된다."""
+
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        # 셀렉터는 GUI 스레드에서 만들어 시그널 연결이 안전하도록 한다.
+        selector = settings.create_selector()
+        thread = threading.Thread(
+            target=self._run, args=(generation, settings, selector, channel_code), daemon=True
+        )
+        thread.start()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def _run(
+        self,
+        generation: int,
+        settings: ServerSettings,
+        selector: EndpointSelector,
+        channel_code: str,
+    ) -> None:
+        started = time.monotonic()
+        try:
+            result = self._check(settings, selector, channel_code, started)
+        except Exception as exc:  # pylint: disable=broad-except
+            # 점검 중 예외가 나도 UI 가 "연결 중" 에 멈추지 않도록 실패 결과를 보낸다.
+            logger.warning("서버 점검 중 오류: %s", exc)
+            result = HandshakeResult(
+                settings=settings,
+                channel_code=channel_code,
+                healthy=False,
+                selector=selector,
+                elapsed_s=time.monotonic() - started,
+            )
+        with self._lock:
+            if generation != self._generation:
+                return
+        logger.info(
+            "서버 점검 완료 (%.0fms): healthy=%s channel_valid=%s",
+            result.elapsed_s * 1000,
+            result.healthy,
+            result.channel_valid,
+        )
+        self.finished.emit(result)
+
+    @staticmethod
+    def _check(
+        settings: ServerSettings,
+        selector: EndpointSelector,
+        channel_code: str,
+        started: float,
+    ) -> HandshakeResult:
+        primary = settings.base_url
+        winner: Optional[str] = None
+        payload: Optional[Dict[str, Any]] = None
+        executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            race_future = executor.submit(selector.race)
+            pending: set[Future] = {race_future}
+            payload_sources: Dict[Future, str] = {}
+            if channel_code:
+                future = executor.submit(fetch_channel_payload, primary, channel_code)
+                payload_sources[future] = primary
+                pending.add(future)
+            while pending and payload is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future is race_future:
+                        winner = future.result() or winner
+                        # 기본 엔드포인트보다 빠른 곳이 있으면 그쪽으로도 검증을 보낸다.
+                        if channel_code and winner and winner not in payload_sources.values():
+                            extra = executor.submit(fetch_channel_payload, winner, channel_code)
+                            payload_sources[extra] = winner
+                            pending.add(extra)
+                    elif future.result() is not None:
+                        payload = future.result()
+                        winner = payload_sources[future]
+                        selector.report_success(winner, (time.monotonic() - started) * 1000)
+                        break
+        finally:
+            executor.shutdown(wait=False)
+        return HandshakeResult(
+            settings=settings,
+            channel_code=channel_code,
+            healthy=winner is not None or payload is not None,
+            channel_valid=payload is not None,
+            payload=payload,
+            selector=selector,
+            elapsed_s=time.monotonic() - started,
+        )
+
+
 class TimerService(QObject):
     """서버와의 실시간 동기화를 담당한다."""
 
@@ -133,11 +327,14 @@ class TimerService(QObject):
     def __init__(self, settings: ServerSettings) -> None:
         super().__init__()
         self._settings = settings
+        self._selector = settings.create_selector()
         self._stream_session: Optional[requests.Session] = None
         self._actions_session = requests.Session()
         self._channel_code: Optional[str] = None
+        self._primed_at: Optional[float] = None
+        self._recorder: Optional[PayloadRecorder] = None
         self._running = threading.Event()
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread = threading.Thread(target=self._run, name="TimerService", daemon=True)
 
     def start(self) -> None:
         """스트림 수신을 시작한다."""
@@ -148,10 +345,26 @@ class TimerService(QObject):
             self.connection_state_changed.emit(False, "채널 코드가 설정되지 않았습니다.")
             return
         self._running.set()
+        self._selector.start_monitoring()
         if not self._thread.is_alive():
-            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread = threading.Thread(target=self._run, name="TimerService", daemon=True)
             self._thread.start()
 
+    def prime(self, payload: Dict[str, Any]) -> None:
+        """이미 받아 둔 응답을 첫 스냅샷으로 전달한다.
+
+        ``start`` 전에 호출하면 첫 폴링을 한 주기 뒤로 미뤄 같은 요청을 반복하지 않는다.
+        """
+
+        self._primed_at = time.monotonic()
+        self.connection_state_changed.emit(True, "타이머 정보를 불러왔습니다.")
+        self._emit_payload(payload)
+
+    def set_recorder(self, recorder: Optional[PayloadRecorder]) -> None:
+        """받은 응답을 ``recorder`` 에 기록한다. ``None`` 이면 기록하지 않는다."""
+
+        self._recorder = recorder
+
     def stop(self) -> None:
         """스트림 수신을 중단한다."""
 
@@ -159,6 +372,7 @@ class TimerService(QObject):
             return
 
         self._running.clear()
+        self._selector.stop_monitoring()
         session = self._stream_session
         if session is not None:
             session.close()
@@ -166,16 +380,23 @@ class TimerService(QObject):
             self._thread.join(timeout=2)
         self._stream_session = None
 
-    def update_settings(self, settings: ServerSettings) -> None:
-        """서버 접속 설정을 변경한다."""
+    def update_settings(
+        self, settings: ServerSettings, selector: Optional[EndpointSelector] = None
+    ) -> None:
+        """서버 접속 설정을 변경한다.
 
-        if settings == self._settings:
+        핸드셰이크에서 측정을 마친 ``selector`` 를 넘기면 그 결과를 그대로 이어서 쓴다.
+        """
+
+        if settings == self._settings and selector is None:
             return
 
         was_running = self._running.is_set()
         if was_running:
             self.stop()
         self._settings = settings
+        self._selector.stop_monitoring()
+        self._selector = selector if selector is not None else settings.create_selector()
         if was_running:
             self.start()
 
@@ -205,6 +426,10 @@ class TimerService(QObject):
     def is_running(self) -> bool:
         return self._running.is_set()
 
+    @property
+    def endpoint_selector(self) -> EndpointSelector:
+        return self._selector
+
     def start_timer(self, timer_id: str) -> bool:
         return self._post_action(f"/api/timers/{timer_id}/start")
 
@@ -214,8 +439,15 @@ class TimerService(QObject):
     def reset_timer(self, timer_id: str) -> bool:
         return self._post_action(f"/api/timers/{timer_id}/reset")
 
+    def toggle_repeat(self, timer_id: str) -> bool:
+        return self._post_action(f"/api/timers/{timer_id}/toggle-repeat")
+
     def _post_action(self, path: str, payload: Optional[Dict[str, Any]] = None) -> bool:
-        url = f"{self._settings.base_url}{path}"
+        url = f"{self._selector.current}{path}"
+        timer_id, action = path.rsplit("/", 2)[-2:]
+        tracer = get_tracer()
+        tracer.mark(timer_id, "sent")
+        started = time.perf_counter_ns()
         try:
             response = self._actions_session.post(
                 url,
@@ -224,15 +456,26 @@ class TimerService(QObject):
                 timeout=5,
             )
             response.raise_for_status()
+            tracer.acked(timer_id, True)
             return True
         except requests.RequestException as exc:
             logger.warning("서버 요청 실패 (%s): %s", path, exc)
+            tracer.acked(timer_id, False)
+            metrics.action_failures(action).inc()
             return False
+        finally:
+            metrics.action_rtt(action).record(time.perf_counter_ns() - started)
 
     def _run(self) -> None:
         """Polling 방식으로 서버에서 타이머 상태를 주기적으로 가져온다."""
-        backoff = 2.0
-        poll_interval = 0.5  # 0.5초마다 폴링 (실시간성 향상)
+        backoff = BACKOFF_INITIAL_S
+        poll_interval = POLL_INTERVAL_S  # 0.5초마다 폴링 (실시간성 향상)
+        primed_at, self._primed_at = self._primed_at, None
+        failing = False
+        if primed_at is not None:
+            # 핸드셰이크에서 받은 응답을 이미 전달했으므로 다음 주기까지 기다린다.
+            while self._running.is_set() and time.monotonic() - primed_at < poll_interval:
+                time.sleep(0.05)
         while self._running.is_set():
             if not self._channel_code:
                 self.connection_state_changed.emit(False, "채널 코드가 설정되지 않았습니다.")
@@ -240,12 +483,18 @@ class TimerService(QObject):
                 break
             session = requests.Session()
             self._stream_session = session
+            endpoint = self._selector.current
             try:
                 payload = self._fetch_current_state(session)
                 if payload is not None:
                     self.connection_state_changed.emit(True, "타이머 정보를 불러왔습니다.")
-                    self.timers_updated.emit(payload)
-                    backoff = 2.0
+                    self._emit_payload(payload)
+                    backoff = BACKOFF_INITIAL_S
+                    if failing:
+                        metrics.RECONNECTS.inc()
+                        failing = False
+                    metrics.CONNECTED.set(1)
+                    metrics.BACKOFF.set(0)
                 else:
                     self.connection_state_changed.emit(False, "타이머 정보를 불러오지 못했습니다.")
                 # Polling 간격 대기
@@ -254,6 +503,8 @@ class TimerService(QObject):
                         break
                     time.sleep(0.1)
             except requests.HTTPError as exc:
+                metrics.POLL_ERRORS.inc()
+                metrics.CONNECTED.set(0)
                 if not self._running.is_set():
                     break
                 status = exc.response.status_code if exc.response is not None else None
@@ -262,34 +513,59 @@ class TimerService(QObject):
                     self._running.clear()
                     break
                 logger.warning("타이머 조회 실패: %s", exc)
+                if self._selector.current != endpoint:
+                    continue  # 다른 엔드포인트로 전환되었으므로 바로 재시도
                 message = "서버 연결이 끊어졌습니다. 잠시 후 다시 시도합니다."
                 self.connection_state_changed.emit(False, message)
-                time.sleep(min(backoff, 30.0))
-                backoff = min(backoff * 2, 30.0)
+                failing = True
+                self._back_off(backoff)
+                backoff = min(backoff * 2, BACKOFF_MAX_S)
             except requests.RequestException as exc:
+                metrics.POLL_ERRORS.inc()
+                metrics.CONNECTED.set(0)
                 if not self._running.is_set():
                     break
                 logger.warning("타이머 조회 실패: %s", exc)
+                if self._selector.current != endpoint:
+                    continue  # 다른 엔드포인트로 전환되었으므로 바로 재시도
                 message = "서버 연결이 끊어졌습니다. 잠시 후 다시 시도합니다."
                 self.connection_state_changed.emit(False, message)
-                time.sleep(min(backoff, 30.0))
-                backoff = min(backoff * 2, 30.0)
+                failing = True
+                self._back_off(backoff)
+                backoff = min(backoff * 2, BACKOFF_MAX_S)
             finally:
                 session.close()
                 self._stream_session = None
 
+    @staticmethod
+    def _back_off(delay: float) -> None:
+        delay = min(delay, BACKOFF_MAX_S)
+        metrics.BACKOFF.set(delay)
+        time.sleep(delay)
+
     def _fetch_current_state(self, session: requests.Session) -> Optional[Dict[str, Any]]:
-        url = f"{self._settings.base_url}/api/timers"
-        response = session.get(url, params=self._channel_params(), timeout=5)
+        started = time.perf_counter_ns()
+        response = hedged_get(
+            self._selector,
+            "/api/timers",
+            params=self._channel_params(),
+            timeout=5,
+            session=session,
+        )
+        metrics.POLL_RTT.record(time.perf_counter_ns() - started)
         response.raise_for_status()
+        metrics.PAYLOAD_BYTES.record(len(response.content))
         try:
-            return response.json()
+            with metrics.PARSE_TIME.time():
+                payload = response.json()
         except json.JSONDecodeError as exc:
             logger.warning("타이머 상태 응답을 파싱하지 못했습니다: %s", exc)
             return None
+        get_tracer().payload_received(started)
+        return payload
 
     def _listen_stream(self, session: requests.Session) -> None:
-        url = f"{self._settings.base_url}/api/timers/stream"
+        url = f"{self._selector.current}/api/timers/stream"
         with session.get(url, stream=True, timeout=(5, 60), params=self._channel_params()) as response:
             response.raise_for_status()
             self.connection_state_changed.emit(True, "실시간 스트림에 연결되었습니다.")
@@ -317,9 +593,56 @@ class TimerService(QObject):
                     continue
 
     def _handle_event(self, data: str) -> None:
+        metrics.PAYLOAD_BYTES.record(len(data))
         try:
-            payload = json.loads(data)
+            with metrics.PARSE_TIME.time():
+                payload = json.loads(data)
         except json.JSONDecodeError as exc:
             logger.debug("SSE 데이터 파싱 실패: %s", exc)
             return
+        get_tracer().payload_received()
+        self._emit_payload(payload)
+
+    def _emit_payload(self, payload: Dict[str, Any]) -> None:
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.record(payload)
         self.timers_updated.emit(payload)
+
+
+class ToggleDispatcher:
+    """단축키 한 번으로 실행 중인 타이머는 리셋, 멈춘 타이머는 시작을 요청한다.
+
+    같은 타이머에 ``cooldown_s`` 안에 다시 들어온 요청은 무시한다 (키 반복 입력 방지).
+    """
+
+    def __init__(self, service: TimerService, cooldown_s: float = HOTKEY_COOLDOWN_S) -> None:
+        self._service = service
+        self.cooldown_s = cooldown_s
+        self._last_triggered: Dict[str, float] = {}
+
+    def forget(self, timer_id: str) -> None:
+        self._last_triggered.pop(timer_id, None)
+
+    def cooling_down(self, timer_id: str, now: Optional[float] = None) -> bool:
+        last = self._last_triggered.get(timer_id)
+        now = get_clock().monotonic() if now is None else now
+        return last is not None and (now - last) < self.cooldown_s
+
+    @staticmethod
+    def action_for(state: RemoteTimerState) -> str:
+        """단축키 한 번에 보낼 액션 (``reset`` 또는 ``start``)."""
+
+        return "reset" if state.is_running else "start"
+
+    def dispatch(self, state: RemoteTimerState, now: Optional[float] = None) -> Tuple[str, bool]:
+        """``(액션 이름, 성공 여부)`` 를 반환한다. 성공한 요청만 대기 시간을 시작한다."""
+
+        now = get_clock().monotonic() if now is None else now
+        if self.action_for(state) == "reset":
+            action, success = "리셋", self._service.reset_timer(state.id)
+        else:
+            action, success = "시작", self._service.start_timer(state.id)
+        if success:
+            self._last_triggered[state.id] = now
+        return action, success
@@ -0,0 +1,56 @@
+"""서버에 연결하지 않는 창.
+
+기록 재생과 UI 벤치마크에서 쓴다. 시작할 때의 서버 연결(핸드셰이크, 설정 대화상자)을
+건너뛰고, 설정과 스냅샷은 ``directory`` 아래 임시 파일에 둔다. 타이머 정보는 호출하는
+쪽이 ``MainWindow._handle_timers_payload`` 나 ``TimerOverlayApp._on_timers_updated`` 로
+직접 넣는다.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from PyQt5.QtWidgets import QMainWindow
+
+from timer_overlay.config import CONFIG_FILE_NAME, ConfigStore
+
+OFFLINE_CHANNEL_CODE = "offline"
+TARGETS = ("main_window", "app")
+
+
+def offline_store(directory: Path) -> ConfigStore:
+    store = ConfigStore(Path(directory) / CONFIG_FILE_NAME)
+    config = store.load()
+    config.channel_code = OFFLINE_CHANNEL_CODE
+    store.save(config)
+    return store
+
+
+def create_offline_window(target: str, directory: Path, *, watchdog: bool = False) -> QMainWindow:
+    """``target`` 은 ``"main_window"`` 또는 ``"app"``.
+
+    이벤트 루프 감시(``TIMER_OVERLAY_STALL_MS``)는 ``watchdog`` 을 주지 않으면 끈다.
+    멈춤 경고와 스택 표본이 재생/벤치마크 시간에 섞이지 않게 하기 위해서다.
+    """
+
+    if target not in TARGETS:
+        raise ValueError(f"알 수 없는 창 종류: {target}")
+    store = offline_store(directory)
+    if target == "main_window":
+        from timer_overlay.main_window import MainWindow
+
+        class OfflineMainWindow(MainWindow):
+            def _initialize_connection(self) -> None:
+                pass
+
+        return OfflineMainWindow(store, watchdog=watchdog)
+
+    # 단축키 훅을 켜지 않으므로 화면(X 서버)이 없어도 pynput 을 불러올 수 있게 한다.
+    os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+    from timer_overlay.app import TimerOverlayApp
+
+    class OfflineOverlayApp(TimerOverlayApp):
+        def _initial_connect(self):
+            pass
+
+    return OfflineOverlayApp(store, watchdog=watchdog)
@@ -5,7 +5,9 @@ from PyQt5.QtCore import QPoint, Qt, pyqtSignal
 from PyQt5.QtGui import QColor, QFont, QPainter
 from PyQt5.QtWidgets import QLabel, QPushButton, QVBoxLayout, QWidget
 
+from timer_overlay.network import RemoteTimerState
 from timer_overlay.timer_state import TimerState
+from timer_overlay.tracing import get_tracer
 
 
 class ProgressBar(QWidget):
@@ -149,6 +151,7 @@ class TimerOverlay(QWidget):
     def update_timer(self, timer: TimerState):
         """타이머 상태 업데이트."""
         self._timer = timer
+        get_tracer().shown(timer.id)
         
         # 이름
         self._name_label.setText(timer.name)
@@ -199,6 +202,8 @@ class TimerOverlay(QWidget):
         painter.setBrush(QColor(0, 0, 0, 180))
         painter.setPen(Qt.NoPen)
         painter.drawRoundedRect(self.rect(), 8, 8)
+        # 라벨은 배경 위에 이어서 그려지므로 여기서 새 상태가 화면에 나간 것으로 본다
+        get_tracer().painted(self.timer_id)
     
     def mousePressEvent(self, event):
         """드래그 시작."""
@@ -219,3 +224,139 @@ class TimerOverlay(QWidget):
             pos = self.pos()
             self.position_changed.emit(self.timer_id, pos.x(), pos.y())
             event.accept()
+
+
+class TimerOverlayWidget(QWidget):
+    """메인 윈도우(``MainWindow``)가 띄우는 서버 타이머 오버레이.
+
+    ``RemoteTimerState`` 를 그대로 그리며 버튼 없이 이름, 남은 시간, 진행 바, 단축키만
+    보여준다. 시작/리셋은 단축키나 표에서 요청하므로 위젯은 서버에 직접 요청하지 않는다.
+    """
+
+    position_changed = pyqtSignal(str, int, int)  # timer_id, x, y
+
+    # 크기 단계(1~5)마다 커지는 배율
+    SCALE_STEP = 0.25
+
+    def __init__(self, state: RemoteTimerState, scale: int = 1, parent: QWidget = None):
+        super().__init__(parent)
+
+        self.timer_id = state.id
+        self._state = state
+        self._scale = 1.0
+        self._drag_start: QPoint = None
+
+        self.setWindowFlags(
+            Qt.FramelessWindowHint |
+            Qt.WindowStaysOnTopHint |
+            Qt.Tool
+        )
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(4)
+
+        self._name_label = QLabel()
+        self._name_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self._name_label)
+
+        self._time_label = QLabel("00:00")
+        self._time_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self._time_label)
+
+        self._progress_bar = ProgressBar()
+        layout.addWidget(self._progress_bar)
+
+        self._hotkey_label = QLabel("")
+        self._hotkey_label.setAlignment(Qt.AlignCenter)
+        self._hotkey_label.setStyleSheet("color: #888; font-size: 10px;")
+        layout.addWidget(self._hotkey_label)
+
+        self._color = TimerOverlay.COLOR_NORMAL
+        self.set_scale(scale)
+        self.update_state(state)
+
+    def set_scale(self, step: int):
+        """크기 단계 (1~5) 설정."""
+        step = max(1, min(5, int(step)))
+        self._scale = 1.0 + (step - 1) * self.SCALE_STEP
+        self.setFixedSize(int(140 * self._scale), int(90 * self._scale))
+        self._name_label.setStyleSheet(
+            f"color: white; font-weight: bold; font-size: {int(10 * self._scale)}px;"
+        )
+        self._apply_time_style()
+
+    def set_overlay_opacity(self, opacity: int):
+        """투명도 설정 (0-100)."""
+        self.setWindowOpacity(opacity / 100.0)
+
+    def set_hotkey(self, key: str | None):
+        """단축키 표시."""
+        self._hotkey_label.setText(f"[{key.upper()}]" if key else "")
+
+    def update_state(self, state: RemoteTimerState):
+        """서버에서 받은 새 상태로 바꾼다."""
+        self._state = state
+        self._name_label.setText(state.name)
+        self.refresh()
+
+    def refresh(self, now: float | None = None):
+        """남은 시간, 진행 바, 색상을 다시 계산한다 (``now`` 는 단조 시계 값)."""
+        state = self._state
+        remaining_ms = state.remaining_ms_at(now)
+        self._time_label.setText(state.format_duration(remaining_ms))
+        progress = remaining_ms / state.duration_ms if state.duration_ms > 0 else 0.0
+        self._progress_bar.set_progress(progress)
+
+        if not state.is_running and remaining_ms == 0:
+            color = TimerOverlay.COLOR_FINISHED
+        elif 0 < remaining_ms <= 60000:
+            color = TimerOverlay.COLOR_CRITICAL
+        else:
+            color = TimerOverlay.COLOR_NORMAL
+        if color != self._color:
+            self._color = color
+            self._apply_time_style()
+            self._progress_bar.set_color(color)
+
+    def _apply_time_style(self):
+        self._time_label.setStyleSheet(
+            f"color: {self._color.name()}; font-weight: bold; font-size: {int(18 * self._scale)}px;"
+        )
+
+    def update_position(self, x: int, y: int):
+        """저장된 위치로 옮긴다."""
+        self.move(int(x), int(y))
+
+    def current_position(self) -> QPoint:
+        return self.pos()
+
+    def paintEvent(self, event):
+        """배경 그리기."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(QColor(0, 0, 0, 180))
+        painter.setPen(Qt.NoPen)
+        painter.drawRoundedRect(self.rect(), 8, 8)
+        get_tracer().painted(self.timer_id)
+
+    def mousePressEvent(self, event):
+        """드래그 시작."""
+        if event.button() == Qt.LeftButton:
+            self._drag_start = event.globalPos() - self.frameGeometry().topLeft()
+            event.accept()
+
+    def mouseMoveEvent(self, event):
+        """드래그 중."""
+        if self._drag_start and event.buttons() == Qt.LeftButton:
+            self.move(event.globalPos() - self._drag_start)
+            event.accept()
+
+    def mouseReleaseEvent(self, event):
+        """드래그 종료."""
+        if self._drag_start:
+            self._drag_start = None
+            pos = self.pos()
+            self.position_changed.emit(self.timer_id, pos.x(), pos.y())
+            event.accept()
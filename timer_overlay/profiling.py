@@ -0,0 +1,257 @@
+"""세션 전체 프로파일링.
+
+``TIMER_OVERLAY_PROFILE_DIR`` 를 지정하면 실행하는 동안(또는
+``TIMER_OVERLAY_PROFILE_SECONDS`` 초 동안) 스레드마다 두 가지를 모은다.
+
+- cProfile: GUI 스레드는 시작할 때 켜고, 그 뒤에 시작되는 스레드(``TimerService``,
+  단축키 훅/작업 스레드, 체력바 캡처/분석 등)는 ``threading.setprofile`` 로 각자 켠다.
+  결과는 ``<스레드>.prof`` (``pstats``/snakeviz 로 열 수 있음).
+- 표본 스택: 표본 스레드가 ``sys._current_frames`` 로 모든 스레드의 스택을 주기적으로
+  떠서 접힌 스택 형식(``<스레드>.folded``)으로 쓴다. flamegraph.pl, speedscope,
+  inferno 에서 플레임 그래프로 볼 수 있다. 잠들어 있거나 오래 도는 함수처럼 cProfile 에
+  잡히지 않는 시간도 보인다.
+
+결과는 ``<디렉터리>/profile-<시작 시각>/`` 에 쓰고, 스레드별 상위 함수를
+``summary.txt`` 에 모은다. GUI 스레드에서 시작하고 멈춰야 한다.
+
+파이썬 3.12 부터 cProfile 은 ``sys.monitoring`` 을 써서 프로세스에 하나만 켤 수 있고
+모든 스레드를 함께 잰다. 그래서 3.12 이상에서는 모든 스레드를 합친 ``process.prof`` 하나를
+쓰고 스레드별 구분은 표본 스택으로 한다. 3.11 이하에서는 시작 전에 이미 돌던 스레드는
+표본 스택만 남고, 시간을 정해 멈춰도 다른 스레드의 cProfile 은 그 스레드가 끝날 때까지
+켜져 있다 (결과에는 멈춘 시점까지만 들어간다).
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = "TIMER_OVERLAY_PROFILE_DIR"
+PROFILE_SECONDS_ENV_VAR = "TIMER_OVERLAY_PROFILE_SECONDS"
+DEFAULT_SAMPLE_INTERVAL_S = 0.005
+SUMMARY_LIMIT = 25
+PER_THREAD_CPROFILE = sys.version_info < (3, 12)
+
+
+@dataclass
+class ThreadProfile:
+    """스레드 하나의 cProfile 과 표본 스택."""
+
+    ident: int
+    name: str
+    profile: Optional[cProfile.Profile] = None
+    stacks: Counter = field(default_factory=Counter)
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _fold(frame) -> str:
+    """바깥 호출부터 ``;`` 로 이은 접힌 스택."""
+
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "thread"
+
+
+def _dump_profile(profile: cProfile.Profile, path: Path, summary: io.StringIO) -> None:
+    """``.prof`` 를 쓰고 누적 시간 상위 함수를 ``summary`` 에 붙인다."""
+
+    # 다른 스레드의 프로파일은 그 스레드에서만 끌 수 있으므로 켜진 채 현재 값을 읽는다.
+    profile.snapshot_stats()
+    if not profile.stats:
+        return
+    with path.open("wb") as handle:
+        marshal.dump(profile.stats, handle)
+    stats = pstats.Stats(str(path), stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LIMIT)
+
+
+class SessionProfiler:
+    """모든 스레드의 cProfile 과 표본 스택을 모아 디렉터리에 쓴다."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        duration_s: float = 0.0,
+        sample_interval_s: float = DEFAULT_SAMPLE_INTERVAL_S,
+    ) -> None:
+        self.directory = Path(directory).expanduser()
+        self.duration_s = duration_s
+        self.sample_interval_s = sample_interval_s
+        self.output_dir: Optional[Path] = None
+        self.threads: List[ThreadProfile] = []
+        self._by_ident: Dict[int, ThreadProfile] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._gui_ident: Optional[int] = None
+        self._process_profile: Optional[cProfile.Profile] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    @classmethod
+    def from_env(cls) -> Optional["SessionProfiler"]:
+        """``TIMER_OVERLAY_PROFILE_DIR`` 가 없으면 ``None``."""
+
+        raw_dir = os.getenv(PROFILE_ENV_VAR)
+        if not raw_dir:
+            return None
+        raw_seconds = os.getenv(PROFILE_SECONDS_ENV_VAR, "")
+        try:
+            duration_s = float(raw_seconds) if raw_seconds else 0.0
+        except ValueError:
+            logger.warning("%s 값이 올바르지 않습니다: %s", PROFILE_SECONDS_ENV_VAR, raw_seconds)
+            duration_s = 0.0
+        return cls(Path(raw_dir), duration_s=max(0.0, duration_s))
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._started_at = time.monotonic()
+        self._stop.clear()
+        self._gui_ident = threading.get_ident()
+        if PER_THREAD_CPROFILE:
+            threading.setprofile(self._bootstrap)
+            self._thread_entry(enable=True)
+        else:
+            self._process_profile = cProfile.Profile()
+            self._process_profile.enable()
+        self._sampler = threading.Thread(target=self._sample_loop, name="ProfileSampler", daemon=True)
+        self._sampler.start()
+        until = f"{self.duration_s:g}초 동안" if self.duration_s else "종료할 때까지"
+        logger.info("프로파일링 시작 (%s): %s", until, self.directory)
+
+    def stop(self) -> Optional[Path]:
+        """프로파일링을 멈추고 결과를 쓴다. 결과 디렉터리를 반환한다."""
+
+        if not self._running:
+            return self.output_dir
+        self._running = False
+        if self._process_profile is not None:
+            self._process_profile.disable()
+        else:
+            threading.setprofile(None)
+            gui = self._by_ident.get(self._gui_ident)
+            if gui is not None and gui.profile is not None:
+                gui.profile.disable()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1)
+            self._sampler = None
+        try:
+            self.output_dir = self._write()
+        except OSError as exc:
+            logger.warning("프로파일 결과를 저장하지 못했습니다 (%s): %s", self.directory, exc)
+            return None
+        logger.info(
+            "프로파일 결과를 저장했습니다: %s (%.1f초, 스레드 %d개)",
+            self.output_dir, time.monotonic() - self._started_at, len(self.threads),
+        )
+        return self.output_dir
+
+    # 스레드별 cProfile -------------------------------------------------------
+    def _thread_entry(self, enable: bool = False) -> ThreadProfile:
+        ident = threading.get_ident()
+        name = threading.current_thread().name
+        with self._lock:
+            entry = self._by_ident.get(ident)
+            # 끝난 스레드의 id 는 다시 쓰일 수 있으므로 이름까지 같아야 같은 스레드로 본다.
+            if entry is None or entry.name != name:
+                entry = ThreadProfile(ident, name)
+                self._by_ident[ident] = entry
+                self.threads.append(entry)
+            if enable and entry.profile is None:
+                entry.profile = cProfile.Profile()
+        if enable:
+            entry.profile.enable()
+        return entry
+
+    def _bootstrap(self, frame, event, arg) -> None:
+        """새 스레드의 첫 호출에서 한 번 불려 그 스레드의 cProfile 로 바꾼다."""
+
+        sys.setprofile(None)
+        if self._running and threading.current_thread() is not self._sampler:
+            self._thread_entry(enable=True)
+
+    # 표본 스택 -------------------------------------------------------------
+    def _sample_loop(self) -> None:
+        own_ident = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.sample_interval_s):
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                name = names.get(ident, f"thread-{ident}")
+                stack = _fold(frame)
+                with self._lock:
+                    entry = self._by_ident.get(ident)
+                    if entry is None or entry.name != name:
+                        entry = ThreadProfile(ident, name)
+                        self._by_ident[ident] = entry
+                        self.threads.append(entry)
+                    entry.stacks[stack] += 1
+            frames = frame = None
+
+    # 결과 ------------------------------------------------------------------
+    def _write(self) -> Path:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output_dir = self.directory / f"profile-{stamp}"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        used: Dict[str, int] = {}
+        summary = io.StringIO()
+        with self._lock:
+            threads = list(self.threads)
+        for entry in threads:
+            base = _safe_name(entry.name)
+            used[base] = used.get(base, 0) + 1
+            if used[base] > 1:
+                base = f"{base}-{used[base]}"
+            summary.write(f"== {entry.name} (표본 {entry.samples}개) ==\n")
+            if entry.stacks:
+                with (output_dir / f"{base}.folded").open("w", encoding="utf-8") as handle:
+                    for stack, count in entry.stacks.most_common():
+                        handle.write(f"{stack} {count}\n")
+            if entry.profile is not None:
+                _dump_profile(entry.profile, output_dir / f"{base}.prof", summary)
+            summary.write("\n")
+        if self._process_profile is not None:
+            summary.write("== 모든 스레드 (cProfile) ==\n")
+            _dump_profile(self._process_profile, output_dir / "process.prof", summary)
+        (output_dir / "summary.txt").write_text(summary.getvalue(), encoding="utf-8")
+        return output_dir
@@ -0,0 +1,511 @@
+"""서버 응답 기록과 재생.
+
+``TimerService``/``TimerPoller`` 가 받은 응답을 받은 시각과 함께 JSONL 파일로 남긴다.
+기록은 큐에 넣기만 하고 직렬화와 파일 쓰기는 별도 스레드가 맡으므로 수신 경로를
+막지 않는다. 파일이 ``max_bytes`` 를 넘으면 다음 파일로 넘어가고, 오래된 파일은
+``max_files`` 개만 남긴다.
+
+기록한 세션은 :class:`PayloadReplayer` 로 ``MainWindow._handle_timers_payload`` 나
+``TimerOverlayApp._on_timers_updated`` 에 실제 속도 또는 빠른 속도로 다시 흘려보낼 수
+있다. 재생하는 동안에는 전역 시계를 기록된 시각으로 바꿔 남은 시간 계산과 서버 시계
+보정이 현장과 같게 동작한다.
+
+기록 켜기::
+
+    TIMER_OVERLAY_RECORD_DIR=~/timer-records python -m timer_overlay
+
+재생::
+
+    python -m timer_overlay.recorder info ~/timer-records
+    python -m timer_overlay.recorder replay ~/timer-records --speed 10
+    python -m timer_overlay.recorder replay ~/timer-records --target main_window
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from timer_overlay.clock import SimulatedClock, get_clock, set_clock
+
+logger = logging.getLogger(__name__)
+
+RECORD_ENV_VAR = "TIMER_OVERLAY_RECORD_DIR"
+RECORD_FORMAT = "timer_overlay.payloads"
+RECORD_VERSION = 1
+
+DEFAULT_PREFIX = "payloads"
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_FILES = 20
+DEFAULT_QUEUE_SIZE = 1024
+
+_CLOSE = object()
+
+
+class PayloadRecorder:
+    """받은 응답을 백그라운드 스레드로 JSONL 파일에 쓴다.
+
+    한 줄은 ``{"t": 벽시계 ms, "m": 세션 시작 후 단조 ms, "p": 응답}`` 이다.
+    파일마다 첫 줄에 형식, 세션, 순번을 적은 머리글이 있다.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        prefix: str = DEFAULT_PREFIX,
+        source: str = "",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_files: int = DEFAULT_MAX_FILES,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self.directory = Path(directory).expanduser()
+        self.prefix = prefix
+        self.source = source
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.session = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.recorded = 0
+        self.dropped = 0
+        self._clock = get_clock()
+        self._started_at = self._clock.monotonic()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._part = 0
+        self._file = None
+        self._written = 0
+        self._thread = threading.Thread(target=self._run, name="PayloadRecorder", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls, source: str = "") -> Optional["PayloadRecorder"]:
+        """``TIMER_OVERLAY_RECORD_DIR`` 이 설정되어 있으면 기록기를 만든다."""
+
+        raw_path = os.getenv(RECORD_ENV_VAR)
+        if not raw_path:
+            return None
+        recorder = cls(Path(raw_path), source=source)
+        logger.info("서버 응답 기록: %s (%s)", recorder.directory, recorder.session)
+        return recorder
+
+    def record(self, payload: Any) -> None:
+        """응답 하나를 기록 큐에 넣는다. 큐가 가득 차면 버리고 센다.
+
+        ``payload`` 는 서버 응답 딕셔너리이거나 ``TimerState`` 목록이다. 넘긴 뒤에는
+        수정하지 않아야 한다.
+        """
+
+        wall_ms = self._clock.time_ms()
+        monotonic_ms = int((self._clock.monotonic() - self._started_at) * 1000)
+        try:
+            self._queue.put_nowait((wall_ms, monotonic_ms, payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        """남은 기록을 모두 쓰고 파일을 닫는다."""
+
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_CLOSE, timeout=timeout)
+        except queue.Full:
+            logger.warning("기록 큐가 비지 않아 %d건을 버립니다.", self._queue.qsize())
+            return
+        self._thread.join(timeout=timeout)
+        if self.dropped:
+            logger.warning("기록 큐가 가득 차 응답 %d건을 버렸습니다.", self.dropped)
+
+    # 쓰기 스레드 ---------------------------------------------------------
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _CLOSE:
+                    break
+                self._write(item)
+                if self._queue.empty() and self._file is not None:
+                    self._file.flush()
+        except OSError as exc:
+            logger.warning("응답 기록을 중단합니다: %s", exc)
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write(self, item: tuple) -> None:
+        wall_ms, monotonic_ms, payload = item
+        if isinstance(payload, list):
+            payload = {"timers": [timer.to_payload() for timer in payload]}
+        line = json.dumps(
+            {"t": wall_ms, "m": monotonic_ms, "p": payload},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        data = (line + "\n").encode("utf-8")
+        if self._file is None or self._written + len(data) > self.max_bytes:
+            self._open_next()
+        self._file.write(data)
+        self._written += len(data)
+        self.recorded += 1
+
+    def _open_next(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._part += 1
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.prefix}-{self.session}-{self._part:03d}.jsonl"
+        self._file = path.open("wb")
+        header = {
+            "format": RECORD_FORMAT,
+            "version": RECORD_VERSION,
+            "session": self.session,
+            "part": self._part,
+            "source": self.source,
+        }
+        data = (json.dumps(header, separators=(",", ":")) + "\n").encode("utf-8")
+        self._file.write(data)
+        self._written = len(data)
+        self._prune()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob(f"{self.prefix}-*.jsonl"))
+        for path in files[: max(0, len(files) - self.max_files)]:
+            try:
+                path.unlink()
+            except OSError as exc:
+                logger.debug("오래된 기록 파일 삭제 실패 (%s): %s", path, exc)
+
+
+# 읽기 ---------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RecordedPayload:
+    """기록된 응답 하나."""
+
+    wall_ms: int
+    monotonic_ms: int
+    payload: Dict[str, Any]
+
+
+def _session_of(path: Path, prefix: str) -> str:
+    # payloads-20250101-203000-001.jsonl -> 20250101-203000
+    return path.stem[len(prefix) + 1:].rsplit("-", 1)[0]
+
+
+def list_sessions(directory: Path, prefix: str = DEFAULT_PREFIX) -> Dict[str, List[Path]]:
+    """디렉터리의 기록 파일을 세션별로 묶는다 (오래된 세션부터)."""
+
+    sessions: Dict[str, List[Path]] = {}
+    for path in sorted(Path(directory).glob(f"{prefix}-*.jsonl")):
+        sessions.setdefault(_session_of(path, prefix), []).append(path)
+    return sessions
+
+
+def recording_files(
+    path: Path, session: Optional[str] = None, prefix: str = DEFAULT_PREFIX
+) -> List[Path]:
+    """재생할 파일 목록. 디렉터리면 ``session`` (기본: 가장 최근 세션)의 파일들."""
+
+    path = Path(path).expanduser()
+    if path.is_file():
+        return [path]
+    sessions = list_sessions(path, prefix)
+    if not sessions:
+        raise FileNotFoundError(f"기록 파일이 없습니다: {path}")
+    if session is None:
+        session = max(sessions)
+    if session not in sessions:
+        raise FileNotFoundError(f"세션을 찾을 수 없습니다: {session}")
+    return sessions[session]
+
+
+def read_recording(paths: Sequence[Path]) -> List[RecordedPayload]:
+    """기록 파일들을 읽는다. 깨진 줄(비정상 종료로 잘린 마지막 줄 등)은 건너뛴다."""
+
+    records: List[RecordedPayload] = []
+    for path in paths:
+        with Path(path).open("r", encoding="utf-8") as handle:
+            for line_no, line in enumerate(handle, start=1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("기록을 읽지 못했습니다 (%s:%d)", path, line_no)
+                    continue
+                if "format" in entry:
+                    if entry.get("format") != RECORD_FORMAT:
+                        raise ValueError(f"응답 기록 파일이 아닙니다: {path}")
+                    continue
+                payload = entry.get("p")
+                if not isinstance(payload, dict):
+                    continue
+                records.append(
+                    RecordedPayload(int(entry.get("t", 0)), int(entry.get("m", 0)), payload)
+                )
+    return records
+
+
+# 재생 ---------------------------------------------------------------------
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class PayloadReplayer(QObject):
+    """기록된 응답을 Qt 이벤트 루프에서 다시 전달한다.
+
+    ``speed`` 가 1 이면 기록된 간격 그대로, 10 이면 10배 빠르게, 0 이면 기다리지 않고
+    이벤트 루프 한 바퀴마다 하나씩 전달한다. 재생 중에는 전역 시계가
+    :attr:`clock` 으로 바뀌어 기록 당시의 시각을 따른다. ``sink`` 한 번의 실행 시간은
+    :attr:`apply_ms` 에 쌓인다.
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(
+        self,
+        records: Sequence[RecordedPayload],
+        sink: Callable[[Dict[str, Any]], None],
+        *,
+        speed: float = 1.0,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        if not records:
+            raise ValueError("재생할 기록이 없습니다.")
+        if speed < 0:
+            raise ValueError("speed 는 0 이상이어야 합니다.")
+        self._records = list(records)
+        self._sink = sink
+        self.speed = speed
+        self.clock = SimulatedClock(start_time=self._records[0].wall_ms / 1000)
+        self.apply_ms: List[float] = []
+        self._base_ms = self._records[0].monotonic_ms
+        self._index = 0
+        self._real_start = 0.0
+        self._previous_clock = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(0 if speed == 0 else 16)
+        self._timer.timeout.connect(self._tick)
+
+    @property
+    def position(self) -> int:
+        return self._index
+
+    @property
+    def total(self) -> int:
+        return len(self._records)
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self) -> None:
+        if self._timer.isActive():
+            return
+        self._previous_clock = set_clock(self.clock)
+        self._real_start = time.perf_counter()
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        if self._previous_clock is not None:
+            set_clock(self._previous_clock)
+            self._previous_clock = None
+
+    def _tick(self) -> None:
+        if self.speed == 0:
+            self._deliver(self._records[self._index])
+        else:
+            elapsed_ms = (time.perf_counter() - self._real_start) * self.speed * 1000
+            while (
+                self._index < len(self._records)
+                and self._records[self._index].monotonic_ms - self._base_ms <= elapsed_ms
+            ):
+                self._deliver(self._records[self._index])
+            if self._index < len(self._records):
+                # 응답 사이에도 화면 갱신 타이머가 기록된 시간 흐름을 보도록 앞으로 감는다.
+                self.clock.advance_to(elapsed_ms / 1000)
+        if self._index >= len(self._records):
+            self.stop()
+            self.finished.emit()
+
+    def _deliver(self, record: RecordedPayload) -> None:
+        self.clock.advance_to((record.monotonic_ms - self._base_ms) / 1000)
+        # 기록된 벽시계에 맞춘다 (현장의 시계 변경, 드리프트 재현).
+        self.clock.jump(record.wall_ms / 1000 - self.clock.time())
+        self._index += 1
+        started = time.perf_counter()
+        self._sink(record.payload)
+        self.apply_ms.append((time.perf_counter() - started) * 1000)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.apply_ms)
+        return {
+            "count": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+            "p50_ms": round(_percentile(ordered, 50), 3),
+            "p95_ms": round(_percentile(ordered, 95), 3),
+            "p99_ms": round(_percentile(ordered, 99), 3),
+            "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+            "total_ms": round(sum(ordered), 3),
+        }
+
+
+def overlay_app_sink(app: Any) -> Callable[[Dict[str, Any]], None]:
+    """응답 딕셔너리를 ``TimerOverlayApp._on_timers_updated`` 형식으로 바꿔 전달한다."""
+
+    from timer_overlay.timer_api import parse_timers
+
+    def sink(payload: Dict[str, Any]) -> None:
+        app._on_timers_updated(parse_timers(payload))
+
+    return sink
+
+
+# CLI ----------------------------------------------------------------------
+
+
+def _describe(paths: Sequence[Path], records: Sequence[RecordedPayload]) -> Dict[str, Any]:
+    timer_ids = set()
+    for record in records:
+        for item in record.payload.get("timers") or []:
+            if isinstance(item, dict):
+                timer_ids.add(str(item.get("id", "")))
+    span_ms = records[-1].monotonic_ms - records[0].monotonic_ms if records else 0
+    gaps = sorted(
+        later.monotonic_ms - earlier.monotonic_ms for earlier, later in zip(records, records[1:])
+    )
+    return {
+        "files": [str(path) for path in paths],
+        "bytes": sum(Path(path).stat().st_size for path in paths),
+        "payloads": len(records),
+        "timers": len(timer_ids),
+        "started": (
+            datetime.fromtimestamp(records[0].wall_ms / 1000).isoformat(timespec="seconds")
+            if records else None
+        ),
+        "duration_s": round(span_ms / 1000, 1),
+        "gap_p50_ms": _percentile(gaps, 50),
+        "gap_max_ms": gaps[-1] if gaps else 0,
+    }
+
+
+def _replay(args: argparse.Namespace, records: List[RecordedPayload]) -> Dict[str, Any]:
+    import tempfile
+
+    if not args.show:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    from timer_overlay.offline import create_offline_window
+
+    if args.limit:
+        records = records[: args.limit]
+    application = QApplication.instance() or QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory(prefix="timer-replay-") as workdir:
+        window = create_offline_window(args.target, Path(workdir))
+        sink = (
+            window._handle_timers_payload if args.target == "main_window"
+            else overlay_app_sink(window)
+        )
+        window.show()
+        replayer = PayloadReplayer(records, sink, speed=args.speed)
+        replayer.finished.connect(application.quit)
+        replayer.start()
+        started = time.perf_counter()
+        application.exec_()
+        wall_s = time.perf_counter() - started
+        replayer.stop()
+        window.close()
+    report: Dict[str, Any] = {"target": args.target, "speed": args.speed}
+    report.update(replayer.summary())
+    report["wall_s"] = round(wall_s, 2)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="서버 응답 기록 확인 및 재생")
+    parser.add_argument("-v", "--verbose", action="store_true", help="자세한 로그 출력")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    info_parser = subparsers.add_parser("info", help="기록 세션 요약")
+    info_parser.add_argument("path", type=Path, help="기록 디렉터리 또는 파일")
+    info_parser.add_argument("--session", help="세션 (기본: 가장 최근)")
+    info_parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+
+    replay_parser = subparsers.add_parser("replay", help="기록을 UI 에 다시 흘려 갱신 비용 측정")
+    replay_parser.add_argument("path", type=Path, help="기록 디렉터리 또는 파일")
+    replay_parser.add_argument("--session", help="세션 (기본: 가장 최근)")
+    replay_parser.add_argument(
+        "--target", choices=("app", "main_window"), default="app",
+        help="응답을 받을 창 (기본: app)",
+    )
+    replay_parser.add_argument(
+        "--speed", type=float, default=0.0,
+        help="재생 배속. 0 이면 기다리지 않고 연속 재생 (기본: 0)",
+    )
+    replay_parser.add_argument("--limit", type=int, default=0, help="앞에서부터 N건만 재생")
+    replay_parser.add_argument("--show", action="store_true", help="창을 화면에 띄움")
+    replay_parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="[%(asctime)s] %(levelname)s %(name)s: %(message)s",
+    )
+
+    try:
+        paths = recording_files(args.path, args.session)
+        records = read_recording(paths)
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    if not records:
+        print("기록된 응답이 없습니다.", file=sys.stderr)
+        return 1
+
+    if args.command == "info":
+        report = _describe(paths, records)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            for key, value in report.items():
+                if key == "files":
+                    value = ", ".join(Path(item).name for item in value)
+                print(f"{key:>11}: {value}")
+            sessions = list_sessions(paths[0].parent)
+            if len(sessions) > 1:
+                print(f"   sessions: {', '.join(sessions)}")
+        return 0
+
+    report = _replay(args, records)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"{report['target']}: 응답 {report['count']}건, "
+            f"평균 {report['mean_ms']:.3f}ms / p50 {report['p50_ms']:.3f}ms / "
+            f"p95 {report['p95_ms']:.3f}ms / p99 {report['p99_ms']:.3f}ms / "
+            f"최대 {report['max_ms']:.3f}ms (총 {report['wall_s']:.2f}s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
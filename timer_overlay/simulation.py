@@ -0,0 +1,372 @@
+"""가상 시계 위에서 대역 서버 상태와 헤드리스 클라이언트를 함께 돌리는 시뮬레이션.
+
+네트워크와 스레드 없이 사건(폴링, 응답 도착, 액션, 장애, 시계 변경)을 시각 순서대로
+실행하므로 6시간짜리 레이드도 몇 초 만에, 매번 같은 결과로 재현된다.
+클라이언트 쪽은 실제 ``HeadlessClient``/``RemoteTimerState``/``ToggleDispatcher`` 를,
+서버 쪽은 :class:`~timer_overlay.standin_server.StandinState` 를 쓴다.
+
+    python -m timer_overlay.simulation                  # 내장 시나리오 (raid-night)
+    python -m timer_overlay.simulation scenario.json    # JSON 시나리오
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from timer_overlay.clock import SimulatedClock, use_clock
+from timer_overlay.headless import HeadlessClient, TimerTransition
+from timer_overlay.network import BACKOFF_INITIAL_S, BACKOFF_MAX_S, POLL_INTERVAL_S, ServerSettings
+from timer_overlay.standin_server import DEFAULT_TIMER_DURATION_MS, StandinState
+
+logger = logging.getLogger(__name__)
+
+SIM_CHANNEL_CODE = "sim"
+
+
+class SimulatedService(QObject):
+    """``TimerService`` 대신 쓰는 서비스. 액션은 서버 상태에 바로 적용된다."""
+
+    timers_updated = pyqtSignal(dict)
+    connection_state_changed = pyqtSignal(bool, str)
+
+    def __init__(self, simulation: "Simulation") -> None:
+        super().__init__()
+        self._simulation = simulation
+
+    def start(self) -> None:
+        """폴링은 시뮬레이션이 일정표로 실행한다."""
+
+    def stop(self) -> None:
+        """폴링은 시뮬레이션이 일정표로 실행한다."""
+
+    def update_channel_code(self, channel_code: str) -> None:
+        self.channel_code = channel_code
+
+    def start_timer(self, timer_id: str) -> bool:
+        return self._simulation.send_action(timer_id, "start")
+
+    def pause_timer(self, timer_id: str) -> bool:
+        return self._simulation.send_action(timer_id, "pause")
+
+    def reset_timer(self, timer_id: str) -> bool:
+        return self._simulation.send_action(timer_id, "reset")
+
+    def toggle_repeat(self, timer_id: str) -> bool:
+        return self._simulation.send_action(timer_id, "toggle-repeat")
+
+
+@dataclass
+class CheckResult:
+    at_s: float
+    description: str
+    passed: bool
+    detail: str = ""
+
+
+class Simulation:
+    """사건 일정표. 시각은 모두 시뮬레이션 시작부터의 초(단조 시계)다.
+
+    ``durations_ms`` 마다 타이머를 하나씩 만든다 (id 는 1부터).
+    클라이언트는 ``TimerService`` 와 같이 응답을 받은 뒤 ``poll_interval_s`` 를 기다리고,
+    장애 중에는 같은 지수 재시도 대기를 쓴다.
+    """
+
+    def __init__(
+        self,
+        durations_ms: Sequence[int] = (DEFAULT_TIMER_DURATION_MS,) * 6,
+        *,
+        poll_interval_s: float = POLL_INTERVAL_S,
+        latency_s: float = 0.05,
+        start_time: float = 1_700_000_000.0,
+    ) -> None:
+        self.clock = SimulatedClock(start_time)
+        self.server = StandinState(clock=self.clock.true_time)
+        for duration_ms in durations_ms:
+            self.server.add_channel(SIM_CHANNEL_CODE, 1, duration_ms=int(duration_ms))
+        self.poll_interval_s = poll_interval_s
+        self.latency_s = latency_s
+        self.service = SimulatedService(self)
+        self.client = HeadlessClient(ServerSettings(), SIM_CHANNEL_CODE, service=self.service)
+        self.transitions: List[Tuple[float, TimerTransition]] = []
+        self.client.add_listener(lambda transition: self.transitions.append((self.clock.monotonic(), transition)))
+        self.checks: List[CheckResult] = []
+        self.polls = 0
+        self.failed_polls = 0
+        self._events: List[Tuple[float, int, Callable[[], None]]] = []
+        self._sequence = itertools.count()
+        self._outages: List[Tuple[float, float]] = []
+        self._backoff = BACKOFF_INITIAL_S
+        self.at(0.0, self._poll)
+
+    # 일정 ---------------------------------------------------------------
+    @property
+    def now_s(self) -> float:
+        return self.clock.monotonic()
+
+    def at(self, when_s: float, callback: Callable[[], None]) -> None:
+        heapq.heappush(self._events, (when_s, next(self._sequence), callback))
+
+    def run_until(self, until_s: float) -> None:
+        with use_clock(self.clock):
+            while self._events and self._events[0][0] <= until_s:
+                when_s, _, callback = heapq.heappop(self._events)
+                self.clock.advance_to(when_s)
+                callback()
+            self.clock.advance_to(until_s)
+
+    # 서버/네트워크 각본 ---------------------------------------------------
+    def server_offline(self) -> bool:
+        now = self.now_s
+        return any(start <= now < end for start, end in self._outages)
+
+    def outage(self, start_s: float, duration_s: float) -> None:
+        """이 구간 동안 요청이 모두 실패한다."""
+
+        self._outages.append((start_s, start_s + duration_s))
+
+    def server_action(self, when_s: float, timer_id: str, action: str) -> None:
+        """다른 공대원이 서버에 보낸 액션."""
+
+        self.at(when_s, lambda: self.server.apply_action(SIM_CHANNEL_CODE, int(timer_id), action))
+
+    def press(self, when_s: float, timer_id: str) -> None:
+        """이 클라이언트에서 단축키를 누른다 (시작/리셋 전환, 연타 방지 포함)."""
+
+        self.at(when_s, lambda: self.client.perform("toggle", timer_id))
+
+    def client_action(self, when_s: float, timer_id: str, action: str) -> None:
+        self.at(when_s, lambda: self.client.perform(action, timer_id))
+
+    def drift(self, when_s: float, ppm: float) -> None:
+        """클라이언트 벽시계가 ``ppm`` 만큼 빠르게(음수면 느리게) 간다."""
+
+        def apply() -> None:
+            self.clock.drift_ppm = ppm
+
+        self.at(when_s, apply)
+
+    def jump(self, when_s: float, seconds: float) -> None:
+        """클라이언트 벽시계를 순간적으로 바꾼다."""
+
+        self.at(when_s, lambda: self.clock.jump(seconds))
+
+    def send_action(self, timer_id: str, action: str) -> bool:
+        if self.server_offline():
+            return False
+        try:
+            return self.server.apply_action(SIM_CHANNEL_CODE, int(timer_id), action) is not None
+        except ValueError:
+            return False
+
+    def _poll(self) -> None:
+        self.polls += 1
+        if self.server_offline():
+            self.failed_polls += 1
+            self.service.connection_state_changed.emit(False, "서버 연결이 끊어졌습니다. 잠시 후 다시 시도합니다.")
+            self.at(self.now_s + min(self._backoff, BACKOFF_MAX_S), self._poll)
+            self._backoff = min(self._backoff * 2, BACKOFF_MAX_S)
+            return
+        result = self.server.payload(SIM_CHANNEL_CODE)
+        self._backoff = BACKOFF_INITIAL_S
+        arrival_s = self.now_s + self.latency_s
+        self.at(arrival_s, lambda payload=result[1]: self._deliver(payload))
+        self.at(arrival_s + self.poll_interval_s, self._poll)
+
+    def _deliver(self, payload: Dict[str, Any]) -> None:
+        self.service.connection_state_changed.emit(True, "타이머 정보를 불러왔습니다.")
+        self.service.timers_updated.emit(payload)
+
+    # 조회/검사 ---------------------------------------------------------
+    def displayed_remaining_ms(self, timer_id: str) -> Optional[int]:
+        """클라이언트가 지금 화면에 그릴 남은 시간."""
+
+        for state in self.client.snapshot():
+            if state.id == timer_id:
+                with use_clock(self.clock):
+                    return state.remaining_ms_at()
+        return None
+
+    def server_remaining_ms(self, timer_id: str) -> Optional[int]:
+        result = self.server.payload(SIM_CHANNEL_CODE)
+        for item in result[1]["timers"] if result else ():
+            if str(item["id"]) == timer_id:
+                return int(item["remaining"])
+        return None
+
+    def count(self, kind: str, timer_id: Optional[str] = None) -> int:
+        return sum(
+            1
+            for _, transition in self.transitions
+            if transition.kind == kind and (timer_id is None or transition.timer_id == timer_id)
+        )
+
+    def expect(self, when_s: float, description: str, predicate: Callable[["Simulation"], Union[bool, str]]) -> None:
+        """``predicate`` 가 ``True`` 면 통과. 문자열을 돌려주면 실패 사유로 기록한다."""
+
+        def check() -> None:
+            outcome = predicate(self)
+            passed = outcome is True
+            self.checks.append(CheckResult(self.now_s, description, passed, "" if passed else str(outcome)))
+
+        self.at(when_s, check)
+
+    def expect_in_sync(self, when_s: float, timer_id: str, tolerance_ms: int = 150) -> None:
+        """표시 중인 남은 시간이 서버 값과 ``tolerance_ms`` 안에서 같은지 확인한다."""
+
+        def predicate(sim: "Simulation") -> Union[bool, str]:
+            displayed = sim.displayed_remaining_ms(timer_id)
+            actual = sim.server_remaining_ms(timer_id)
+            if displayed is None or actual is None:
+                return f"타이머 {timer_id} 없음"
+            return abs(displayed - actual) <= tolerance_ms or f"표시 {displayed}ms, 서버 {actual}ms"
+
+        self.expect(when_s, f"{_format_s(when_s)} 타이머 {timer_id} 동기화 (±{tolerance_ms}ms)", predicate)
+
+    def expect_count(self, when_s: float, kind: str, expected: int, timer_id: Optional[str] = None) -> None:
+        def predicate(sim: "Simulation") -> Union[bool, str]:
+            actual = sim.count(kind, timer_id)
+            return actual == expected or f"{actual}회"
+
+        target = f"타이머 {timer_id} " if timer_id else ""
+        self.expect(when_s, f"{_format_s(when_s)} {target}{kind} {expected}회", predicate)
+
+    @property
+    def passed(self) -> bool:
+        return all(check.passed for check in self.checks)
+
+    def report(self) -> Dict[str, Any]:
+        kinds: Dict[str, int] = {}
+        for _, transition in self.transitions:
+            kinds[transition.kind] = kinds.get(transition.kind, 0) + 1
+        return {
+            "simulated_s": round(self.now_s, 3),
+            "polls": self.polls,
+            "failed_polls": self.failed_polls,
+            "transitions": kinds,
+            "checks": [asdict(check) for check in self.checks],
+            "passed": self.passed,
+        }
+
+
+def _format_s(seconds: float) -> str:
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02}:{secs:02}"
+
+
+# 시나리오 ---------------------------------------------------------------
+def raid_night(hours: float = 6.0) -> Tuple[Simulation, float]:
+    """반복 타이머 3개와 일반 타이머 1개로 보내는 레이드 하룻밤.
+
+    시계 드리프트(+80ppm), 벽시계 변경(-45초), 10분 장애를 겪은 뒤에도
+    표시 값이 서버와 맞고, 반복 주기 전환 횟수가 정확한지 확인한다.
+    """
+
+    durations_ms = [15 * 60_000, 20 * 60_000, 30 * 60_000, 5 * 60_000]
+    sim = Simulation(durations_ms)
+    end_s = hours * 3600
+    for timer_id in ("1", "2", "3"):
+        sim.server_action(1.0, timer_id, "toggle-repeat")
+        sim.press(2.0, timer_id)
+    sim.press(2.0, "4")
+    sim.drift(0.0, 80.0)
+    sim.jump(2 * 3600 + 7.3, -45.0)
+    sim.outage(3 * 3600, 600)
+
+    checkpoints = [60.0, 2 * 3600 + 9.0, 3 * 3600 + 300.0, 3 * 3600 + 660.0, end_s - 1.0]
+    for when_s in checkpoints:
+        for timer_id in ("1", "2", "3"):
+            sim.expect_in_sync(when_s, timer_id)
+    # 장애 중에도 이전 응답으로 계속 줄어든다 (드리프트만큼만 어긋남).
+    for timer_id, duration_ms in zip(("1", "2", "3"), durations_ms):
+        # 시작 요청은 2초에 들어가고 첫 주기가 끝날 때마다 한 번씩 넘어간다.
+        expected = int((end_s - 1.0 - 2.0) * 1000 // duration_ms)
+        sim.expect_count(end_s - 1.0, "rollover", expected, timer_id)
+    sim.expect_count(end_s - 1.0, "finished", 1, "4")
+    return sim, end_s
+
+
+BUILTIN_SCENARIOS: Dict[str, Callable[[], Tuple[Simulation, float]]] = {"raid-night": raid_night}
+
+
+def load_scenario(data: Dict[str, Any]) -> Tuple[Simulation, float]:
+    """JSON 시나리오를 읽는다.
+
+    ``{"timers_s": [900, 1200], "latency_ms": 50, "run_s": 3600, "steps": [...]}`` 형식이며,
+    단계는 ``{"at": 초, "do": 종류, ...}`` 이다. 종류: ``press``, ``action``,
+    ``server_action``, ``outage``, ``drift``, ``jump``, ``expect_sync``, ``expect_count``.
+    """
+
+    durations_ms = [int(float(value) * 1000) for value in data.get("timers_s", [DEFAULT_TIMER_DURATION_MS / 1000] * 6)]
+    sim = Simulation(
+        durations_ms,
+        poll_interval_s=float(data.get("poll_interval_s", POLL_INTERVAL_S)),
+        latency_s=float(data.get("latency_ms", 50)) / 1000,
+    )
+    for step in data.get("steps", []):
+        when_s = float(step.get("at", 0))
+        kind = step.get("do")
+        timer_id = str(step.get("timer", ""))
+        if kind == "press":
+            sim.press(when_s, timer_id)
+        elif kind == "action":
+            sim.client_action(when_s, timer_id, step["action"])
+        elif kind == "server_action":
+            sim.server_action(when_s, timer_id, step["action"])
+        elif kind == "outage":
+            sim.outage(when_s, float(step["duration_s"]))
+        elif kind == "drift":
+            sim.drift(when_s, float(step["ppm"]))
+        elif kind == "jump":
+            sim.jump(when_s, float(step["seconds"]))
+        elif kind == "expect_sync":
+            sim.expect_in_sync(when_s, timer_id, int(step.get("tolerance_ms", 150)))
+        elif kind == "expect_count":
+            sim.expect_count(when_s, step["kind"], int(step["count"]), timer_id or None)
+        else:
+            raise ValueError(f"알 수 없는 시나리오 단계: {kind}")
+    return sim, float(data.get("run_s", 3600))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m timer_overlay.simulation", description="가상 시계 시뮬레이션")
+    parser.add_argument("scenario", nargs="?", help="JSON 시나리오 경로")
+    parser.add_argument("--builtin", choices=sorted(BUILTIN_SCENARIOS), default="raid-night")
+    parser.add_argument("--json", action="store_true", help="보고서를 JSON 으로 출력")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="[%(asctime)s] %(levelname)s %(name)s: %(message)s")
+
+    if args.scenario:
+        with open(args.scenario, "r", encoding="utf-8") as handle:
+            sim, run_s = load_scenario(json.load(handle))
+    else:
+        sim, run_s = BUILTIN_SCENARIOS[args.builtin]()
+    started = time.perf_counter()
+    sim.run_until(run_s)
+    report = sim.report()
+    report["wall_s"] = round(time.perf_counter() - started, 3)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for check in sim.checks:
+            mark = "통과" if check.passed else "실패"
+            print(f"[{mark}] {check.description}" + (f" - {check.detail}" if check.detail else ""))
+        print(
+            f"{_format_s(report['simulated_s'])} 을 {report['wall_s']:.2f}초에 시뮬레이션 "
+            f"(폴링 {report['polls']}회, 실패 {report['failed_polls']}회, 상태 변화 {report['transitions']})"
+        )
+    return 0 if sim.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""마지막으로 받은 타이머 상태를 디스크에 보관하는 모듈."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from timer_overlay.clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE_NAME = "timer_overlay_snapshot.json"
+
+# 스냅샷에 남길 서버 응답 필드. ``updatedAt`` 은 매 응답마다 바뀌므로 제외한다.
+_SNAPSHOT_FIELDS = (
+    "id",
+    "name",
+    "duration",
+    "remaining",
+    "isRunning",
+    "repeatEnabled",
+    "displayOrder",
+    "endTime",
+)
+
+
+def _compact_timer(item: Dict[str, Any]) -> Dict[str, Any]:
+    compact = {key: item[key] for key in _SNAPSHOT_FIELDS if item.get(key) is not None}
+    # 진행 중인 타이머는 endTime 으로 계산되므로 매번 바뀌는 remaining 을 저장하지 않는다.
+    if compact.get("isRunning") and compact.get("endTime") is not None:
+        compact.pop("remaining", None)
+    return compact
+
+
+@dataclass
+class TimerSnapshot:
+    """채널별 마지막 타이머 상태."""
+
+    channel_code: str
+    timers: List[Dict[str, Any]] = field(default_factory=list)
+    server_clock_offset_ms: int = 0
+    saved_at_ms: int = 0
+
+    @classmethod
+    def from_dict(cls, channel_code: str, data: Dict[str, Any]) -> "TimerSnapshot":
+        raw_timers = data.get("timers")
+        timers = [item for item in raw_timers if isinstance(item, dict)] if isinstance(raw_timers, list) else []
+        try:
+            offset = int(data.get("offset", 0))
+        except (TypeError, ValueError):
+            offset = 0
+        try:
+            saved_at = int(data.get("savedAt", 0))
+        except (TypeError, ValueError):
+            saved_at = 0
+        return cls(
+            channel_code=channel_code,
+            timers=timers,
+            server_clock_offset_ms=offset,
+            saved_at_ms=saved_at,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timers": self.timers,
+            "offset": int(self.server_clock_offset_ms),
+            "savedAt": int(self.saved_at_ms),
+        }
+
+    @property
+    def age_seconds(self) -> float:
+        if not self.saved_at_ms:
+            return 0.0
+        return max(0.0, get_clock().time() - self.saved_at_ms / 1000)
+
+
+class SnapshotCache:
+    """설정 파일 옆에 채널별 스냅샷을 저장/로드한다.
+
+    같은 내용은 다시 쓰지 않고, 파일은 임시 파일을 거쳐 원자적으로 교체한다.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._channels: Dict[str, Dict[str, Any]] | None = None
+        self._last_written: Dict[str, str] = {}
+
+    @classmethod
+    def beside(cls, config_path: Path) -> "SnapshotCache":
+        return cls(config_path.parent / SNAPSHOT_FILE_NAME)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self, channel_code: str) -> Optional[TimerSnapshot]:
+        if not channel_code:
+            return None
+        with self._lock:
+            channels = self._load_locked()
+            data = channels.get(channel_code)
+        if not isinstance(data, dict):
+            return None
+        snapshot = TimerSnapshot.from_dict(channel_code, data)
+        return snapshot if snapshot.timers else None
+
+    def save(
+        self,
+        channel_code: str,
+        timers: List[Dict[str, Any]],
+        server_clock_offset_ms: int = 0,
+    ) -> bool:
+        """스냅샷을 저장한다. 내용이 바뀌지 않았으면 쓰지 않고 ``False`` 를 반환한다."""
+
+        if not channel_code or not timers:
+            return False
+        compact_timers = [_compact_timer(item) for item in timers if isinstance(item, dict)]
+        fingerprint = json.dumps(
+            [compact_timers, int(server_clock_offset_ms) // 1000],
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        with self._lock:
+            if self._last_written.get(channel_code) == fingerprint:
+                return False
+            channels = self._load_locked()
+            snapshot = TimerSnapshot(
+                channel_code=channel_code,
+                timers=compact_timers,
+                server_clock_offset_ms=int(server_clock_offset_ms),
+                saved_at_ms=get_clock().time_ms(),
+            )
+            channels[channel_code] = snapshot.to_dict()
+            try:
+                self._write_locked(channels)
+            except OSError as exc:
+                logger.warning("타이머 스냅샷을 저장하지 못했습니다: %s", exc)
+                return False
+            self._last_written[channel_code] = fingerprint
+        return True
+
+    def _load_locked(self) -> Dict[str, Dict[str, Any]]:
+        if self._channels is not None:
+            return self._channels
+        channels: Dict[str, Dict[str, Any]] = {}
+        try:
+            with self._path.open("r", encoding="utf-8") as fp:
+                data = json.load(fp)
+            if isinstance(data, dict) and isinstance(data.get("channels"), dict):
+                channels = data["channels"]
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as exc:
+            logger.warning("타이머 스냅샷을 읽을 수 없어 무시합니다: %s", exc)
+        self._channels = channels
+        return channels
+
+    def _write_locked(self, channels: Dict[str, Dict[str, Any]]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as fp:
+            json.dump({"channels": channels}, fp, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp_path, self._path)
@@ -0,0 +1,535 @@
+"""타이머 API 대역 서버 (표준 라이브러리만 사용).
+
+Node ``server.js`` 와 DB 없이 클라이언트를 개발/측정할 수 있도록
+``TimerService``/``TimerAPI`` 가 쓰는 계약만 구현한다.
+
+- ``GET /api/health``
+- ``GET /api/timers?channelCode=...``
+- ``GET /api/timers/stream?channelCode=...`` (SSE)
+- ``POST /api/timers/<id>/{start,pause,reset,toggle-repeat}``
+
+지연/흔들림/오류/연결 끊김을 :class:`FaultProfile` 로 주입할 수 있다::
+
+    python -m timer_overlay.standin_server --timers 12 --latency-ms 40 --jitter-ms 15 --error-rate 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 47984
+DEFAULT_CHANNEL_CODE = "ca01"
+DEFAULT_TIMER_DURATION_MS = 15 * 60 * 1000
+
+# server.js 와 같은 주기
+_TICK_INTERVAL_S = 0.25
+_KEEP_ALIVE_S = 20.0
+_ACTIONS = ("start", "pause", "reset", "toggle-repeat")
+
+
+@dataclass
+class FaultProfile:
+    """요청마다 주입할 장애. 비율은 0~1."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0  # 503 응답
+    drop_rate: float = 0.0  # 응답 없이 연결 끊기 (SSE 는 이벤트마다 적용)
+    error_status: int = 503
+
+
+@dataclass
+class StandinTimer:
+    """대역 서버의 타이머 한 개 (server.js 의 메모리 상태와 같은 필드)."""
+
+    id: int
+    name: str
+    duration_ms: int = DEFAULT_TIMER_DURATION_MS
+    remaining_ms: int = DEFAULT_TIMER_DURATION_MS
+    is_running: bool = False
+    repeat_enabled: bool = False
+    display_order: int = 0
+    end_time_ms: Optional[int] = None
+
+    def remaining_at(self, now_ms: int) -> int:
+        if self.is_running and self.end_time_ms is not None:
+            return max(0, self.end_time_ms - now_ms)
+        return max(0, self.remaining_ms)
+
+    def to_payload(self, now_ms: int) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "duration": self.duration_ms,
+            "remaining": self.remaining_at(now_ms),
+            "isRunning": self.is_running,
+            "repeatEnabled": self.repeat_enabled,
+            "swipeToReset": False,
+            "displayOrder": self.display_order,
+            "endTime": self.end_time_ms if self.is_running else None,
+            "updatedAt": now_ms,
+        }
+
+
+@dataclass
+class _Channel:
+    timers: Dict[int, StandinTimer] = field(default_factory=dict)
+    grid_settings: Dict[str, int] = field(default_factory=lambda: {"columns": 3, "rows": 2})
+    version: int = 0
+
+
+class StandinState:
+    """채널별 타이머 상태와 SSE 구독자 알림.
+
+    반복 타이머는 ``endTime`` 에 정확히 다음 주기로 넘어간다 (``endTime += duration``).
+    server.js 는 250ms 주기 검사 시각을 기준으로 넘기므로 최대 250ms 씩 밀리지만,
+    대역 서버는 측정 재현성을 위해 밀림 없이 계산한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.time,
+        skew_ms: int = 0,
+    ) -> None:
+        self._clock = clock
+        self.skew_ms = skew_ms
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._channels: Dict[str, _Channel] = {}
+        self._next_id = 1
+
+    def now_ms(self) -> int:
+        return int(self._clock() * 1000) + self.skew_ms
+
+    def add_channel(self, channel_code: str, timer_count: int = 0, *, duration_ms: int = DEFAULT_TIMER_DURATION_MS) -> None:
+        with self._lock:
+            channel = self._channels.setdefault(channel_code, _Channel())
+            for _ in range(timer_count):
+                timer_id = self._next_id
+                self._next_id += 1
+                order = len(channel.timers) + 1
+                channel.timers[timer_id] = StandinTimer(
+                    timer_id, f"타이머 {order}", duration_ms, duration_ms, display_order=order
+                )
+
+    def channels(self) -> List[str]:
+        with self._lock:
+            return list(self._channels)
+
+    def has_channel(self, channel_code: str) -> bool:
+        with self._lock:
+            return channel_code in self._channels
+
+    def tick(self) -> List[str]:
+        """만료된 타이머를 처리하고 바뀐 채널 목록을 반환한다."""
+
+        now = self.now_ms()
+        changed = []
+        with self._lock:
+            for code, channel in self._channels.items():
+                if self._roll_locked(channel, now):
+                    channel.version += 1
+                    changed.append(code)
+            if changed:
+                self._changed.notify_all()
+        return changed
+
+    @staticmethod
+    def _roll_locked(channel: _Channel, now: int) -> bool:
+        changed = False
+        for timer in channel.timers.values():
+            if not timer.is_running or timer.end_time_ms is None or timer.end_time_ms > now:
+                continue
+            if timer.repeat_enabled and timer.duration_ms > 0:
+                periods = (now - timer.end_time_ms) // timer.duration_ms + 1
+                timer.end_time_ms += periods * timer.duration_ms
+                timer.remaining_ms = timer.duration_ms
+            else:
+                timer.is_running = False
+                timer.remaining_ms = 0
+                timer.end_time_ms = None
+            changed = True
+        return changed
+
+    def payload(self, channel_code: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """``(버전, /api/timers 응답)``. 채널이 없으면 ``None``."""
+
+        now = self.now_ms()
+        with self._lock:
+            channel = self._channels.get(channel_code)
+            if channel is None:
+                return None
+            if self._roll_locked(channel, now):
+                channel.version += 1
+                self._changed.notify_all()
+            timers = sorted(channel.timers.values(), key=lambda timer: (timer.display_order, timer.id))
+            return channel.version, {
+                "timers": [timer.to_payload(now) for timer in timers],
+                "gridSettings": dict(channel.grid_settings),
+            }
+
+    def apply_action(self, channel_code: str, timer_id: int, action: str) -> Optional[Dict[str, Any]]:
+        """액션을 적용하고 타이머 응답을 반환한다. 타이머가 없으면 ``None``."""
+
+        now = self.now_ms()
+        with self._lock:
+            channel = self._channels.get(channel_code)
+            timer = channel.timers.get(timer_id) if channel is not None else None
+            if timer is None:
+                return None
+            self._roll_locked(channel, now)
+            remaining = timer.remaining_at(now)
+            if action == "start":
+                if timer.is_running and not (timer.repeat_enabled and remaining <= 0):
+                    return timer.to_payload(now)
+                timer.remaining_ms = remaining if remaining > 0 else timer.duration_ms
+                timer.is_running = True
+                timer.end_time_ms = now + timer.remaining_ms
+            elif action == "pause":
+                if not timer.is_running:
+                    return timer.to_payload(now)
+                timer.remaining_ms = remaining
+                timer.is_running = False
+                timer.end_time_ms = None
+            elif action == "reset":
+                timer.remaining_ms = timer.duration_ms
+                timer.is_running = False
+                timer.end_time_ms = None
+            elif action == "toggle-repeat":
+                timer.repeat_enabled = not timer.repeat_enabled
+            else:
+                raise ValueError(f"알 수 없는 액션: {action}")
+            channel.version += 1
+            self._changed.notify_all()
+            return timer.to_payload(now)
+
+    def wait_for_change(self, channel_code: str, version: int, timeout: float) -> int:
+        """채널 버전이 ``version`` 과 달라질 때까지 기다린 뒤 현재 버전을 반환한다."""
+
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                channel = self._channels.get(channel_code)
+                current = channel.version if channel is not None else version
+                remaining = deadline - time.monotonic()
+                if current != version or remaining <= 0:
+                    return current
+                self._changed.wait(remaining)
+
+    def wake_all(self) -> None:
+        with self._lock:
+            self._changed.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - 표준 시그니처
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # 요청 처리 -----------------------------------------------------------
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+        self._drain_body()
+        owner = self.server.owner
+        owner.count(f"{method} /{'/'.join(parts[:2])}")
+        if not owner.inject_faults(self):
+            return
+
+        if method == "GET" and parts == ["api", "health"]:
+            self._send_json(200, {"ok": True})
+            return
+        if len(parts) < 2 or parts[:2] != ["api", "timers"]:
+            self._send_json(404, {"message": "Not Found"})
+            return
+
+        channel_code = (query.get("channelCode") or [""])[0].strip()
+        if not channel_code:
+            self._send_json(400, {"message": "채널 코드를 입력해주세요."})
+            return
+        state = owner.state
+        if not state.has_channel(channel_code):
+            self._send_json(404, {"message": "존재하지 않는 채널 코드입니다."})
+            return
+
+        if method == "GET" and len(parts) == 2:
+            self._send_timers(channel_code)
+        elif method == "GET" and parts[2:] == ["stream"]:
+            self._stream(channel_code)
+        elif method == "POST" and len(parts) == 4 and parts[3] in _ACTIONS:
+            try:
+                timer_id = int(parts[2])
+            except ValueError:
+                timer_id = -1
+            payload = state.apply_action(channel_code, timer_id, parts[3])
+            if payload is None:
+                self._send_json(404, {"message": "해당 타이머를 찾을 수 없습니다."})
+            else:
+                self._send_json(200, payload)
+        else:
+            self._send_json(404, {"message": "Not Found"})
+
+    def _drain_body(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > 0:
+            self.rfile.read(length)
+
+    def _send_timers(self, channel_code: str) -> None:
+        result = self.server.owner.state.payload(channel_code)
+        if result is None:
+            self._send_json(404, {"message": "해당 채널의 타이머를 찾을 수 없습니다."})
+            return
+        body = json.dumps(result[1], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # Express 의 기본 약한 ETag 와 같은 방식 (본문이 같을 때만 304)
+        etag = f'W/"{len(body):x}-{hashlib.sha1(body).hexdigest()[:27]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_bytes(200, body, extra_headers={"ETag": etag})
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._send_bytes(status, body)
+
+    def _send_bytes(self, status: int, body: bytes, extra_headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, channel_code: str) -> None:
+        owner = self.server.owner
+        state = owner.state
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        owner.stream_opened()
+        try:
+            self.wfile.write(b"retry: 5000\n\n")
+            version = -1
+            last_write = time.monotonic()
+            while not owner.stopping:
+                result = state.payload(channel_code)
+                if result is None:
+                    break
+                if result[0] != version:
+                    version = result[0]
+                    if owner.should_drop():
+                        break
+                    data = json.dumps(result[1], ensure_ascii=False, separators=(",", ":"))
+                    self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                elif time.monotonic() - last_write >= _KEEP_ALIVE_S:
+                    self.wfile.write(b":keep-alive\n\n")
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                state.wait_for_change(channel_code, version, _KEEP_ALIVE_S)
+        except OSError:
+            pass  # 클라이언트가 연결을 끊음
+        finally:
+            owner.stream_closed()
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "StandinServer"
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # 부하 시험 중 클라이언트가 keep-alive 연결을 끊는 것은 정상이다.
+        logger.debug("연결 처리 오류: %s", client_address, exc_info=True)
+
+
+class StandinServer:
+    """대역 서버. 백그라운드 스레드에서 실행하거나 ``serve_forever`` 로 막고 실행한다.
+
+    ``with StandinServer(port=0) as server:`` 처럼 쓰면 빈 포트를 잡고
+    ``server.url`` 로 주소를 알 수 있다.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        *,
+        state: Optional[StandinState] = None,
+        faults: Optional[FaultProfile] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.state = state if state is not None else StandinState()
+        if not self.state.channels():
+            self.state.add_channel(DEFAULT_CHANNEL_CODE, 1)
+        self.faults = faults if faults is not None else FaultProfile()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._open_streams = 0
+        self.stopping = False
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.owner = self
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandinServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 요청 처리와 만료 검사를 시작한다."""
+
+        for target in (self._httpd.serve_forever, self._tick_loop):
+            thread = threading.Thread(target=target, name="standin-server", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("대역 서버 시작: %s (채널: %s)", self.url, ", ".join(self.state.channels()))
+
+    def serve_forever(self) -> None:
+        ticker = threading.Thread(target=self._tick_loop, name="standin-tick", daemon=True)
+        ticker.start()
+        logger.info("대역 서버 시작: %s (채널: %s)", self.url, ", ".join(self.state.channels()))
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self.stopping = True
+            self.state.wake_all()
+
+    def stop(self) -> None:
+        self.stopping = True
+        self.state.wake_all()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads.clear()
+        logger.info("대역 서버 종료: %s", self.stats())
+
+    def _tick_loop(self) -> None:
+        while not self.stopping:
+            self.state.tick()
+            time.sleep(_TICK_INTERVAL_S)
+
+    # 장애 주입 -----------------------------------------------------------
+    def _roll(self) -> float:
+        with self._random_lock:
+            return self._random.random()
+
+    def should_drop(self) -> bool:
+        drop = self.faults.drop_rate > 0 and self._roll() < self.faults.drop_rate
+        if drop:
+            self.count("injected drop")
+        return drop
+
+    def inject_faults(self, handler: _Handler) -> bool:
+        """지연을 적용하고, 요청을 계속 처리해야 하면 ``True``."""
+
+        faults = self.faults
+        delay_ms = faults.latency_ms
+        if faults.jitter_ms > 0:
+            with self._random_lock:
+                delay_ms += self._random.uniform(-faults.jitter_ms, faults.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        if self.should_drop():
+            handler.close_connection = True
+            return False
+        if faults.error_rate > 0 and self._roll() < faults.error_rate:
+            self.count("injected error")
+            handler.close_connection = True
+            handler._send_json(faults.error_status, {"message": "주입된 오류입니다."})
+            return False
+        return True
+
+    # 통계 ---------------------------------------------------------------
+    def count(self, key: str) -> None:
+        with self._stats_lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def stream_opened(self) -> None:
+        with self._stats_lock:
+            self._open_streams += 1
+
+    def stream_closed(self) -> None:
+        with self._stats_lock:
+            self._open_streams -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {**self._counts, "open streams": self._open_streams}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m timer_overlay.standin_server", description="타이머 API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--channel", action="append", help=f"채널 코드 (여러 번 지정 가능, 기본: {DEFAULT_CHANNEL_CODE})")
+    parser.add_argument("--timers", type=int, default=6, help="채널별 타이머 수")
+    parser.add_argument("--duration-s", type=float, default=DEFAULT_TIMER_DURATION_MS / 1000, help="타이머 길이(초)")
+    parser.add_argument("--skew-ms", type=int, default=0, help="서버 시계를 이만큼 앞당김 (시계 보정 시험용)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, help="장애 주입 난수 시드")
+    parser.add_argument("-v", "--verbose", action="store_true", help="요청마다 로그 출력")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="[%(asctime)s] %(levelname)s %(name)s: %(message)s",
+    )
+    state = StandinState(skew_ms=args.skew_ms)
+    for channel_code in args.channel or [DEFAULT_CHANNEL_CODE]:
+        state.add_channel(channel_code, args.timers, duration_ms=int(args.duration_s * 1000))
+    faults = FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate, args.drop_rate)
+    server = StandinServer(args.host, args.port, state=state, faults=faults, seed=args.seed)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    logger.info("대역 서버 종료: %s", server.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
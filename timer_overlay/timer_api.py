@@ -2,53 +2,78 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, Optional
 
 import requests
 
+from timer_overlay import metrics
+from timer_overlay.endpoints import EndpointSelector, hedged_get
 from timer_overlay.timer_state import TimerState
+from timer_overlay.tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
 
+def parse_timers(data: Dict[str, Any]) -> List[TimerState]:
+    """``/api/timers`` 응답을 표시 순서대로 정렬된 TimerState 목록으로 변환."""
+    timers_data = data.get("timers", [])
+    if not isinstance(timers_data, list):
+        return []
+    
+    timers = []
+    for item in timers_data:
+        try:
+            timer = TimerState.from_payload(item)
+            timers.append(timer)
+        except Exception as e:
+            logger.warning("타이머 파싱 실패: %s", e)
+    
+    # displayOrder로 정렬
+    timers.sort(key=lambda t: (t.display_order, t.id))
+    return timers
+
+
 class TimerAPI:
     """타이머 서버 API 클라이언트."""
     
-    def __init__(self, base_url: str, timeout: float = 5.0):
-        self.base_url = base_url.rstrip("/")
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        selector: Optional[EndpointSelector] = None,
+    ):
+        self.selector = selector or EndpointSelector([base_url])
         self.timeout = timeout
         self.session = requests.Session()
     
+    @property
+    def base_url(self) -> str:
+        """현재 사용 중인 엔드포인트."""
+        return self.selector.current
+    
     def get_timers(self, channel_code: str) -> List[TimerState]:
         """타이머 목록 조회."""
         try:
-            url = f"{self.base_url}/api/timers"
-            response = self.session.get(
-                url,
+            started = time.perf_counter_ns()
+            response = hedged_get(
+                self.selector,
+                "/api/timers",
                 params={"channelCode": channel_code},
-                timeout=self.timeout
+                timeout=self.timeout,
+                session=self.session,
             )
+            metrics.POLL_RTT.record(time.perf_counter_ns() - started)
             response.raise_for_status()
-            data = response.json()
-            
-            timers_data = data.get("timers", [])
-            if not isinstance(timers_data, list):
-                return []
-            
-            timers = []
-            for item in timers_data:
-                try:
-                    timer = TimerState.from_payload(item)
-                    timers.append(timer)
-                except Exception as e:
-                    logger.warning("타이머 파싱 실패: %s", e)
-            
-            # displayOrder로 정렬
-            timers.sort(key=lambda t: (t.display_order, t.id))
+            metrics.PAYLOAD_BYTES.record(len(response.content))
+            with metrics.PARSE_TIME.time():
+                timers = parse_timers(response.json())
+            get_tracer().payload_received(started)
             return timers
             
         except requests.RequestException as e:
             logger.warning("타이머 조회 실패: %s", e)
+            metrics.POLL_ERRORS.inc()
             return []
     
     def start_timer(self, channel_code: str, timer_id: str) -> Optional[TimerState]:
@@ -67,8 +92,12 @@ class TimerAPI:
         self, channel_code: str, timer_id: str, action: str
     ) -> Optional[TimerState]:
         """타이머 액션 요청."""
+        base_url = self.base_url
+        tracer = get_tracer()
+        tracer.mark(timer_id, "sent")
+        started = time.perf_counter_ns()
         try:
-            url = f"{self.base_url}/api/timers/{timer_id}/{action}"
+            url = f"{base_url}/api/timers/{timer_id}/{action}"
             response = self.session.post(
                 url,
                 params={"channelCode": channel_code},
@@ -77,10 +106,17 @@ class TimerAPI:
             )
             response.raise_for_status()
             data = response.json()
+            tracer.acked(timer_id, True)
             return TimerState.from_payload(data)
         except requests.RequestException as e:
             logger.warning("타이머 %s 실패: %s", action, e)
+            tracer.acked(timer_id, False)
+            metrics.action_failures(action).inc()
+            if e.response is None:
+                self.selector.report_failure(base_url)
             return None
+        finally:
+            metrics.action_rtt(action).record(time.perf_counter_ns() - started)
     
     def check_health(self) -> bool:
         """서버 연결 확인."""
@@ -94,4 +130,5 @@ class TimerAPI:
     
     def close(self):
         """세션 종료."""
+        self.selector.stop_monitoring()
         self.session.close()
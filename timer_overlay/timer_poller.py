@@ -6,6 +6,8 @@ from typing import Callable, List, Optional
 
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
+from timer_overlay import metrics
+from timer_overlay.recorder import PayloadRecorder
 from timer_overlay.timer_api import TimerAPI
 from timer_overlay.timer_state import TimerState
 
@@ -35,6 +37,8 @@ class TimerPoller(QObject):
         # 마지막으로 성공한 타이머 목록 (에러 시 유지용)
         self._last_timers: List[TimerState] = []
         self._connected = False
+        self._ever_connected = False
+        self._recorder: Optional[PayloadRecorder] = None
         
         # 폴링 타이머
         self._poll_timer = QTimer(self)
@@ -59,6 +63,10 @@ class TimerPoller(QObject):
         if self._poll_timer.isActive():
             self._poll()  # 즉시 폴링
     
+    def set_recorder(self, recorder: Optional[PayloadRecorder]):
+        """받은 타이머 목록을 recorder에 기록 (None이면 기록 안 함)."""
+        self._recorder = recorder
+    
     def get_last_timers(self) -> List[TimerState]:
         """마지막으로 받은 타이머 목록."""
         return self._last_timers.copy()
@@ -72,6 +80,8 @@ class TimerPoller(QObject):
         timers = self.api.get_timers(self.channel_code)
         
         if timers:
+            if self._recorder is not None:
+                self._recorder.record(timers)
             self._last_timers = timers
             self._set_connection_state(True, "연결됨")
             self.timers_updated.emit(timers)
@@ -87,6 +97,10 @@ class TimerPoller(QObject):
     def _set_connection_state(self, connected: bool, message: str):
         """연결 상태 변경 시 시그널 발생."""
         if connected != self._connected:
+            if connected and self._ever_connected:
+                metrics.RECONNECTS.inc()
+            self._ever_connected = self._ever_connected or connected
+            metrics.CONNECTED.set(1 if connected else 0)
             self._connected = connected
             self.connection_changed.emit(connected, message)
             logger.info("연결 상태: %s - %s", connected, message)
@@ -1,10 +1,11 @@
 """타이머 상태 모델."""
 from __future__ import annotations
 
-import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+from timer_overlay.clock import get_clock
+
 
 @dataclass
 class TimerState:
@@ -47,6 +48,19 @@ class TimerState:
             end_time_epoch_ms=end_time_epoch_ms,
         )
     
+    def to_payload(self) -> Dict[str, Any]:
+        """서버 응답과 같은 형식의 딕셔너리로 변환."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "duration": self.duration_ms,
+            "remaining": self.remaining_ms,
+            "isRunning": self.is_running,
+            "repeatEnabled": self.repeat_enabled,
+            "displayOrder": self.display_order,
+            "endTime": self.end_time_epoch_ms,
+        }
+    
     def get_remaining_ms(self) -> int:
         """현재 남은 시간 계산 (ms)."""
         if not self.is_running:
@@ -55,8 +69,11 @@ class TimerState:
         if self.end_time_epoch_ms is None:
             return self.remaining_ms
         
-        now_epoch_ms = int(time.time() * 1000)
+        now_epoch_ms = get_clock().time_ms()
         remaining = self.end_time_epoch_ms - now_epoch_ms
+        if remaining <= 0 and self.repeat_enabled and self.duration_ms > 0:
+            # 반복 타이머는 서버와 같이 endTime 에 다음 주기로 넘어간다.
+            return self.duration_ms - (-remaining) % self.duration_ms
         return max(0, remaining)
     
     def get_remaining_str(self) -> str:
@@ -0,0 +1,324 @@
+"""단축키부터 화면까지 지연 추적.
+
+단축키 하나가 화면 숫자를 바꾸기까지 거치는 구간마다 단조 시각(``perf_counter_ns``)을
+찍고 액션 id 로 묶는다. 훅 콜백은 시각만 재서 넘기고, 이를 받은 작업 스레드(또는 GUI
+스레드)가 :meth:`Tracer.begin` 으로 추적을 연다. 훅 안에서는 락을 잡지 않는다. 이후
+단계는 (시그널에 id 를 실어 보낼 수 없으므로) 타이머 id 로 진행 중인 추적을 찾는다.
+
+단계 (앞 단계부터 이 단계까지가 한 구간):
+
+- ``hook``: 키보드 훅 콜백 (``keyboard``/pynput)
+- ``gui`` / ``worker``: GUI 슬롯 또는 단축키 작업 스레드에 도착
+- ``sent`` / ``acked``: 액션 요청 전송과 응답
+- ``payload``: 응답 뒤에 보낸 첫 조회(또는 스트림 이벤트)를 받음
+- ``applied``: GUI 스레드가 그 응답을 반영
+- ``shown`` / ``painted``: 오버레이가 새 상태를 받고 다시 그림
+
+끝난 추적은 구간별 히스토그램(``hotkey_hop_seconds{hop=...}``)과 전체 지연
+(``hotkey_latency_seconds``)에 기록하고, 최근 추적을 Chrome trace JSON 으로 내보내
+``chrome://tracing`` 이나 Perfetto 에서 볼 수 있다. ``TIMER_OVERLAY_TRACE_PATH`` 를
+지정하면 창을 닫을 때 그 경로에 저장한다.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from timer_overlay import metrics
+
+logger = logging.getLogger(__name__)
+
+TRACE_ENV_VAR = "TIMER_OVERLAY_TRACE_PATH"
+HOPS = ("hook", "gui", "worker", "sent", "acked", "payload", "applied", "shown", "painted")
+MAX_TRACES = 500
+# 응답 반영 뒤 이 시간 안에 그려지지 않으면(오버레이를 띄우지 않은 타이머 등) 반영에서 끝낸다.
+PAINT_TIMEOUT_NS = 1_000_000_000
+# 이 시간 안에 끝나지 않은 추적은 미완료로 닫는다.
+TRACE_TIMEOUT_NS = 30_000_000_000
+
+
+@dataclass
+class HotkeyTrace:
+    """단축키 한 번의 추적."""
+
+    action_id: int
+    timer_id: str
+    source: str
+    marks: List[Tuple[str, int, int]] = field(default_factory=list)  # (단계, ns, 스레드 id)
+    status: str = "open"  # open | done | failed | dropped | timeout
+    detail: str = ""
+
+    def time_of(self, hop: str) -> Optional[int]:
+        for name, timestamp, _ in self.marks:
+            if name == hop:
+                return timestamp
+        return None
+
+    @property
+    def last_hop(self) -> str:
+        return self.marks[-1][0]
+
+    @property
+    def started_ns(self) -> int:
+        return self.marks[0][1]
+
+    @property
+    def total_ns(self) -> int:
+        return self.marks[-1][1] - self.marks[0][1]
+
+    def hops(self) -> List[Tuple[str, int, int]]:
+        """``(단계, 앞 단계부터의 ns, 스레드 id)``."""
+
+        return [
+            (name, timestamp - previous, thread)
+            for (_, previous, _), (name, timestamp, thread) in zip(self.marks, self.marks[1:])
+        ]
+
+
+class Tracer:
+    """진행 중인 추적과 최근에 끝난 추적을 보관한다. 모든 스레드에서 호출할 수 있다."""
+
+    def __init__(self, max_traces: int = MAX_TRACES) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._open: Dict[int, HotkeyTrace] = {}
+        self.finished: Deque[HotkeyTrace] = deque(maxlen=max_traces)
+        self._thread_names: Dict[int, str] = {}
+
+    @property
+    def active(self) -> bool:
+        """진행 중인 추적이 있는지 (락 없이 읽는 빠른 확인)."""
+
+        return bool(self._open)
+
+    def begin(
+        self,
+        timer_id: str,
+        source: str,
+        started_ns: Optional[int] = None,
+        thread: Optional[int] = None,
+    ) -> int:
+        """추적을 연다. ``started_ns`` 와 ``thread`` 는 훅 콜백이 시작된 시각과 훅 스레드 id.
+
+        락을 잡으므로 훅 콜백이 아니라 그 값을 넘겨받은 스레드에서 부른다.
+        """
+
+        now = started_ns if started_ns is not None else time.perf_counter_ns()
+        thread = self._thread() if thread is None else self._other_thread(thread)
+        with self._lock:
+            self._expire_locked(now)
+            trace = HotkeyTrace(next(self._ids), timer_id, source, [("hook", now, thread)])
+            self._open[trace.action_id] = trace
+        return trace.action_id
+
+    def mark(self, timer_id: str, hop: str) -> None:
+        """``timer_id`` 의 진행 중인 추적(가장 최근 것)에 단계를 찍는다."""
+
+        if not self._open:
+            return
+        now = time.perf_counter_ns()
+        thread = self._thread()
+        with self._lock:
+            trace = self._latest_locked(timer_id)
+            if trace is not None and trace.time_of(hop) is None:
+                trace.marks.append((hop, now, thread))
+
+    def drop(self, timer_id: str, reason: str) -> None:
+        """요청을 보내지 않은 단축키 (대기 시간, 모르는 타이머 등)."""
+
+        if not self._open:
+            return
+        with self._lock:
+            trace = self._latest_locked(timer_id)
+            if trace is not None:
+                self._finish_locked(trace, "dropped", reason)
+
+    def acked(self, timer_id: str, success: bool) -> None:
+        if not self._open:
+            return
+        self.mark(timer_id, "acked")
+        if not success:
+            with self._lock:
+                trace = self._latest_locked(timer_id)
+                if trace is not None:
+                    self._finish_locked(trace, "failed", "액션 요청 실패")
+
+    def payload_received(self, requested_ns: Optional[int] = None) -> None:
+        """응답을 받았다. ``requested_ns`` 보다 먼저 액션 응답을 받은 추적만 해당한다."""
+
+        if not self._open:
+            return
+        now = time.perf_counter_ns()
+        requested_ns = now if requested_ns is None else requested_ns
+        thread = self._thread()
+        with self._lock:
+            for trace in self._open.values():
+                acked_ns = trace.time_of("acked")
+                if acked_ns is not None and acked_ns <= requested_ns and trace.time_of("payload") is None:
+                    trace.marks.append(("payload", now, thread))
+
+    def payload_applied(self) -> None:
+        """GUI 스레드가 응답을 반영했다."""
+
+        if not self._open:
+            return
+        now = time.perf_counter_ns()
+        thread = self._thread()
+        with self._lock:
+            for trace in self._open.values():
+                if trace.last_hop == "payload":
+                    trace.marks.append(("applied", now, thread))
+            self._expire_locked(now)
+
+    def shown(self, timer_id: str) -> None:
+        """오버레이가 새 상태를 받았다."""
+
+        if not self._open:
+            return
+        now = time.perf_counter_ns()
+        with self._lock:
+            trace = self._latest_locked(timer_id)
+            if trace is not None and trace.last_hop == "applied":
+                trace.marks.append(("shown", now, self._thread()))
+
+    def painted(self, timer_id: str) -> None:
+        """오버레이를 다시 그렸다. 새 상태를 받은 뒤면 추적을 끝낸다."""
+
+        if not self._open:
+            return
+        now = time.perf_counter_ns()
+        with self._lock:
+            trace = self._latest_locked(timer_id)
+            if trace is not None and trace.last_hop == "shown":
+                trace.marks.append(("painted", now, self._thread()))
+                self._finish_locked(trace, "done")
+
+    def snapshot(self) -> List[HotkeyTrace]:
+        with self._lock:
+            self._expire_locked(time.perf_counter_ns())
+            return list(self.finished)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._open.clear()
+            self.finished.clear()
+
+    # 내부 -------------------------------------------------------------------
+    def _thread(self) -> int:
+        ident = threading.get_ident()
+        if ident not in self._thread_names:
+            self._thread_names[ident] = threading.current_thread().name
+        return ident
+
+    def _other_thread(self, ident: int) -> int:
+        if ident not in self._thread_names:
+            for candidate in threading.enumerate():
+                if candidate.ident == ident:
+                    self._thread_names[ident] = candidate.name
+                    break
+        return ident
+
+    def _latest_locked(self, timer_id: str) -> Optional[HotkeyTrace]:
+        latest = None
+        for trace in self._open.values():
+            if trace.timer_id == timer_id:
+                latest = trace
+        return latest
+
+    def _expire_locked(self, now: int) -> None:
+        for trace in list(self._open.values()):
+            age = now - trace.marks[-1][1]
+            if trace.last_hop in ("applied", "shown") and age > PAINT_TIMEOUT_NS:
+                self._finish_locked(trace, "done", "다시 그리기 없음")
+            elif now - trace.started_ns > TRACE_TIMEOUT_NS:
+                self._finish_locked(trace, "timeout", f"{trace.last_hop} 이후 진행 없음")
+
+    def _finish_locked(self, trace: HotkeyTrace, status: str, detail: str = "") -> None:
+        self._open.pop(trace.action_id, None)
+        trace.status = status
+        trace.detail = detail
+        self.finished.append(trace)
+        if status != "done":
+            return
+        for hop, duration_ns, _ in trace.hops():
+            metrics.hotkey_hop(hop).record(duration_ns)
+        metrics.HOTKEY_LATENCY.record(trace.total_ns)
+
+    # 내보내기 ---------------------------------------------------------------
+    def chrome_events(self) -> List[Dict[str, Any]]:
+        """Chrome trace 이벤트 목록 (``ts``/``dur`` 는 마이크로초)."""
+
+        traces = self.snapshot()
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "timer_overlay"}}
+        ]
+        for ident, name in list(self._thread_names.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": ident, "args": {"name": name}})
+        for trace in traces:
+            args = {"action_id": trace.action_id, "timer_id": trace.timer_id, "source": trace.source}
+            # 단축키 전체는 비동기 구간으로, 각 단계는 그 단계를 마친 스레드에 그린다.
+            events.append({
+                "name": f"hotkey {trace.timer_id}", "cat": "hotkey", "ph": "b", "id": trace.action_id,
+                "pid": pid, "tid": trace.marks[0][2], "ts": trace.started_ns / 1000,
+                "args": {**args, "status": trace.status, "detail": trace.detail},
+            })
+            events.append({
+                "name": f"hotkey {trace.timer_id}", "cat": "hotkey", "ph": "e", "id": trace.action_id,
+                "pid": pid, "tid": trace.marks[0][2], "ts": trace.marks[-1][1] / 1000,
+            })
+            previous_ns = trace.started_ns
+            for hop, timestamp, thread in trace.marks[1:]:
+                events.append({
+                    "name": hop, "cat": "hop", "ph": "X", "pid": pid, "tid": thread,
+                    "ts": previous_ns / 1000, "dur": (timestamp - previous_ns) / 1000, "args": args,
+                })
+                previous_ns = timestamp
+        return events
+
+    def export_chrome(self, path: Path) -> int:
+        """Chrome trace JSON 을 저장하고 내보낸 추적 수를 반환한다."""
+
+        events = self.chrome_events()
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle, ensure_ascii=False)
+        return sum(1 for event in events if event.get("ph") == "b")
+
+    def summary(self) -> str:
+        done = [trace for trace in self.snapshot() if trace.status == "done"]
+        if not done:
+            return "완료된 단축키 추적 없음"
+        totals = sorted(trace.total_ns for trace in done)
+        median_ms = totals[len(totals) // 2] / 1_000_000
+        return f"단축키 {len(done)}건, 화면까지 중앙값 {median_ms:.1f}ms, 최대 {totals[-1] / 1_000_000:.1f}ms"
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def export_from_env() -> None:
+    """``TIMER_OVERLAY_TRACE_PATH`` 가 설정되어 있으면 최근 추적을 저장한다."""
+
+    raw_path = os.getenv(TRACE_ENV_VAR)
+    if not raw_path:
+        return
+    try:
+        count = _tracer.export_chrome(Path(raw_path))
+    except OSError as exc:
+        logger.warning("단축키 추적을 저장하지 못했습니다 (%s): %s", raw_path, exc)
+        return
+    logger.info("단축키 추적 %d건을 저장했습니다: %s (%s)", count, raw_path, _tracer.summary())
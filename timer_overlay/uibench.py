@@ -0,0 +1,517 @@
+"""화면 갱신 경로 벤치마크.
+
+``QT_QPA_PLATFORM=offscreen`` 에서 타이머 10/100/1000개짜리 합성 채널로 표, 격자,
+오버레이 갱신 비용을 잰다. 결과는 JSON 보고서로 남기고, 저장해 둔 기준 보고서와
+비교해 중앙값이 허용치 넘게 느려진 항목이 있으면 종료 코드 1 을 돌려준다.
+
+측정 항목:
+
+- ``main_window.refresh_table`` / ``main_window.update_table_remaining``
+- ``app.on_timers_updated`` (카드 추가/갱신 + 격자 재배치) / ``app.relayout_grid``
+- ``overlay.update_timer`` / ``overlay.paint``: 타이머마다 오버레이 하나
+- ``progress_bar.repaint``: 타이머마다 진행 바 하나
+- ``healthbar.paint``: 체력바 오버레이 하나 (타이머 수와 무관)
+
+각 항목은 한 번 호출의 실행 시간을 여러 번 재서 중앙값과 p95 를 낸다. 호출 사이에
+쌓인 Qt 이벤트는 측정 밖에서 처리한다. 환경 문제로 만들 수 없는 창(키보드 훅
+라이브러리를 불러올 수 없는 경우 등)은 건너뛰고 이유를 보고서에 적는다.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_TOLERANCE = 0.25
+# 이보다 작은 차이는 측정 잡음으로 보고 회귀로 치지 않는다.
+NOISE_FLOOR_MS = 0.05
+FRAME_COUNT = 8
+CHANNEL_CODE = "bench"
+
+
+def synthetic_frames(count: int, frames: int = FRAME_COUNT, seed: int = 0) -> List[Dict[str, Any]]:
+    """타이머 ``count`` 개 채널의 연속된 ``/api/timers`` 응답 ``frames`` 개.
+
+    대역 서버 상태에서 절반 남짓을 진행 중으로, 일부를 반복으로 두고 응답마다
+    몇 개씩 시작/일시정지/리셋해 실제 레이드처럼 조금씩 바뀌는 응답을 만든다.
+    """
+
+    from timer_overlay.standin_server import StandinState
+
+    rng = random.Random(seed)
+    state = StandinState()
+    state.add_channel(CHANNEL_CODE, count, duration_ms=5 * 60 * 1000)
+    ids = list(range(1, count + 1))
+    for timer_id in ids:
+        if rng.random() < 0.2:
+            state.apply_action(CHANNEL_CODE, timer_id, "toggle-repeat")
+        if rng.random() < 0.6:
+            state.apply_action(CHANNEL_CODE, timer_id, "start")
+    result = []
+    for _ in range(frames):
+        for timer_id in rng.sample(ids, max(1, count // 20)):
+            state.apply_action(CHANNEL_CODE, timer_id, rng.choice(("start", "pause", "reset")))
+        result.append(state.payload(CHANNEL_CODE)[1])
+    return result
+
+
+# 측정 항목 ------------------------------------------------------------------
+
+
+@dataclass
+class Fixture:
+    """측정할 호출(``step``)과 정리 함수."""
+
+    step: Callable[[], None]
+    close: Callable[[], None] = lambda: None
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    description: str
+    setup: Callable[[int, Path], Fixture]
+    per_timer: bool = True
+
+
+def _cycle(items: Sequence[Any]) -> Callable[[], Any]:
+    index = [0]
+
+    def next_item() -> Any:
+        item = items[index[0] % len(items)]
+        index[0] += 1
+        return item
+
+    return next_item
+
+
+def _close_widgets(widgets: Sequence[Any]) -> Callable[[], None]:
+    def close() -> None:
+        from PyQt5.QtCore import QCoreApplication, QEvent
+
+        for widget in widgets:
+            widget.close()
+            widget.deleteLater()
+        # 다음 항목 측정에 남은 위젯이 끼어들지 않게 바로 지운다.
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    return close
+
+
+def _render(widget: Any, image: Any) -> None:
+    image.fill(0)
+    widget.render(image)
+
+
+def _image_for(widget: Any) -> Any:
+    from PyQt5.QtGui import QImage
+
+    return QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+
+
+def _main_window(count: int, workdir: Path) -> Tuple[Any, List[Dict[str, Any]]]:
+    from timer_overlay.offline import create_offline_window
+
+    window = create_offline_window("main_window", workdir)
+    window.show()
+    frames = synthetic_frames(count)
+    window._handle_timers_payload(frames[0])
+    return window, frames
+
+
+def _setup_refresh_table(count: int, workdir: Path) -> Fixture:
+    from timer_overlay.network import RemoteTimerState
+
+    window, frames = _main_window(count, workdir)
+    states = [
+        {item["id"]: RemoteTimerState.from_payload(item) for item in frame["timers"]}
+        for frame in frames
+    ]
+    next_states = _cycle(states)
+
+    def step() -> None:
+        window.timer_states = next_states()
+        window._refresh_table()
+
+    return Fixture(step, _close_widgets([window]))
+
+
+def _setup_update_table_remaining(count: int, workdir: Path) -> Fixture:
+    window, _ = _main_window(count, workdir)
+    return Fixture(window._update_table_remaining, _close_widgets([window]))
+
+
+def _overlay_app(count: int, workdir: Path) -> Tuple[Any, List[List[Any]]]:
+    from timer_overlay.offline import create_offline_window
+    from timer_overlay.timer_api import parse_timers
+
+    app = create_offline_window("app", workdir)
+    app.show()
+    frames = [parse_timers(frame) for frame in synthetic_frames(count)]
+    app._on_timers_updated(frames[0])
+    return app, frames
+
+
+def _setup_on_timers_updated(count: int, workdir: Path) -> Fixture:
+    app, frames = _overlay_app(count, workdir)
+    next_frame = _cycle(frames)
+    return Fixture(lambda: app._on_timers_updated(next_frame()), _close_widgets([app]))
+
+
+def _setup_relayout_grid(count: int, workdir: Path) -> Fixture:
+    app, _ = _overlay_app(count, workdir)
+    return Fixture(app._relayout_grid, _close_widgets([app]))
+
+
+def _overlays(count: int) -> Tuple[List[Any], List[List[Any]]]:
+    from timer_overlay.overlay_widget import TimerOverlay
+    from timer_overlay.timer_api import parse_timers
+
+    frames = [parse_timers(frame) for frame in synthetic_frames(count)]
+    return [TimerOverlay(timer) for timer in frames[0]], frames
+
+
+def _setup_overlay_update(count: int, workdir: Path) -> Fixture:
+    overlays, frames = _overlays(count)
+    next_frame = _cycle(frames)
+
+    def step() -> None:
+        for overlay, timer in zip(overlays, next_frame()):
+            overlay.update_timer(timer)
+
+    return Fixture(step, _close_widgets(overlays))
+
+
+def _setup_overlay_paint(count: int, workdir: Path) -> Fixture:
+    overlays, _ = _overlays(count)
+    image = _image_for(overlays[0])
+
+    def step() -> None:
+        for overlay in overlays:
+            _render(overlay, image)
+
+    return Fixture(step, _close_widgets(overlays))
+
+
+def _setup_progress_bar(count: int, workdir: Path) -> Fixture:
+    from timer_overlay.overlay_widget import ProgressBar
+
+    bars = []
+    for _ in range(count):
+        bar = ProgressBar()
+        bar.resize(124, 6)
+        bars.append(bar)
+    image = _image_for(bars[0])
+    rng = random.Random(0)
+    values = [[rng.random() for _ in range(count)] for _ in range(FRAME_COUNT)]
+    next_values = _cycle(values)
+
+    def step() -> None:
+        for bar, value in zip(bars, next_values()):
+            bar.set_progress(value)
+            _render(bar, image)
+
+    return Fixture(step, _close_widgets(bars))
+
+
+def _setup_healthbar_paint(count: int, workdir: Path) -> Fixture:
+    from PyQt5.QtCore import QRect
+
+    from timer_overlay.healthbar_history import HealthEstimate
+    from timer_overlay.healthbar_overlay import HealthbarOverlayWidget
+
+    widget = HealthbarOverlayWidget()
+    widget.update_overlay(QRect(100, 100, 400, 16), 100.0)
+    image = _image_for(widget)
+    percents = _cycle([100.0 - index * 7.5 for index in range(FRAME_COUNT)])
+
+    def step() -> None:
+        percent = percents()
+        widget.set_estimate(HealthEstimate(0.0, percent, percent, -1.5, percent / 1.5))
+        _render(widget, image)
+
+    return Fixture(step, _close_widgets([widget]))
+
+
+CASES: Tuple[BenchCase, ...] = (
+    BenchCase("main_window.refresh_table", "표 전체 다시 채우기", _setup_refresh_table),
+    BenchCase(
+        "main_window.update_table_remaining", "표의 남은 시간/상태 갱신 (250ms 주기)",
+        _setup_update_table_remaining,
+    ),
+    BenchCase("app.on_timers_updated", "응답 반영 (카드 갱신 + 격자 재배치)", _setup_on_timers_updated),
+    BenchCase("app.relayout_grid", "격자 재배치", _setup_relayout_grid),
+    BenchCase("overlay.update_timer", "오버레이 내용 갱신 (타이머마다 하나)", _setup_overlay_update),
+    BenchCase("overlay.paint", "오버레이 그리기 (타이머마다 하나)", _setup_overlay_paint),
+    BenchCase("progress_bar.repaint", "진행 바 값 변경 + 그리기", _setup_progress_bar),
+    BenchCase("healthbar.paint", "체력바 오버레이 갱신 + 그리기", _setup_healthbar_paint, per_timer=False),
+)
+
+
+# 측정 -----------------------------------------------------------------------
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def measure(
+    step: Callable[[], None],
+    *,
+    min_time_s: float = 0.5,
+    min_iterations: int = 5,
+    max_iterations: int = 500,
+    warmup: int = 2,
+) -> Dict[str, Any]:
+    """``step`` 을 ``min_time_s`` 동안(최소 ``min_iterations`` 번) 반복해 ms 통계를 낸다."""
+
+    from PyQt5.QtWidgets import QApplication
+
+    for _ in range(warmup):
+        step()
+        QApplication.processEvents()
+    samples: List[float] = []
+    deadline = time.perf_counter() + min_time_s
+    while len(samples) < max_iterations and (
+        len(samples) < min_iterations or time.perf_counter() < deadline
+    ):
+        started = time.perf_counter()
+        step()
+        samples.append((time.perf_counter() - started) * 1000)
+        QApplication.processEvents()
+    ordered = sorted(samples)
+    return {
+        "iterations": len(ordered),
+        "median_ms": round(_percentile(ordered, 50), 4),
+        "p95_ms": round(_percentile(ordered, 95), 4),
+        "mean_ms": round(sum(ordered) / len(ordered), 4),
+        "min_ms": round(ordered[0], 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def machine_info() -> Dict[str, Any]:
+    from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+    }
+
+
+def select_cases(patterns: Optional[Sequence[str]] = None) -> List[BenchCase]:
+    if not patterns:
+        return list(CASES)
+    return [case for case in CASES if any(fnmatch.fnmatch(case.name, pattern) for pattern in patterns)]
+
+
+def run_suite(
+    cases: Sequence[BenchCase],
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    *,
+    min_time_s: float = 0.5,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """측정 항목을 모두 돌려 보고서를 만든다. ``QApplication`` 이 있어야 한다."""
+
+    results: Dict[str, Dict[str, Any]] = {}
+    skipped: Dict[str, str] = {}
+    for case in cases:
+        for size in (sizes if case.per_timer else (1,)):
+            key = f"{case.name}/{size}" if case.per_timer else case.name
+            with tempfile.TemporaryDirectory(prefix="timer-uibench-") as workdir:
+                try:
+                    fixture = case.setup(size, Path(workdir))
+                except ImportError as exc:
+                    reason = str(exc).strip().splitlines()[0] if str(exc).strip() else ""
+                    skipped[case.name] = f"{type(exc).__name__}: {reason}"
+                    logger.debug("%s 건너뜀: %s", case.name, exc)
+                    break
+                try:
+                    result = measure(fixture.step, min_time_s=min_time_s)
+                finally:
+                    fixture.close()
+            result["timers"] = size if case.per_timer else None
+            results[key] = result
+            if progress is not None:
+                progress(key, result)
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "cases": [case.name for case in cases],
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+# 기준 비교 ------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Comparison:
+    key: str
+    baseline_ms: Optional[float]
+    current_ms: Optional[float]
+    status: str  # "ok" | "regression" | "improved" | "new" | "missing"
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline_ms or self.current_ms is None:
+            return None
+        return self.current_ms / self.baseline_ms
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> List[Comparison]:
+    """중앙값 기준으로 ``baseline`` 과 비교한다. 이번에 돌리지 않은 항목은 뺀다."""
+
+    current = report.get("results", {})
+    selected = set(report.get("cases", ()))
+    previous = {
+        key: value for key, value in baseline.get("results", {}).items()
+        if not selected or key.split("/", 1)[0] in selected
+    }
+    rows = []
+    for key in sorted(set(current) | set(previous)):
+        now = current.get(key, {}).get("median_ms")
+        before = previous.get(key, {}).get("median_ms")
+        if before is None:
+            status = "new"
+        elif now is None:
+            status = "missing"
+        elif now > before * (1 + tolerance) and now - before > NOISE_FLOOR_MS:
+            status = "regression"
+        elif now < before * (1 - tolerance) and before - now > NOISE_FLOOR_MS:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(Comparison(key, before, now, status))
+    return rows
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="화면 갱신 경로 벤치마크 (offscreen)")
+    parser.add_argument(
+        "--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="채널당 타이머 수 목록 (기본: 10,100,1000)",
+    )
+    parser.add_argument("--cases", help="측정할 항목 (쉼표 구분, 와일드카드 가능. 예: app.*,overlay.paint)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="항목별 최소 측정 시간 (초)")
+    parser.add_argument("--json", type=Path, help="보고서를 저장할 JSON 경로")
+    parser.add_argument("--baseline", type=Path, help="비교할 기준 보고서")
+    parser.add_argument("--save-baseline", type=Path, help="이번 결과를 기준 보고서로 저장")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="중앙값이 기준보다 이 비율 넘게 느려지면 회귀 (기본: 0.25)",
+    )
+    parser.add_argument("--list", action="store_true", help="측정 항목만 출력")
+    parser.add_argument("-v", "--verbose", action="store_true", help="자세한 로그 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="[%(asctime)s] %(levelname)s %(name)s: %(message)s",
+    )
+
+    cases = select_cases(args.cases.split(",") if args.cases else None)
+    if args.list:
+        for case in cases:
+            print(f"{case.name:<36} {case.description}")
+        return 0
+    if not cases:
+        print("일치하는 측정 항목이 없습니다.", file=sys.stderr)
+        return 1
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError:
+        parser.error("--sizes 는 쉼표로 구분한 정수여야 합니다.")
+    baseline = _load_json(args.baseline) if args.baseline else None
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    _application = QApplication.instance() or QApplication(sys.argv[:1])
+
+    def progress(key: str, result: Dict[str, Any]) -> None:
+        print(
+            f"{key:<42} 중앙값 {result['median_ms']:>9.3f}ms  p95 {result['p95_ms']:>9.3f}ms"
+            f"  ({result['iterations']}회)"
+        )
+
+    report = run_suite(cases, sizes, min_time_s=args.min_time, progress=progress)
+    for name, reason in report["skipped"].items():
+        print(f"{name:<42} 건너뜀 ({reason})")
+
+    if args.json:
+        _write_json(args.json, report)
+    if args.save_baseline:
+        _write_json(args.save_baseline, report)
+        print(f"기준 보고서를 저장했습니다: {args.save_baseline}")
+
+    if baseline is None:
+        return 0
+    if baseline.get("machine") != report["machine"]:
+        print("주의: 기준 보고서와 측정 환경이 다릅니다.", file=sys.stderr)
+    rows = compare(report, baseline, args.tolerance)
+    print()
+    print(f"{'항목':<42} {'기준':>10} {'현재':>10} {'비율':>7}")
+    for row in rows:
+        ratio = "-" if row.ratio is None else f"{row.ratio:.2f}"
+        marker = {"regression": "  ← 회귀", "improved": "  (개선)"}.get(row.status, "")
+        if row.status in ("new", "missing"):
+            marker = f"  ({'새 항목' if row.status == 'new' else '측정 안 됨'})"
+        print(
+            f"{row.key:<42} {_format_ms(row.baseline_ms):>10} {_format_ms(row.current_ms):>10}"
+            f" {ratio:>7}{marker}"
+        )
+    regressions = [row for row in rows if row.status == "regression"]
+    if regressions:
+        print(f"회귀 {len(regressions)}건 (허용치 {args.tolerance:.0%}).", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
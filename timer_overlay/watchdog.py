@@ -0,0 +1,199 @@
+"""GUI 이벤트 루프 멈춤 감시.
+
+GUI 스레드의 Qt 타이머가 ``heartbeat_ms`` 마다 박동을 남기고, 감시 스레드가 박동이
+``threshold_ms`` 넘게 끊기면 ``sys._current_frames`` 로 GUI 스레드의 파이썬 스택을
+표본으로 모은다. 박동이 다시 오면 멈춘 시간을 재고, 표본에서 가장 많이 나온 호출
+위치(패키지 안에서 가장 깊은 프레임)별로 횟수, 총/최대 시간을 묶는다. 처음 보는
+위치는 스택과 함께 경고로 남기고, 모든 멈춤은 측정값(``gui_stall_seconds``,
+``gui_stalls_total{site=...}``)에 기록한다.
+
+GUI 스레드에서 만들어야 한다. ``TIMER_OVERLAY_STALL_MS`` 로 기준을 바꾸고 0 이면 끈다.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, Qt, QTimer
+
+from timer_overlay import metrics
+
+logger = logging.getLogger(__name__)
+
+STALL_ENV_VAR = "TIMER_OVERLAY_STALL_MS"
+DEFAULT_THRESHOLD_MS = 50
+DEFAULT_HEARTBEAT_MS = 20
+# 한 번 멈춘 동안 모을 최대 표본 수 (긴 멈춤에서 메모리가 늘지 않게)
+MAX_SAMPLES = 200
+UNKNOWN_SITE = "(알 수 없음)"
+QT_INTERNAL_SITE = "(Qt 이벤트 처리)"
+QT_EVENT_LOOP_CALLS = re.compile(r"\.(exec_?|processEvents)\(")
+
+_PACKAGE_DIR = str(Path(__file__).resolve().parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+@dataclass
+class StallSite:
+    """한 호출 위치의 멈춤 통계."""
+
+    site: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        mean_ms = self.total_ms / self.count if self.count else 0.0
+        return f"{self.site}: {self.count}회, 평균 {mean_ms:.0f}ms, 최대 {self.max_ms:.0f}ms"
+
+
+def _site_of(stack: traceback.StackSummary) -> str:
+    """패키지 코드 중 가장 깊은 프레임. 없으면 가장 깊은 프레임.
+
+    가장 깊은 프레임이 ``exec_()`` 호출이면 파이썬 콜백이 아니라 Qt 가 레이아웃이나
+    그리기 같은 이벤트를 처리하느라 멈춘 것이다.
+    """
+
+    if stack and QT_EVENT_LOOP_CALLS.search(stack[-1].line or ""):
+        frame = stack[-1]
+        return f"{QT_INTERNAL_SITE} {os.path.basename(frame.filename)}:{frame.lineno}"
+    for frame in reversed(stack):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(_PACKAGE_DIR) and filename != _THIS_FILE:
+            return f"{os.path.relpath(filename, _PACKAGE_DIR)}:{frame.lineno} {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+    return UNKNOWN_SITE
+
+
+class EventLoopWatchdog(QObject):
+    """GUI 이벤트 루프가 ``threshold_ms`` 넘게 멈추면 호출 위치를 모은다."""
+
+    def __init__(
+        self,
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        *,
+        heartbeat_ms: int = DEFAULT_HEARTBEAT_MS,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.sites: Dict[str, StallSite] = {}
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._samples: List[Tuple[str, traceback.StackSummary]] = []
+        self._samples_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._beat = QTimer(self)
+        self._beat.setTimerType(Qt.PreciseTimer)
+        self._beat.setInterval(heartbeat_ms)
+        self._beat.timeout.connect(self._on_beat)
+
+    @classmethod
+    def from_env(cls, parent: Optional[QObject] = None) -> Optional["EventLoopWatchdog"]:
+        """``TIMER_OVERLAY_STALL_MS`` 기준으로 만든다 (기본 50ms, 0 이면 ``None``)."""
+
+        raw = os.getenv(STALL_ENV_VAR, "")
+        try:
+            threshold_ms = float(raw) if raw else DEFAULT_THRESHOLD_MS
+        except ValueError:
+            logger.warning("%s 값이 올바르지 않습니다: %s", STALL_ENV_VAR, raw)
+            threshold_ms = DEFAULT_THRESHOLD_MS
+        if threshold_ms <= 0:
+            return None
+        return cls(threshold_ms, parent=parent)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._beat.start()
+        self._thread = threading.Thread(target=self._run, name="EventLoopWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._beat.stop()
+        self._stop.set()
+        self._thread.join(timeout=1)
+        self._thread = None
+        if self.sites:
+            logger.info("GUI 멈춤 요약:\n%s", self.summary())
+
+    def report(self) -> List[StallSite]:
+        """총 멈춘 시간이 긴 순서."""
+
+        return sorted(self.sites.values(), key=lambda site: site.total_ms, reverse=True)
+
+    def summary(self, limit: int = 10) -> str:
+        return "\n".join(site.describe() for site in self.report()[:limit])
+
+    # GUI 스레드 --------------------------------------------------------------
+    def _on_beat(self) -> None:
+        now = time.monotonic()
+        stalled_ms = (now - self._last_beat) * 1000 - self.heartbeat_ms
+        self._last_beat = now
+        with self._samples_lock:
+            samples, self._samples = self._samples, []
+        if stalled_ms >= self.threshold_ms:
+            self._record_stall(stalled_ms, samples)
+
+    def _record_stall(self, stalled_ms: float, samples: List[Tuple[str, traceback.StackSummary]]) -> None:
+        if samples:
+            site, _ = Counter(site for site, _ in samples).most_common(1)[0]
+            stack = next(stack for sample_site, stack in samples if sample_site == site)
+        else:
+            # 감시 스레드가 표본을 뜨기 전에 풀린 멈춤
+            site, stack = UNKNOWN_SITE, traceback.StackSummary()
+        entry = self.sites.get(site)
+        first_seen = entry is None
+        if entry is None:
+            entry = self.sites[site] = StallSite(site)
+        entry.count += 1
+        entry.total_ms += stalled_ms
+        entry.max_ms = max(entry.max_ms, stalled_ms)
+        if stack:
+            entry.stack = stack.format()
+        metrics.GUI_STALL.record(int(stalled_ms * 1_000_000))
+        metrics.gui_stalls(site).inc()
+        if first_seen:
+            logger.warning(
+                "GUI 이벤트 루프가 %.0fms 멈췄습니다: %s\n%s",
+                stalled_ms, site, "".join(entry.stack).rstrip(),
+            )
+        else:
+            logger.info("GUI 이벤트 루프가 %.0fms 멈췄습니다: %s", stalled_ms, site)
+
+    # 감시 스레드 -------------------------------------------------------------
+    def _run(self) -> None:
+        poll_s = min(self.threshold_ms, self.heartbeat_ms) / 2000
+        while not self._stop.wait(poll_s):
+            if (time.monotonic() - self._last_beat) * 1000 < self.threshold_ms:
+                continue
+            frame = sys._current_frames().get(self._gui_ident)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self._samples_lock:
+                if len(self._samples) < MAX_SAMPLES:
+                    self._samples.append((_site_of(stack), stack))